@@ -0,0 +1,244 @@
+import re
+import random
+from pathlib import Path
+from html import unescape
+
+
+RECORDED_FIXTURES_DIR = Path(__file__).parent / 'fixtures'
+JOB_ID_PATTERN = re.compile(r'(jobPosting:|-)(\d{8,})')
+CARD_PATTERN = re.compile(r'<li[\s>].*?</li>', flags=re.DOTALL)
+SUBTITLE_PATTERN = re.compile(r'<h4 class="base-search-card__subtitle">(.*?)</h4>', flags=re.DOTALL)
+COMPANY_SLUG_PATTERN = re.compile(r'(/company/)([^?"/]+)')
+JOB_URL_COMPANY_PATTERN = re.compile(r'(/jobs/view/[^"?]*?-at-)([^"?]*?)(-\d{8,})')
+# Values identifying the recording session or the companies, replaced by placeholders
+TRACKING_PATTERNS = [
+    (re.compile(r'(data-(?:reference|tracking)-id=")[^"]*'), r'\1anonymized'),
+    (re.compile(r'((?:refId|trackingId)=)[^&"]*'), r'\1anonymized'),
+    (re.compile(r'(data-delayed-url="https://media\.licdn\.com/)[^"]*'), r'\1dms/image/anonymized'),
+]
+
+TITLES = [
+    'Data Engineer (H/F)',
+    'Data Engineer Senior - Cloud GCP',
+    'Ingénieur·e Data F/H',
+    'Ingénieur Big Data (H/F)',
+    'Développeur·euse Python / Data',
+    'Data Analyst',
+    'Data Analyst Junior (F/H)',
+    'Analyste Données Marketing',
+    'Data Scientist - NLP',
+    'Machine Learning Engineer',
+    'Chef de projet Data',
+    'Product Owner Data',
+    'Business Analyst',
+    'Consultant BI Power BI',
+    'Architecte Cloud Azure',
+    'Développeur Full Stack',
+    'DevOps Engineer',
+    'Chargé·e de recrutement',
+    'Technicien support',
+    'Commercial sédentaire',
+]
+COMPANIES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Soylent', 'Stark Industries', 'Wayne Enterprises']
+LOCATIONS = [
+    'Paris, Île-de-France, France',
+    'Lyon, Auvergne-Rhône-Alpes, France',
+    'Nantes, Pays de la Loire, France',
+    'Lille, Hauts-de-France, France',
+    'Toulouse, Occitanie, France',
+    'Bordeaux, Nouvelle-Aquitaine, France',
+]
+
+CARD = '''<li>
+  <div class="base-card relative w-full hover:no-underline focus:no-underline base-card--link base-search-card base-search-card--link job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}" data-impression-id="jobs-search-result-{index}" data-reference-id="abc" data-tracking-id="xyz">
+    <a class="base-card__full-link absolute top-0 right-0 bottom-0 left-0 p-0 z-[2]" href="https://fr.linkedin.com/jobs/view/{slug}-at-{company_slug}-{job_id}?position={index}&amp;pageNum=0&amp;refId=abc%3D%3D&amp;trackingId=xyz%3D%3D" data-tracking-control-name="public_jobs_jserp-result_search-card">
+      <span class="sr-only">{title}</span>
+    </a>
+    <div class="search-entity-media"><img class="artdeco-entity-image" data-delayed-url="https://media.licdn.com/dms/image/{job_id}" alt="{company}"></div>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">
+            {title}
+      </h3>
+      <h4 class="base-search-card__subtitle">
+          <a class="hidden-nested-link" href="https://fr.linkedin.com/company/{company_slug}?trk=public_jobs_jserp-result_job-search-card-subtitle">
+            {company}
+          </a>
+      </h4>
+      <div class="base-search-card__metadata">
+          <span class="job-search-card__location">
+            {location}
+          </span>
+          <time class="job-search-card__listdate--new" datetime="2026-10-{day:02d}">
+            Il y a {hours} heures
+          </time>
+      </div>
+    </div>
+  </div>
+</li>'''
+
+PAGE = '''<!DOCTYPE html>
+<html lang="fr">
+<head>
+  <meta charset="utf-8">
+  <title>Offres d'emploi Data Engineer en France</title>
+  {head_noise}
+</head>
+<body>
+  <header class="base-main-nav">{nav_noise}</header>
+  <main class="main" id="main-content" role="main">
+    <section class="two-pane-serp-page__results-list">
+      <ul class="jobs-search__results-list">
+{cards}
+      </ul>
+    </section>
+  </main>
+  {body_noise}
+</body>
+</html>'''
+
+
+def _slugify(value: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', value.lower()).strip('-')
+
+
+def synthetic_page(cards_count: int, seed: int = 42, duplicate_rate: float = 0.05) -> str:
+    """
+    Generate a LinkedIn-like results page, with the markup of the job cards,
+    the page noise around the results list and a few duplicated job offers.
+
+    Parameters
+    ----------
+    cards_count: int
+        The number of job cards of the page
+    seed: int [optional]
+        The seed of the random generator, default to 42
+    duplicate_rate: float [optional]
+        The share of job cards repeating a previous job offer, default to 0.05
+
+    Returns
+    -------
+    str
+        The html code of the page
+    """
+    rng = random.Random(seed)
+    cards = []
+    for index in range(cards_count):
+        job_id = 4000000000 + index
+        if index and rng.random() < duplicate_rate:
+            job_id = 4000000000 + rng.randrange(index)
+        title = rng.choice(TITLES)
+        company = rng.choice(COMPANIES)
+        cards.append(CARD.format(
+            job_id=job_id,
+            index=index,
+            title=title,
+            slug=_slugify(title),
+            company=company,
+            company_slug=_slugify(company),
+            location=rng.choice(LOCATIONS),
+            day=rng.randint(1, 16),
+            hours=rng.randint(1, 23)
+        ))
+    return PAGE.format(
+        head_noise='<script>window.__config = ' + '{"k": "v"}, ' * 2000 + '{};</script>',
+        nav_noise='<ul><li><a href="/jobs">Offres</a></li><li><a href="/learning">Formations</a></li></ul>' * 20,
+        body_noise='<div class="footer"><p>' + 'lorem ipsum ' * 5000 + '</p></div>',
+        cards='\n'.join(cards)
+    )
+
+
+def anonymize_page(webpage: str) -> str:
+    """
+    Anonymize a recorded results page before it is committed: the companies are replaced
+    by fictional ones, the job ids by sequential ones and the tracking ids and logos by placeholders.
+    The markup, the job titles, the locations and the posting dates are kept, as they drive the parsing
+    and the matching costs. The same company or job id is always replaced by the same value,
+    so duplicated job offers stay duplicated.
+
+    Parameters
+    ----------
+    webpage: str
+        The html code of the recorded page
+
+    Returns
+    -------
+    str
+        The anonymized html code
+    """
+    companies, job_ids = {}, {}
+
+    def anonymize_card(match: re.Match) -> str:
+        card = match.group(0)
+        subtitle = SUBTITLE_PATTERN.search(card)
+        company = re.sub(r'<[^>]*>', '', subtitle.group(1)).strip() if subtitle else ''
+        if not company:
+            return card
+        if company not in companies:
+            index = len(companies)
+            suffix = f' {index // len(COMPANIES) + 1}' if index >= len(COMPANIES) else ''
+            companies[company] = COMPANIES[index % len(COMPANIES)] + suffix
+        fake_company = companies[company]
+        fake_slug = _slugify(fake_company)
+        card = card.replace(company, fake_company)
+        if unescape(company) != company:
+            card = card.replace(unescape(company), fake_company)
+        card = COMPANY_SLUG_PATTERN.sub(lambda slug: slug.group(1) + fake_slug, card)
+        return JOB_URL_COMPANY_PATTERN.sub(lambda url: url.group(1) + fake_slug + url.group(3), card)
+
+    def anonymize_job_id(match: re.Match) -> str:
+        job_id = job_ids.setdefault(match.group(2), 4100000000 + len(job_ids))
+        return f'{match.group(1)}{job_id}'
+
+    webpage = CARD_PATTERN.sub(anonymize_card, webpage)
+    webpage = JOB_ID_PATTERN.sub(anonymize_job_id, webpage)
+    for pattern, replacement in TRACKING_PATTERNS:
+        webpage = pattern.sub(replacement, webpage)
+    return webpage
+
+
+def list_recorded_fixtures() -> list:
+    """
+    List the recorded results pages, saved with `python benchmarks/record.py`.
+
+    Returns
+    -------
+    list
+        The paths of the recorded pages
+    """
+    return sorted(RECORDED_FIXTURES_DIR.glob('*.html'))
+
+
+def recorded_page(path: Path, cards_count: int) -> str:
+    """
+    Scale a recorded results page to a number of job cards, by repeating its cards
+    with new job ids so that they are not deduplicated.
+
+    Parameters
+    ----------
+    path: Path
+        The path of the recorded page
+    cards_count: int
+        The number of job cards of the page
+
+    Returns
+    -------
+    str
+        The html code of the page, None if the recorded page contains no job card
+    """
+    webpage = path.read_text(encoding='utf-8')
+    start = webpage.find('<li')
+    end = webpage.rfind('</li>') + len('</li>')
+    if start == -1 or end < start:
+        return None
+    cards = CARD_PATTERN.findall(webpage[start:end])
+    if not cards:
+        return None
+
+    scaled_cards = []
+    for index in range(cards_count):
+        copy, card = divmod(index, len(cards))
+        scaled_cards.append(
+            JOB_ID_PATTERN.sub(lambda match: f'{match.group(1)}{int(match.group(2)) + copy * 10 ** 12}', cards[card])
+            if copy else cards[card]
+        )
+    return webpage[:start] + '\n'.join(scaled_cards) + webpage[end:]
@@ -0,0 +1,39 @@
+"""
+Record a results page with a fetch backend, to be used as a benchmark fixture.
+
+    python benchmarks/record.py "<search url>" --name data_engineer --backend http
+
+The page is anonymized (companies, job ids and tracking ids) and saved in benchmarks/fixtures/<name>.html.
+This is the only benchmark command that needs a network access, the benchmarks themselves run fully offline.
+"""
+import sys
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from fixtures import RECORDED_FIXTURES_DIR, anonymize_page  # noqa: E402
+from utils.fetch_backends import get_fetch_backend  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Record a results page as a benchmark fixture.')
+    parser.add_argument('url', help='The job search url')
+    parser.add_argument('--name', required=True, help='The fixture name')
+    parser.add_argument('--backend', default='http', help="The fetch backend, 'http' or 'chrome'")
+    args = parser.parse_args()
+
+    fetch_backend = get_fetch_backend(name=args.backend, headless=True)
+    try:
+        webpage = fetch_backend.start(url=args.url)
+    finally:
+        fetch_backend.close()
+
+    RECORDED_FIXTURES_DIR.mkdir(parents=True, exist_ok=True)
+    path = RECORDED_FIXTURES_DIR / f'{args.name}.html'
+    path.write_text(anonymize_page(webpage), encoding='utf-8')
+    print(f'Recorded {len(webpage)} characters in {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,360 @@
+"""
+Offline benchmarks of the parse, match and serialize hot path.
+
+    python benchmarks/run.py                    # run and compare with the baseline
+    python benchmarks/run.py --save-baseline    # run and store the results as the new baseline
+    python benchmarks/run.py --sizes 25 250 --repeat 3
+
+Each benchmark runs on synthetic results pages, and on the recorded pages of benchmarks/fixtures
+scaled to the same sizes, and reports its median duration, throughput and peak Python memory.
+A comparison run exits with an error when a benchmark uses more memory than the baseline by more
+than the threshold. Durations are compared relatively to a calibration workload measured with each
+run, and only reported as slower: they vary with the load of the machine, so they only fail the run
+with --fail-on-duration, on a dedicated machine where the baseline has been saved.
+"""
+import sys
+import re
+import json
+import time
+import argparse
+import platform
+import statistics
+import tracemalloc
+from pathlib import Path
+from datetime import datetime
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'src'))
+
+from loguru import logger  # noqa: E402
+from fixtures import synthetic_page, list_recorded_fixtures, recorded_page  # noqa: E402
+from utils.urls_scrapper import UrlsScraper  # noqa: E402
+from utils.job_matcher import JobMatcher, normalize_title  # noqa: E402
+from utils.html_parsers import PARSER_BACKENDS  # noqa: E402
+from utils.config_loader import Config  # noqa: E402
+from utils.datastats_utils import DataStats  # noqa: E402
+from utils.object_store import MemoryObjectStore  # noqa: E402
+
+
+SIZES = (25, 250, 1000, 5000)
+BASELINE_PATH = Path(__file__).parent / 'baseline.json'
+JOB_TO_SCRAP = 'data engineer'
+JOBS_TO_SCRAP = ['data engineer', 'data analyst', 'data scientist']
+JOB_SYNONYMS = {'data engineer': ['ingénieur data', 'ingénieur big data']}
+SHARDS_PER_MONTH = 30
+BUCKET_NAME = 'benchmarks'
+# Sub-millisecond benchmarks are dominated by noise, a slowdown under this delta is never a regression
+MIN_DURATION_DELTA = 0.001  # seconds
+RUN_DATE = datetime(2026, 10, 17, 8, 0)
+BENCHMARK_CONFIG = Config(
+    JOB_TO_SCRAP=JOB_TO_SCRAP,
+    DATASTATS_BUCKET_URLS=BUCKET_NAME,
+    DATASTATS_BUCKET_UTILS=BUCKET_NAME,
+    URL_TO_SCRAP='',
+    DB_NAME='',
+    DB_USER='',
+    DB_PORT='',
+    DB_HOST='',
+    DB_ROOT_CERT='',
+    DB_CERT='',
+    DB_KEY='',
+    DB_USER_PASSWORD='',
+    STORAGE_BACKEND='memory'
+)
+
+
+def measure(run, setup=None, repeat: int = 5) -> dict:
+    """
+    Measure the duration and the peak Python memory of a benchmark.
+
+    Parameters
+    ----------
+    run: callable
+        The benchmarked code
+    setup: callable [optional]
+        Called before each run, not measured (e.g. to clear caches)
+    repeat: int [optional]
+        The number of timed runs, default to 5
+
+    Returns
+    -------
+    dict
+        The median and min durations in seconds and the peak memory in bytes
+    """
+    # An untimed run first, so that lazy imports are not measured
+    if setup is not None:
+        setup()
+    run()
+
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+
+    # Memory is measured on a separate run, as tracing slows the code down
+    if setup is not None:
+        setup()
+    tracemalloc.start()
+    run()
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        'median_s': statistics.median(durations),
+        'min_s': min(durations),
+        'peak_memory_bytes': peak_memory
+    }
+
+
+def clear_caches() -> None:
+    normalize_title.cache_clear()
+
+
+def create_datastats(run_date: datetime = RUN_DATE, run_id: str = 'benchmark', store=None) -> DataStats:
+    """
+    Create a DataStats like the entry point does, with the benchmark config and an in-memory store.
+    """
+    return DataStats(
+        script_execution_start_time=run_date,
+        scraped_jobs_list=[],
+        matched_jobs_lists={},
+        config=BENCHMARK_CONFIG,
+        run_id=run_id,
+        store=store or MemoryObjectStore()
+    )
+
+
+def calibrate(repeat: int = 15) -> float:
+    """
+    Measure a fixed pure-Python workload (regex, string, dict and json operations, like the hot path),
+    independent of the code of the repository, to compare durations measured on different machines.
+
+    Returns
+    -------
+    float
+        The min duration of the workload in seconds
+    """
+    titles = [f'Senior Data Engineer {index} (H/F) - Paris, Île-de-France' for index in range(5000)]
+    pattern = re.compile(r'\(?\b[hf](?:/[hf])+\b\)?')
+
+    def workload():
+        words = {}
+        for title in titles:
+            for word in pattern.sub(' ', title.lower()).split():
+                words[word] = words.get(word, 0) + 1
+        json.loads(json.dumps(sorted(words.items())))
+
+    return measure(run=workload, repeat=repeat)['min_s']
+
+
+def benchmark_page(page: str, repeat: int) -> dict:
+    """
+    Run the benchmarks on a results page.
+
+    Parameters
+    ----------
+    page: str
+        The html code of the results page
+    repeat: int
+        The number of timed runs of each benchmark
+
+    Returns
+    -------
+    dict
+        The results of each benchmark
+    """
+    results = {}
+
+    for backend, (_, available) in PARSER_BACKENDS.items():
+        if not available:
+            continue
+        results[f'scraper.generate_urls_list[{backend}]'] = measure(
+            run=lambda: UrlsScraper(page, JOB_TO_SCRAP, parser_backend=backend).generate_urls_list(),
+            setup=clear_caches,
+            repeat=repeat
+        )
+
+    url_scrapper = UrlsScraper(page, JOB_TO_SCRAP)
+    cards_by_job = url_scrapper.generate_cards_by_job(JOBS_TO_SCRAP)
+    job_cards = url_scrapper.get_job_cards()
+    titles = [job_card.title for job_card in job_cards]
+
+    def match_titles():
+        matcher = JobMatcher.from_job_names(JOBS_TO_SCRAP, synonyms=JOB_SYNONYMS)
+        for title in titles:
+            matcher.match(title)
+
+    results['matcher.match'] = measure(run=match_titles, setup=clear_caches, repeat=repeat)
+
+    datastats = create_datastats()
+    results['datastats.generate_json_to_upload'] = measure(
+        run=lambda: datastats.generate_json_to_upload(
+            job_to_scrap=JOB_TO_SCRAP,
+            date='2026-10-17',
+            job_cards=cards_by_job[JOB_TO_SCRAP] or job_cards
+        ),
+        repeat=repeat
+    )
+
+    month_store = None
+
+    def setup_month():
+        nonlocal month_store
+        month_store = MemoryObjectStore()
+
+    def merge_month():
+        # One shard per daily run of the month, then the compaction of the month
+        for shard in range(SHARDS_PER_MONTH):
+            run_datastats = create_datastats(
+                run_date=datetime(2026, 9, 1 + shard % 30, 8, 0),
+                run_id=f'run-{shard}',
+                store=month_store
+            )
+            run_datastats.add_scraped_jobs_to_monthly_shard(bucket_name=BUCKET_NAME, jobs_list=titles)
+        run_datastats.compact_monthly_shards(bucket_name=BUCKET_NAME, year_month='2026-09')
+
+    results['datastats.monthly_list_merge'] = measure(run=merge_month, setup=setup_month, repeat=repeat)
+
+    items = {
+        'datastats.generate_json_to_upload': len(cards_by_job[JOB_TO_SCRAP] or job_cards),
+        'datastats.monthly_list_merge': len(titles) * SHARDS_PER_MONTH
+    }
+    for benchmark, result in results.items():
+        result['items'] = items.get(benchmark, len(job_cards))
+        result['throughput_per_s'] = result['items'] / result['median_s'] if result['median_s'] else None
+    return results
+
+
+def run_benchmarks(sizes: list, repeat: int) -> dict:
+    """
+    Run the benchmarks on the synthetic and recorded pages of each size.
+
+    Returns
+    -------
+    dict
+        The results, keyed by fixture, size and benchmark
+    """
+    fixtures = [('synthetic', lambda size: synthetic_page(size))]
+    for path in list_recorded_fixtures():
+        fixtures.append((f'recorded:{path.stem}', lambda size, path=path: recorded_page(path, size)))
+
+    results = {}
+    for fixture_name, make_page in fixtures:
+        for size in sizes:
+            page = make_page(size)
+            if page is None:
+                continue
+            print(f'Running {fixture_name} with {size} cards...', file=sys.stderr)
+            for benchmark, result in benchmark_page(page, repeat).items():
+                results[f'{fixture_name}/{size}/{benchmark}'] = result
+    return results
+
+
+def compare(results: dict, baseline: dict, threshold: float, speed_ratio: float = 1.0) -> list:
+    """
+    Compare the results with the baseline.
+
+    Parameters
+    ----------
+    results: dict
+        The results of the run
+    baseline: dict
+        The results of the baseline
+    threshold: float
+        The tolerated slowdown or memory increase
+    speed_ratio: float [optional]
+        The calibration duration of the run divided by the one of the baseline, the baseline
+        durations being scaled by it, default to 1 (same machine)
+
+    Returns
+    -------
+    list
+        The regressions, as (benchmark, metric, scaled baseline value, current value)
+    """
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        # The fastest run is the least disturbed by the other processes of the machine
+        reference_s = reference['min_s'] * speed_ratio
+        if result['min_s'] > max(reference_s * (1 + threshold), reference_s + MIN_DURATION_DELTA):
+            regressions.append((key, 'min_s', reference_s, result['min_s']))
+        if result['peak_memory_bytes'] > reference['peak_memory_bytes'] * (1 + threshold):
+            regressions.append((key, 'peak_memory_bytes', reference['peak_memory_bytes'], result['peak_memory_bytes']))
+    return regressions
+
+
+def print_results(results: dict, baseline: dict, speed_ratio: float = 1.0) -> None:
+    print(f"{'benchmark':<72} {'median':>10} {'vs base':>8} {'items/s':>12} {'peak mem':>10}")
+    for key, result in results.items():
+        reference = baseline.get(key)
+        ratio = f"{result['median_s'] / (reference['median_s'] * speed_ratio):.2f}x" if reference else '-'
+        print(
+            f"{key:<72} {result['median_s'] * 1000:>8.2f}ms {ratio:>8} "
+            f"{result['throughput_per_s'] or 0:>12,.0f} {result['peak_memory_bytes'] / 1024 ** 2:>8.2f}MB"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Run the offline benchmarks of the hot path.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(SIZES), help='The numbers of cards')
+    parser.add_argument('--repeat', type=int, default=5, help='The number of timed runs of each benchmark')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='The baseline results file')
+    parser.add_argument('--save-baseline', action='store_true', help='Store the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='The tolerated slowdown, default to 25%%')
+    parser.add_argument('--output', type=Path, help='Also write the results to this file')
+    parser.add_argument(
+        '--fail-on-duration',
+        action='store_true',
+        help='Also fail on slower durations, on the machine where the baseline has been saved'
+    )
+    args = parser.parse_args()
+
+    # The per-card logs of the scraper are not part of what is measured
+    logger.remove()
+
+    # Calibrated before and after the benchmarks, the fastest being the least disturbed
+    calibration_s = calibrate()
+    results = run_benchmarks(args.sizes, args.repeat)
+    calibration_s = min(calibration_s, calibrate())
+    baseline_report = json.loads(args.baseline.read_text()) if args.baseline.exists() else {'results': {}}
+    baseline = {} if args.save_baseline else baseline_report['results']
+    speed_ratio = 1.0
+    if baseline:
+        if baseline_report.get('calibration_s'):
+            speed_ratio = calibration_s / baseline_report['calibration_s']
+            print(f'This machine runs the calibration {speed_ratio:.2f}x the time of the baseline machine', file=sys.stderr)
+        else:
+            print('The baseline has no calibration, durations are compared as measured', file=sys.stderr)
+    print_results(results, baseline, speed_ratio)
+
+    report = {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'calibration_s': calibration_s,
+        'results': results
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f'Baseline saved in {args.baseline}')
+        return
+
+    regressions = []
+    for key, metric, reference, current in compare(results, baseline, args.threshold, speed_ratio):
+        if metric == 'min_s' and not args.fail_on_duration:
+            print(f'SLOWER {key} {metric}: {reference:.6g} -> {current:.6g}')
+            continue
+        print(f'REGRESSION {key} {metric}: {reference:.6g} -> {current:.6g}')
+        regressions.append(key)
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
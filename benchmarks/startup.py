@@ -0,0 +1,153 @@
+"""
+Cold-start report of the entry point, from the `python -X importtime` breakdown.
+
+    python benchmarks/startup.py                  # report and check the budgets
+    python benchmarks/startup.py --top 30 --repeat 10
+
+Each scenario imports, in a fresh interpreter, the modules a run loads before doing its work.
+The report shows the wall time of the interpreter, the total import time and the packages
+costing the most, and exits with an error when the import time of a scenario exceeds its budget.
+In production, PYTHONPROFILEIMPORTTIME=1 writes the same breakdown in the logs of an execution,
+and the `main.startup` stage timing records the startup of every execution.
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from collections import defaultdict
+
+
+SRC_DIR = Path(__file__).resolve().parent.parent / 'src'
+
+# Import statement and import time budget in milliseconds of each scenario. The budgets leave
+# about 2x headroom over the medians measured on a development machine (~110, ~450 and ~550 ms),
+# so that noise does not fail the check while an eager heavy import still does
+SCENARIOS = {
+    # Importing the entry point, before the config is loaded
+    'entry': ('import main', 250),
+    # Modules imported by a run with the HTTP fetch backend, until the sinks are done
+    'http_run': (
+        'import main, utils.fetch_backends, utils.urls_scrapper, utils.datastats_utils, utils.gcp_utils, '
+        'google.cloud.logging',
+        1000
+    ),
+    # Same with the Chrome fetch backend
+    'chrome_run': (
+        'import main, utils.webpage_generator, utils.urls_scrapper, utils.datastats_utils, utils.gcp_utils, '
+        'google.cloud.logging',
+        1200
+    ),
+}
+
+
+def parse_importtime(output: str) -> list:
+    """
+    Parse the output of `python -X importtime`.
+
+    Parameters
+    ----------
+    output: str
+        The stderr of the interpreter
+
+    Returns
+    -------
+    list
+        The imports as (module, self time in us, cumulative time in us), in import order
+    """
+    imports = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, self_us, cumulative_us, name = (part for part in line.replace('import time:', '|', 1).split('|'))
+        imports.append((name.strip(), int(self_us), int(cumulative_us)))
+    return imports
+
+
+def measure(statement: str) -> dict:
+    """
+    Import modules in a fresh interpreter.
+
+    Parameters
+    ----------
+    statement: str
+        The import statement
+
+    Returns
+    -------
+    dict
+        The wall time and the total import time in milliseconds, and the import time
+        in milliseconds of each top-level package
+    """
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        cwd=SRC_DIR,
+        env={**os.environ, 'PYTHONPATH': str(SRC_DIR)},
+        capture_output=True,
+        text=True
+    )
+    wall_time = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f'Error while importing {statement!r}: {process.stderr[-2000:]}')
+
+    # The self times are summed per top-level package, whichever module imported it
+    packages = defaultdict(int)
+    for name, self_us, _ in parse_importtime(process.stderr):
+        packages[name.split('.')[0]] += self_us
+    return {
+        'wall_ms': wall_time * 1000,
+        'import_ms': sum(packages.values()) / 1000,
+        'packages_ms': {name: self_us / 1000 for name, self_us in packages.items()}
+    }
+
+
+def run_scenario(statement: str, repeat: int) -> dict:
+    """
+    Measure a scenario several times and keep the median run, so that a single slow
+    or fast run does not decide of the budget check.
+    """
+    runs = sorted((measure(statement) for _ in range(repeat)), key=lambda run: run['import_ms'])
+    median = dict(runs[len(runs) // 2])
+    median['import_ms'] = statistics.median(run['import_ms'] for run in runs)
+    return median
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Report the cold-start import time of the entry point.')
+    parser.add_argument('--repeat', type=int, default=7, help='The number of runs of each scenario')
+    parser.add_argument('--top', type=int, default=15, help='The number of packages shown per scenario')
+    parser.add_argument('--output', type=Path, help='Also write the report to this file')
+    args = parser.parse_args()
+
+    interpreter = run_scenario('pass', args.repeat)
+    print(f"Interpreter startup: {interpreter['wall_ms']:.1f} ms")
+
+    report, over_budget = {'interpreter_wall_ms': interpreter['wall_ms'], 'scenarios': {}}, []
+    for scenario, (statement, budget_ms) in SCENARIOS.items():
+        result = run_scenario(statement, args.repeat)
+        result['budget_ms'] = budget_ms
+        report['scenarios'][scenario] = result
+
+        status = 'OK' if result['import_ms'] <= budget_ms else 'OVER BUDGET'
+        print(
+            f"\n{scenario}: {result['import_ms']:.1f} ms of imports (budget {budget_ms} ms, {status}), "
+            f"{result['wall_ms']:.1f} ms wall time"
+        )
+        for name, package_ms in sorted(result['packages_ms'].items(), key=lambda item: -item[1])[:args.top]:
+            print(f'    {name:<40} {package_ms:>9.1f} ms')
+        if result['import_ms'] > budget_ms:
+            over_budget.append(scenario)
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+    if over_budget:
+        print(f"\nImport time over budget for: {', '.join(over_budget)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
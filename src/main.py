@@ -1,18 +1,48 @@
+import time
 
-import sys
-from loguru import logger
-from datetime import datetime
-from utils.webpage_generator import WebpageGenerator
-from utils.urls_scrapper import UrlsScraper
-from utils.config_loader import Config
-from utils.datastats_utils import DataStats
-from google.cloud import logging as gcloud_logging
+# Measured from the first statement, so that the import time of the entry point is part of the run timings
+STARTUP_TIME = time.perf_counter()
 
-# Initialize Google Cloud Logging
-client = gcloud_logging.Client()
-client.setup_logging()
+import sys  # noqa: E402
+import atexit  # noqa: E402
+from functools import partial  # noqa: E402
+from loguru import logger  # noqa: E402
+from datetime import datetime  # noqa: E402
+from utils.config_loader import Config  # noqa: E402
+from utils.timing import span, timings  # noqa: E402
 
-if __name__ == '__main__':
+# Heavy modules (Selenium, parsers, Google Cloud clients, pg8000) are imported by the steps that need them,
+# so that the container starts working as soon as possible. See benchmarks/startup.py for the cold-start budget.
+
+
+def setup_cloud_logging() -> None:
+    """
+    Route the standard logging records (e.g. the stage timings) to Google Cloud Logging.
+    Errors are logged, as logs are still written to stderr without it.
+    """
+    try:
+        from google.cloud import logging as gcloud_logging
+        client = gcloud_logging.Client()
+        client.setup_logging()
+    except Exception as e:
+        logger.warning(f'Error while setting up Google Cloud Logging: {e}')
+
+
+def create_browser_manager(config: Config):
+    """
+    Create the manager of the Chrome browser from the config.
+    """
+    from utils.browser_manager import BrowserManager
+    return BrowserManager(
+        headless=True,
+        chromedriver_path=config.CHROMEDRIVER_PATH or None,
+        blocked_resources=config.get_blocked_resources(),
+        rendering_lite=config.is_rendering_lite_enabled(),
+        network_logging=config.is_profiling_enabled()
+    )
+
+
+def main() -> None:
 
     # ------------------------------------------------------------------------------------------------------------------
     # Set config & env vars
@@ -23,40 +53,98 @@ if __name__ == '__main__':
     except EnvironmentError as e:
         logger.error(f'Error while generating config: {e}')
         sys.exit(1)
+    
+    # Chrome is only created when needed, except with the chrome backend: it then starts
+    # in the background while the run is being set up
+    browser_manager_factory = partial(create_browser_manager, config)
+    if config.FETCH_BACKEND == 'chrome':
+        try:
+            browser_manager = create_browser_manager(config)
+        except ValueError as e:
+            logger.error(f'Error while configuring Chrome: {e}')
+            sys.exit(1)
+        browser_manager.prewarm()
+        atexit.register(browser_manager.quit)
+        browser_manager_factory = lambda: browser_manager  # noqa: E731
+    
+    # Deferred until the config is valid, the client lookups are not paid by a misconfigured execution
+    with span('main.cloud_logging'):
+        setup_cloud_logging()
+    timings.record('main.startup', start=STARTUP_TIME)
         
     # Formatted variables 
     url_to_scrap = config.URL_TO_SCRAP.replace(
         'JOB_TO_SCRAP', config.JOB_TO_SCRAP.replace(' ', '%20')                
     ) 
     
+    # Job names the webpage is classified for, several in fan-out mode
+    jobs_to_scrap = config.get_jobs_to_scrap()
+    
     # Date utils variables
     script_execution_start_time = datetime.now()
+    run_id = None
+    
+    # A single storage session for the whole run (fingerprint pool, profiles, Datastats files)
+    from utils.object_store import get_object_store
+    store = get_object_store(name=config.STORAGE_BACKEND, root_dir=config.STORAGE_LOCAL_DIR)
     
-    logger.info(f'Scrapping {config.JOB_TO_SCRAP} jobs')
+    # Opt-in CPU and memory profiling, saved when the process exits
+    if config.is_profiling_enabled():
+        from utils.profiling import RunProfiler
+        from utils.datastats_utils import generate_run_id
+        run_id = generate_run_id(script_execution_start_time)
+        profiler = RunProfiler(run_id=run_id)
+        profiler.start()
+        atexit.register(
+            profiler.finish,
+            store=store,
+            bucket_name=config.DATASTATS_BUCKET_UTILS
+        )
+    
+    logger.info(f'Scrapping {config.JOB_TO_SCRAP} jobs for: {", ".join(jobs_to_scrap)}')
     
     # ------------------------------------------------------------------------------------------------------------------
-    # Selenium webpage generation
+    # Webpage generation (guest HTTP endpoint or Selenium)
     # ------------------------------------------------------------------------------------------------------------------
 
+    fetch_backend = None
     try:
-        logger.info('Generating webpage...')
-        webpage_generator = WebpageGenerator(headless=True)                   
-        webpage = webpage_generator.start(url=url_to_scrap)                    
+        logger.info(f'Generating webpage with {config.FETCH_BACKEND} backend...')
+        with span('main.fetch', backend=config.FETCH_BACKEND):
+            from utils.fetch_backends import get_fetch_backend
+            fetch_backend = get_fetch_backend(
+                name=config.FETCH_BACKEND,
+                headless=True,
+                store=store,
+                bucket_name=config.DATASTATS_BUCKET_UTILS,
+                browser_manager_factory=browser_manager_factory
+            )
+            webpage = fetch_backend.start(url=url_to_scrap)                    
     except Exception as e:
         logger.error(f"Error while trying to generate webpage: {e}")
         sys.exit(1)
+    finally:
+        if fetch_backend is not None:
+            fetch_backend.close()
         
     # ------------------------------------------------------------------------------------------------------------------
-    # Beautifulsoup urls scraping from webpage
+    # Urls scraping from webpage
     # ------------------------------------------------------------------------------------------------------------------
 
     try:
         logger.info('Scraping urls and generating jobs list...')
-        url_scrapper = UrlsScraper(webpage=webpage, job_to_scrap=config.JOB_TO_SCRAP) 
-        urls_list = url_scrapper.generate_urls_list()                              
-        scraped_jobs_list = url_scrapper.get_jobs_list()                           
+        with span('main.scrape'):
+            from utils.urls_scrapper import UrlsScraper
+            url_scrapper = UrlsScraper(
+                webpage=webpage, 
+                job_to_scrap=config.JOB_TO_SCRAP, 
+                parser_backend=config.PARSER_BACKEND,
+                job_synonyms=config.get_job_synonyms()
+            )
+            cards_by_job = url_scrapper.generate_cards_by_job(jobs_to_scrap)              
+            scraped_jobs_list = url_scrapper.get_job_cards()                           
     except Exception as e:
-        logger.error(f"Error while scraping with BeautifulSoup: {e}")
+        logger.error(f"Error while scraping urls: {e}")
         sys.exit(1)
 
     # ------------------------------------------------------------------------------------------------------------------
@@ -65,14 +153,24 @@ if __name__ == '__main__':
 
     try:
         logger.info('Starting Datastats resources workflow...')
+        from utils.datastats_utils import DataStats
         datastats = DataStats(
             script_execution_start_time=script_execution_start_time, 
             scraped_jobs_list=scraped_jobs_list,
-            matched_jobs_list=urls_list,
-            config=config
+            matched_jobs_lists=cards_by_job,
+            config=config,
+            run_id=run_id,
+            store=store
             )
         
-        datastats.start_workflow()
+        with span('main.datastats'):
+            datastats.start_workflow()
     except Exception as e:
         logger.error(f"Error while interacting with Datastats resources: {e}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+    finally:
+        timings.log()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,397 @@
+import json
+import shutil
+import fnmatch
+from loguru import logger
+from collections import Counter
+from urllib.parse import urlsplit
+from concurrent.futures import ThreadPoolExecutor
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from selenium.common.exceptions import WebDriverException
+from .fingerprints import Fingerprint
+from .timing import span
+
+
+PAGE_LOAD_TIMEOUT = 30  # seconds
+SCRIPT_TIMEOUT = 30     # seconds
+MAX_HARD_FAILURES = 3   # consecutive hard failures before restarting Chrome
+RENDERING_LITE_WINDOW = (1920, 1080)  # max window size rendered in rendering-lite mode
+
+# URL patterns blocked with CDP for each resource category, only the DOM of the results list is read
+BLOCKED_URL_PATTERNS = {
+    'images': [
+        '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.avif*', '*.svg*', '*.ico*',
+        '*media.licdn.com/dms/image/*',
+    ],
+    'media': ['*.mp4*', '*.webm*', '*.m3u8*', '*.mp3*', '*.ogg*', '*media.licdn.com/playlist/*'],
+    'fonts': ['*.woff*', '*.ttf*', '*.otf*', '*.eot*'],
+    'stylesheets': ['*.css*'],
+    'analytics': [
+        '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*', '*bat.bing.com/*',
+        '*connect.facebook.net/*', '*px.ads.linkedin.com/*', '*snap.licdn.com/*', '*linkedin.com/li/track*',
+    ],
+}
+DEFAULT_BLOCKED_RESOURCES = ('images', 'media', 'fonts', 'analytics')
+# Reference transferred bytes per request of each resource category, used to estimate the bytes saved by the
+# blocked requests when none of their category was loaded during the run. To refresh them, run with
+# BLOCKED_RESOURCES empty and read the averages of the 'loaded_by_category' network report
+RESOURCE_SIZES = {
+    'images': 12_000,
+    'media': 250_000,
+    'fonts': 30_000,
+    'stylesheets': 45_000,
+    'analytics': 2_000,
+}
+
+
+class BrowserManager:
+    def __init__(
+        self,
+        headless: bool = True,
+        chromedriver_path: str = None,
+        max_hard_failures: int = MAX_HARD_FAILURES,
+        blocked_resources: tuple = DEFAULT_BLOCKED_RESOURCES,
+        rendering_lite: bool = True,
+        network_logging: bool = False
+    ) -> None:
+        """
+        Lifecycle manager of the Chrome browser driven by Selenium.
+
+        Chrome is started once, possibly in the background while the run is being set up (prewarm).
+        Fingerprints are applied per tab with CDP overrides, so that a rotation or a recovery only
+        opens a fresh tab and clears cookies, cache and storage instead of restarting the browser.
+        Chrome is restarted only when it is unusable or after repeated hard failures (driver errors).
+        Resources that are not needed to read the results list (images, media, fonts, analytics...)
+        are blocked, and the network activity can be collected from the performance logs.
+
+        Parameters
+        ----------
+        headless: bool [optional]
+            run Chrome headless, default to True
+        chromedriver_path: str [optional]
+            the pinned chromedriver path, default to the chromedriver found in the PATH.
+            Selenium Manager only resolves the driver at runtime when there is none
+        max_hard_failures: int [optional]
+            the consecutive hard failures before restarting Chrome, default to 3
+        blocked_resources: tuple [optional]
+            the blocked resource categories among 'images', 'media', 'fonts', 'stylesheets' and 'analytics',
+            default to images, media, fonts and analytics
+        rendering_lite: bool [optional]
+            cap the window size and disable the rendering features not needed to read the page, default to True
+        network_logging: bool [optional]
+            collect the network activity from the performance logs, buffered by chromedriver
+            for the whole session, default to False
+        """
+        self.headless = headless
+        self.chromedriver_path = chromedriver_path or shutil.which('chromedriver')
+        self.max_hard_failures = max_hard_failures
+        self.hard_failures = 0
+        self.restarts = 0
+        self.blocked_resources = tuple(blocked_resources)
+        self.rendering_lite = rendering_lite
+        self.network_logging = network_logging
+        self.driver = None
+        self._prewarm = None
+        self.network = {'requests': 0, 'bytes': 0, 'blocked': Counter(), 'loaded': Counter(), 'loaded_bytes': Counter()}
+        self._request_urls = {}
+
+        unknown_resources = set(self.blocked_resources) - set(BLOCKED_URL_PATTERNS)
+        if unknown_resources:
+            raise ValueError(f"Unknown resource categories: {', '.join(sorted(unknown_resources))}")
+
+    def _build_options(self) -> webdriver.ChromeOptions:
+        """
+        Build the Chrome options shared by every fingerprint.
+        """
+        options = webdriver.ChromeOptions()
+        options.add_argument("--disable-blink-features=AutomationControlled")
+        options.add_argument('--ignore-certificate-errors')
+        options.add_argument('--ignore-ssl-errors')
+        options.add_argument('--incognito')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--disable-features=MediaSessionService')
+        options.add_argument('--disable-features=VizDisplayCompositor')
+        if self.headless:
+            options.add_argument('--headless')
+
+        # Images and fonts are also skipped by the renderer, even when served from an unlisted url
+        if 'images' in self.blocked_resources:
+            options.add_argument('--blink-settings=imagesEnabled=false')
+            options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        if 'fonts' in self.blocked_resources:
+            options.add_argument('--disable-remote-fonts')
+        if self.rendering_lite:
+            options.add_argument('--force-device-scale-factor=1')
+            options.add_argument('--hide-scrollbars')
+            options.add_argument('--mute-audio')
+            options.add_argument('--autoplay-policy=user-gesture-required')
+            options.add_argument('--disable-extensions')
+
+        # Network events are read from the performance logs to report the transferred and blocked requests
+        if self.network_logging:
+            options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+            options.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+        return options
+
+    def _start_browser(self) -> webdriver.Chrome:
+        """
+        Start Chrome and chromedriver.
+        """
+        if self.chromedriver_path:
+            service = Service(executable_path=self.chromedriver_path)
+        else:
+            logger.warning('No pinned chromedriver, Selenium Manager resolves it at runtime')
+            service = Service()
+        with span('webpage.chrome_startup'):
+            driver = webdriver.Chrome(options=self._build_options(), service=service)
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        driver.set_script_timeout(SCRIPT_TIMEOUT)
+        return driver
+
+    def prewarm(self) -> None:
+        """
+        Start Chrome in the background, so that its startup overlaps with the setup of the run.
+        """
+        if self.driver is None and self._prewarm is None:
+            logger.info('Prewarming Chrome...')
+            executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='chrome-prewarm')
+            self._prewarm = executor.submit(self._start_browser)
+            executor.shutdown(wait=False)
+
+    def _wait_prewarm(self) -> None:
+        """
+        Get the prewarmed browser, if any.
+        """
+        if self._prewarm is None:
+            return
+        prewarm, self._prewarm = self._prewarm, None
+        try:
+            self.driver = prewarm.result()
+        except Exception as e:
+            logger.warning(f'Error while prewarming Chrome, starting it again: {e}')
+
+    def _apply_fingerprint(self, fingerprint: Fingerprint) -> None:
+        """
+        Apply a fingerprint to the current tab, before its first navigation.
+        """
+        language = fingerprint.language
+        self.driver.execute_cdp_cmd(
+            'Network.setUserAgentOverride',
+            {'userAgent': fingerprint.user_agent, 'acceptLanguage': fingerprint.accept_language}
+        )
+        try:
+            self.driver.execute_cdp_cmd('Emulation.setLocaleOverride', {'locale': language.replace('-', '_')})
+        except WebDriverException as e:
+            logger.debug(f'Locale override not applied: {e}')
+        width, height = (int(size) for size in fingerprint.window_size.split(','))
+        if self.rendering_lite:
+            width, height = min(width, RENDERING_LITE_WINDOW[0]), min(height, RENDERING_LITE_WINDOW[1])
+        self.driver.set_window_size(width, height)
+
+    def _apply_blocking(self) -> None:
+        """
+        Block the urls of the blocked resource categories in the current tab.
+        """
+        patterns = [pattern for resource in self.blocked_resources for pattern in BLOCKED_URL_PATTERNS[resource]]
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns})
+
+    def _configure_tab(self, fingerprint: Fingerprint) -> None:
+        """
+        Configure the current tab before its first navigation.
+        """
+        self._apply_fingerprint(fingerprint)
+        if self.blocked_resources:
+            self._apply_blocking()
+
+    def acquire(self, fingerprint: Fingerprint) -> webdriver.Chrome:
+        """
+        Get the driver with a fingerprint applied, starting Chrome if it is not prewarmed.
+
+        Parameters
+        ----------
+        fingerprint: Fingerprint
+            The fingerprint presented to the website
+
+        Returns
+        -------
+        webdriver.Chrome
+            The driver
+        """
+        self._wait_prewarm()
+        try:
+            if self.driver is None:
+                self.driver = self._start_browser()
+            self._configure_tab(fingerprint)
+        except Exception as e:
+            logger.error(f'Error while initializing Selenium webdriver : {e}')
+            raise e
+        return self.driver
+
+    def _recycle(self, fingerprint: Fingerprint, url: str = None) -> None:
+        """
+        Replace the tabs with a fresh one and clear cookies, cache and storage.
+        """
+        old_handles = self.driver.window_handles
+        self.driver.switch_to.new_window('tab')
+        new_handle = self.driver.current_window_handle
+        for handle in old_handles:
+            self.driver.switch_to.window(handle)
+            self.driver.close()
+        self.driver.switch_to.window(new_handle)
+
+        self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        self.driver.execute_cdp_cmd('Network.clearBrowserCache', {})
+        if url:
+            parts = urlsplit(url)
+            self.driver.execute_cdp_cmd(
+                'Storage.clearDataForOrigin',
+                {'origin': f'{parts.scheme}://{parts.netloc}', 'storageTypes': 'all'}
+            )
+        self._configure_tab(fingerprint)
+
+    def recover(self, fingerprint: Fingerprint, url: str = None) -> webdriver.Chrome:
+        """
+        Recover from a failed attempt with a new fingerprint: the browser is recycled in a fresh tab,
+        and restarted only after max_hard_failures consecutive hard failures (see record_attempt)
+        or if it cannot be recycled.
+
+        Parameters
+        ----------
+        fingerprint: Fingerprint
+            The fingerprint presented to the website from now on
+        url: str [optional]
+            The url of the failed attempt, whose origin storage is cleared
+
+        Returns
+        -------
+        webdriver.Chrome
+            The driver
+        """
+        if self.hard_failures >= self.max_hard_failures:
+            self.restart(reason=f'{self.hard_failures} consecutive hard failures')
+        elif self.driver is not None:
+            try:
+                with span('webpage.recycle'):
+                    self._recycle(fingerprint, url)
+                return self.driver
+            except WebDriverException as e:
+                self.restart(reason=f'recycling failed: {e}')
+        return self.acquire(fingerprint)
+
+    def record_attempt(self, hard_failure: bool = False) -> None:
+        """
+        Count the consecutive hard failures: a hard failure increments the count,
+        and any other outcome (a success, a block, a timeout...) resets it.
+
+        Parameters
+        ----------
+        hard_failure: bool [optional]
+            True if the attempt failed because of the driver, default to False
+        """
+        self.hard_failures = self.hard_failures + 1 if hard_failure else 0
+
+    def restart(self, reason: str) -> None:
+        """
+        Quit Chrome, it is started again by the next acquire.
+
+        Parameters
+        ----------
+        reason: str
+            The reason of the restart, logged
+        """
+        logger.warning(f'Restarting Chrome ({reason})...')
+        self.restarts += 1
+        self.hard_failures = 0
+        self.quit()
+
+    def _categorize(self, url: str) -> str:
+        """
+        Get the resource category of a url, 'other' when it is in none of the blockable categories.
+        """
+        for resource in BLOCKED_URL_PATTERNS:
+            if any(fnmatch.fnmatchcase(url, pattern) for pattern in BLOCKED_URL_PATTERNS[resource]):
+                return resource
+        return 'other'
+
+    def _collect_network_logs(self) -> None:
+        """
+        Read the network events of the performance logs since the previous read.
+        """
+        if self.driver is None or not self.network_logging:
+            return
+        try:
+            entries = self.driver.get_log('performance')
+        except Exception as e:
+            logger.debug(f'Performance logs not available: {e}')
+            return
+
+        for entry in entries:
+            message = json.loads(entry['message'])['message']
+            method, params = message.get('method'), message.get('params', {})
+            if method == 'Network.requestWillBeSent':
+                self._request_urls[params['requestId']] = params['request']['url']
+            elif method == 'Network.loadingFinished':
+                size = int(params.get('encodedDataLength', 0))
+                resource = self._categorize(self._request_urls.get(params['requestId'], ''))
+                self.network['requests'] += 1
+                self.network['bytes'] += size
+                self.network['loaded'][resource] += 1
+                self.network['loaded_bytes'][resource] += size
+            elif method == 'Network.loadingFailed' and params.get('blockedReason'):
+                self.network['blocked'][self._categorize(self._request_urls.get(params['requestId'], ''))] += 1
+
+    def _estimate_bytes_saved(self) -> int:
+        """
+        Estimate the bytes that the blocked requests would have transferred: each blocked request counts for the
+        average size of the requests of its category loaded during the run, or for its reference size
+        (`RESOURCE_SIZES`) when none was loaded. Requests never sent (e.g. images disabled in the renderer)
+        are not counted, so the estimate is a lower bound.
+        """
+        bytes_saved = 0
+        for resource, count in self.network['blocked'].items():
+            if self.network['loaded'][resource]:
+                size = self.network['loaded_bytes'][resource] / self.network['loaded'][resource]
+            else:
+                size = RESOURCE_SIZES.get(resource, 0)
+            bytes_saved += count * size
+        return int(bytes_saved)
+
+    def network_report(self) -> dict:
+        """
+        Report the network activity of the browser since it was started, including the restarted browsers.
+
+        Returns
+        -------
+        dict
+            The loaded requests and their transferred bytes, overall and per resource category, the blocked
+            requests per resource category and the estimated bytes saved by blocking them
+        """
+        self._collect_network_logs()
+        return {
+            'requests': self.network['requests'],
+            'bytes': self.network['bytes'],
+            'loaded_by_category': {
+                resource: {'requests': count, 'bytes': self.network['loaded_bytes'][resource]}
+                for resource, count in self.network['loaded'].items()
+            },
+            'blocked_requests': sum(self.network['blocked'].values()),
+            'blocked_by_category': dict(self.network['blocked']),
+            'bytes_saved_estimate': self._estimate_bytes_saved()
+        }
+
+    def quit(self) -> None:
+        """
+        Safely quit Chrome and chromedriver, including a browser still prewarming.
+        """
+        self._wait_prewarm()
+        self._collect_network_logs()
+        if self.driver:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            finally:
+                self.driver = None
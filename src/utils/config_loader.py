@@ -1,7 +1,8 @@
 import os
+import json
 from loguru import logger
 from dotenv import load_dotenv
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, MISSING
 
 load_dotenv()
 
@@ -12,6 +13,7 @@ class Config:
     
     If a new environment variable is added to the container, add it here.
     Do not forget to specify the type. 
+    Variables with a default value are optional.
     """
     JOB_TO_SCRAP: str
     DATASTATS_BUCKET_URLS: str
@@ -25,6 +27,16 @@ class Config:
     DB_CERT: str
     DB_KEY: str
     DB_USER_PASSWORD: str
+    JOBS_TO_SCRAP: str = ''
+    FETCH_BACKEND: str = 'http'
+    PARSER_BACKEND: str = 'auto'
+    JOB_SYNONYMS: str = ''
+    STORAGE_BACKEND: str = 'gcs'
+    STORAGE_LOCAL_DIR: str = '.storage'
+    PROFILING: str = ''
+    CHROMEDRIVER_PATH: str = ''
+    BLOCKED_RESOURCES: str = 'images,media,fonts,analytics'
+    RENDERING_LITE: str = 'true'
 
     @classmethod
     def load(cls) -> 'Config':
@@ -44,12 +56,84 @@ class Config:
         """
         logger.info('Generating config from environment variables...')
         env_vars = {
-            key: os.getenv(key)
-            for key in cls.__annotations__.keys()
+            field.name: os.getenv(field.name, field.default)
+            for field in fields(cls)
         }
 
-        missing_vars = [key for key, value in env_vars.items() if value is None]
+        missing_vars = [key for key, value in env_vars.items() if value is None or value is MISSING]
         if missing_vars:
             raise EnvironmentError(f"Missing environment variables: {', '.join(missing_vars)}")
 
         return cls(**env_vars)
+
+    def get_jobs_to_scrap(self) -> list:
+        """
+        Get the job names to classify the scraped webpage for.
+        
+        In fan-out mode, JOBS_TO_SCRAP contains a comma-separated list of job names
+        and JOB_TO_SCRAP is only used as the (broader) search query. 
+        Otherwise, JOB_TO_SCRAP is both the search query and the only job name.
+        
+        Returns
+        -------
+        list
+            The list of job names
+        """
+        if self.JOBS_TO_SCRAP:
+            return [job.strip() for job in self.JOBS_TO_SCRAP.split(',') if job.strip()]
+        return [self.JOB_TO_SCRAP]
+
+    def get_job_synonyms(self) -> dict:
+        """
+        Get the synonyms of the job names.
+        
+        JOB_SYNONYMS contains a JSON object with, for each job name, the list of its synonyms,
+        e.g. {"data engineer": ["ingénieur data", "ingénieur big data"]}.
+        
+        Returns
+        -------
+        dict
+            The synonyms for each job name, empty if JOB_SYNONYMS is not set
+        """
+        return json.loads(self.JOB_SYNONYMS) if self.JOB_SYNONYMS else {}
+
+    def is_profiling_enabled(self) -> bool:
+        """
+        Check if the run must be profiled.
+        
+        PROFILING enables the CPU and memory profiling of the run, and the network report of Chrome,
+        when set to "1", "true" or "yes".
+        
+        Returns
+        -------
+        bool
+            True if the run must be profiled
+        """
+        return self.PROFILING.strip().lower() in ('1', 'true', 'yes')
+
+    def get_blocked_resources(self) -> list:
+        """
+        Get the resource categories blocked by Chrome.
+        
+        BLOCKED_RESOURCES is a comma-separated list among "images", "media", "fonts", "stylesheets"
+        and "analytics", empty to load every resource.
+        
+        Returns
+        -------
+        list
+            The blocked resource categories
+        """
+        return [resource.strip() for resource in self.BLOCKED_RESOURCES.split(',') if resource.strip()]
+
+    def is_rendering_lite_enabled(self) -> bool:
+        """
+        Check if Chrome must run with the rendering-lite profile.
+        
+        RENDERING_LITE caps the window size and disables unneeded rendering features when set to "1", "true" or "yes".
+        
+        Returns
+        -------
+        bool
+            True if the rendering-lite profile is enabled
+        """
+        return self.RENDERING_LITE.strip().lower() in ('1', 'true', 'yes')
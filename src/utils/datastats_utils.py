@@ -1,19 +1,51 @@
 import os
 import json
 import time
+import uuid
 from loguru import logger
-from datetime import datetime
-from .gcp_utils import GoogleUtils
+from collections import Counter
+from contextlib import contextmanager, ExitStack
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from google.api_core.exceptions import PreconditionFailed, NotFound
+from .object_store import ObjectStore, get_object_store
 from .pg_utils import PostgresUtils
 from .config_loader import Config
+from .timing import span, timings
+
+
+MONTHLY_JOBS_LIST_SUFFIX = 'jobs_list.json'
+COMPACTION_FOLDER = '_compaction'   # temporary blobs of the compactions, out of the shards prefixes
+COMPACTION_ATTEMPTS = 3
+
+
+def generate_run_id(script_execution_start_time: datetime) -> str:
+    """
+    Generate the identifier of a run, from its start time and its Cloud Run execution name.
+    
+    Parameters
+    ----------
+    script_execution_start_time : datetime
+        The datetime when the script was executed.
+        
+    Returns
+    -------
+    str
+        The run identifier, e.g. '2026-10-17_08-00_datastats-urls-scraper-abcde'
+    """
+    file_name_date_time = script_execution_start_time.strftime("%Y-%m-%d_%H-%M")
+    return f'{file_name_date_time}_{os.getenv("CLOUD_RUN_EXECUTION") or uuid.uuid4().hex[:12]}'
+
 
 class DataStats:
     def __init__(
             self, 
             script_execution_start_time: str,
             scraped_jobs_list: list,
-            matched_jobs_list: list,
-            config: Config
+            matched_jobs_lists: dict,
+            config: Config,
+            run_id: str = None,
+            store: ObjectStore = None
         ) -> None:
         """
         Class to interact with Datastats project and resources. 
@@ -23,11 +55,15 @@ class DataStats:
         script_execution_start_time : str
             The datetime when the script was executed.
         scraped_jobs_list : list
-            The list of scraped jobs.
-        matched_jobs_list : list
-            The list of matched jobs from scraped_jobs_list.
+            The list of scraped jobs, as JobCard.
+        matched_jobs_lists : dict
+            The lists of matched jobs from scraped_jobs_list, as JobCard, for each job name.
         config: Config
             The config instance containing variables
+        run_id : str [optional]
+            The run identifier, generated from the start time if not set
+        store : ObjectStore [optional]
+            The object store of the run, created from the config if not set
         
         Returns
         -------
@@ -38,9 +74,10 @@ class DataStats:
         self.script_execution_start_time = script_execution_start_time
         self.today = script_execution_start_time.strftime("%Y-%m-%d")
         self.year_month = script_execution_start_time.strftime("%Y-%m")
-        file_name_date_time = script_execution_start_time.strftime("%Y-%m-%d_%H-%M")
-        self.daily_jobs_file_name = f'{file_name_date_time}_{config.JOB_TO_SCRAP}.json'
-        self.monthly_jobs_list_json = f'{self.year_month}_jobs_list.json'
+        self.previous_year_month = (script_execution_start_time.replace(day=1) - timedelta(days=1)).strftime("%Y-%m")
+        self.file_name_date_time = script_execution_start_time.strftime("%Y-%m-%d_%H-%M")
+        self.run_id = run_id or generate_run_id(script_execution_start_time)
+        self.monthly_jobs_shard_name = f'{self.year_month}/{self.run_id}.ndjson'
         self.db_host = config.DB_HOST
         self.db_user = config.DB_USER
         self.db_password = config.DB_USER_PASSWORD
@@ -53,37 +90,131 @@ class DataStats:
         self.datastats_bucket_urls = config.DATASTATS_BUCKET_URLS
         self.datastats_bucket_utils = config.DATASTATS_BUCKET_UTILS
         
+        # Single storage session for the whole workflow
+        self.store = store or get_object_store(name=config.STORAGE_BACKEND, root_dir=config.STORAGE_LOCAL_DIR)
+        
         self.scrapped_jobs_list = scraped_jobs_list
-        self.matched_jobs_list = matched_jobs_list
+        self.matched_jobs_lists = matched_jobs_lists
         self.urls_scrapper_statistics_table_name = 'urls_scrapper_statistics'
         self.urls_scrapper_statistics_table_schema = {
-            'id': 'SERIAL PRIMARY KEY',
-            'scrap_date': 'VARCHAR(40)',
-            'job_to_scrap': 'VARCHAR(60)',
+            'id': 'BIGSERIAL',
+            'scrap_date': 'TIMESTAMPTZ NOT NULL',
+            'job_to_scrap': 'VARCHAR(60) NOT NULL',
             'jobs_scraped': 'INTEGER',
             'jobs_scraped_matched': 'INTEGER',
-            'scrap_duration': 'VARCHAR(60)'
+            'scrap_duration': 'INTERVAL',
+            'stage_timings': 'JSONB',
+            'PRIMARY KEY': '(id, scrap_date)'
+        }
+        self.urls_scrapper_statistics_table_version = 3
+        self.urls_scrapper_statistics_table_partition = 'RANGE (scrap_date)'
+        self.urls_scrapper_statistics_table_indexes = {
+            'urls_scrapper_statistics_job_date_idx': '(job_to_scrap, scrap_date)'
+        }
+        self.urls_dedup_index_table_name = 'urls_dedup_index'
+        self.urls_dedup_index_table_schema = {
+            'job_id': 'BIGINT NOT NULL',
+            'scrap_day': 'DATE NOT NULL',
+            'job_to_scrap': 'VARCHAR(60)',
+            'PRIMARY KEY': '(job_id, scrap_day)'
+        }
+        self.monthly_job_titles_table_name = 'monthly_job_titles'
+        self.monthly_job_titles_table_schema = {
+            'month': 'CHAR(7) NOT NULL',
+            'normalized_title': 'TEXT NOT NULL',
+            'count': 'INTEGER NOT NULL',
+            'first_seen': 'TIMESTAMPTZ NOT NULL',
+            'last_seen': 'TIMESTAMPTZ NOT NULL',
+            'PRIMARY KEY': '(month, normalized_title)'
+        }
+        self.job_listings_table_name = 'job_listings'
+        self.job_listings_table_schema = {
+            'job_id': 'BIGINT',
+            'title': 'TEXT NOT NULL',
+            'company': 'TEXT',
+            'location': 'TEXT',
+            'posted_at': 'TIMESTAMPTZ',
+            'matched_jobs': 'TEXT[] NOT NULL',
+            'scraped_at': 'TIMESTAMPTZ NOT NULL'
         }
     
-    def _set_script_execution_duration(self):
+    def _set_script_execution_duration(self) -> timedelta:
         """
-        Set the script execution duration.
+        Set the script execution duration, with a millisecond resolution.
         """
         try:
             end_time = datetime.now()
-            duration_seconds = int((end_time - self.script_execution_start_time).total_seconds())
-            formatted_duration = time.strftime('%H:%M:%S', time.gmtime(duration_seconds))
-            return formatted_duration
+            duration = end_time - self.script_execution_start_time
+            return timedelta(milliseconds=round(duration.total_seconds() * 1000))
         except Exception as e:
             logger.error(f'Error while setting script execution duration: {e}')
-    
-    def add_scraped_jobs_to_monhtly_list(
+
+    def _get_statistics_table_migrations(self) -> dict:
+        """
+        Get the migrations of the statistics table.
+        
+        Version 2 replaces the VARCHAR scrap_date and HH:MM:SS scrap_duration of version 1 
+        with timestamptz and interval columns, in a table partitioned by month on scrap_date. 
+        The existing rows are backfilled in their monthly partitions, then the legacy table is dropped.
+        Version 3 adds the stage_timings column, containing the timing spans of the run.
+        
+        Returns
+        -------
+        dict
+            The list of SQL statements for each schema version
+        """
+        table_name = self.urls_scrapper_statistics_table_name
+        legacy_table_name = f'{table_name}_v1'
+        return {
+            2: [
+                f"ALTER TABLE {table_name} RENAME TO {legacy_table_name}",
+                f"ALTER INDEX IF EXISTS {table_name}_pkey RENAME TO {legacy_table_name}_pkey",
+                PostgresUtils().generate_create_table_statement(
+                    table_name=table_name,
+                    table_schema=self.urls_scrapper_statistics_table_schema,
+                    partition_by=self.urls_scrapper_statistics_table_partition
+                ),
+                f"""
+                DO $$
+                DECLARE month_start DATE;
+                BEGIN
+                    FOR month_start IN 
+                        SELECT DISTINCT date_trunc('month', scrap_date::date)::date FROM {legacy_table_name}
+                    LOOP
+                        EXECUTE format(
+                            'CREATE TABLE IF NOT EXISTS %I PARTITION OF {table_name} FOR VALUES FROM (%L) TO (%L)',
+                            '{table_name}_' || to_char(month_start, 'YYYY_MM'),
+                            month_start,
+                            (month_start + interval '1 month')::date
+                        );
+                    END LOOP;
+                END $$
+                """,
+                f"""
+                INSERT INTO {table_name} (id, scrap_date, job_to_scrap, jobs_scraped, jobs_scraped_matched, scrap_duration)
+                SELECT id, scrap_date::timestamptz, job_to_scrap, jobs_scraped, jobs_scraped_matched, scrap_duration::interval
+                FROM {legacy_table_name}
+                """,
+                f"""
+                SELECT setval(pg_get_serial_sequence('{table_name}', 'id'), COALESCE(max(id), 0) + 1, false) 
+                FROM {table_name}
+                """,
+                f"DROP TABLE {legacy_table_name}"
+            ],
+            3: [
+                f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS stage_timings JSONB"
+            ]
+        }
+
+    def add_scraped_jobs_to_monthly_shard(
         self, 
         bucket_name: str, 
         jobs_list: list
     ) -> None:
         """
-        Add the scraped jobs to the monthly list.
+        Add the scraped jobs to the monthly list, by writing them in a small immutable shard 
+        of the month (one JSON string per line), named after the run.
+        Runs never read nor rewrite the monthly list, so concurrent runs cannot lose each other's writes.
         
         Parameters
         ----------
@@ -96,69 +227,148 @@ class DataStats:
         -------
         None
         """
-        
-        gcp = GoogleUtils()
+        if not jobs_list:
+            logger.warning('No scraped jobs to add to the monthly list.')
+            return
         
         try:
-            # Check if the file exists
-            file_exists = gcp.file_exists(
-                bucket_name=bucket_name, 
-                blob_name=self.monthly_jobs_list_json
-            )
+            with self.store.open_blob_writer(
+                bucket_name=bucket_name,
+                blob_name=self.monthly_jobs_shard_name,
+                content_type='application/x-ndjson',
+                if_generation_match=0
+            ) as writer:
+                for job in jobs_list:
+                    writer.write((json.dumps(job, ensure_ascii=False) + '\n').encode('utf-8'))
+        except Exception as e:
+            logger.error(f"Error when adding jobs to monthly list: {e}")
+            raise e
+
+    def compact_monthly_shards(
+        self,
+        bucket_name: str,
+        year_month: str
+    ) -> None:
+        """
+        Merge the shards of a month into the monthly list, then delete them.
+        The new shards are composed with the object store compose (GCS compose in production) into a temporary blob
+        of the run, and the monthly list ({"jobs_list": [...]}) is written from it in a single write, only if it has not
+        changed since it was read (generation-match precondition). The monthly list also keeps the names of its shards,
+        so that shards left over (written during a compaction, by a run of the previous month, or not deleted after a failure)
+        are merged by the next compaction without being counted twice, and concurrent compactions start again instead of
+        overwriting each other.
+        
+        Parameters
+        ----------
+        bucket_name : str
+            The bucket name to store the data.
+        year_month : str
+            The month to compact, e.g. '2026-09'.
             
-            if file_exists:
-                # Download the file
-                gcp.download_blob(
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        RuntimeError
+            If the monthly list kept being updated by other runs
+        """
+        monthly_jobs_list = f'{year_month}_{MONTHLY_JOBS_LIST_SUFFIX}'
+        for _ in range(COMPACTION_ATTEMPTS):
+            shards = sorted(self.store.list_blobs(bucket_name=bucket_name, prefix=f'{year_month}/'))
+            if not shards:
+                return
+
+            blob_content, generation = self.store.download_blob_with_generation(
+                bucket_name=bucket_name,
+                source_blob_name=monthly_jobs_list
+            )
+            current_data = json.loads(blob_content) if blob_content is not None else {'jobs_list': []}
+            # A monthly list written before the shards has no shards names
+            compacted_shards = set(current_data.get('shards', []))
+            new_shards = [shard for shard in shards if shard not in compacted_shards]
+            if not new_shards:
+                logger.info(f'Shards of {year_month} already in {monthly_jobs_list}, deleting them...')
+                break
+
+            logger.info(f'Compacting {len(new_shards)} shards into {monthly_jobs_list}...')
+            try:
+                current_data['jobs_list'].extend(self._read_monthly_shards(bucket_name, year_month, new_shards))
+                current_data['shards'] = sorted(compacted_shards.union(new_shards))
+                self.store.upload_non_physical_file(
                     bucket_name=bucket_name,
-                    source_blob_name=self.monthly_jobs_list_json,
-                    destination_file_name=self.monthly_jobs_list_json
+                    data=json.dumps(current_data, indent=2),
+                    destination_blob_name=monthly_jobs_list,
+                    content_type='application/json',
+                    if_generation_match=generation
                 )
+                break
+            except (PreconditionFailed, NotFound):
+                # The monthly list has been updated, or the shards deleted, by a concurrent compaction
+                logger.warning(f'{monthly_jobs_list} has been updated by another run, compacting again...')
+        else:
+            raise RuntimeError(f'{monthly_jobs_list} still updated by other runs after {COMPACTION_ATTEMPTS} attempts')
+        
+        # Every listed shard is now in the monthly list
+        for shard in shards:
+            self.store.delete_blob(bucket_name=bucket_name, blob_name=shard)
 
-                # Open the file
-                with open(self.monthly_jobs_list_json, 'r') as f:
-                    current_data = json.load(f)
-                    
-                # Add the jobs to it
-                current_data["jobs_list"].extend(jobs_list)
-                    
-            else:
-                # Create the file and add jobs to it 
-                current_data = {"jobs_list": []}
-                current_data["jobs_list"].extend(jobs_list)
-                
-            # Save the file 
-            with open(self.monthly_jobs_list_json, 'w') as f:
-                json.dump(current_data, f, indent=2)       
-                
-            # Upload the file
-            gcp.upload_file(
+    def _read_monthly_shards(
+        self,
+        bucket_name: str,
+        year_month: str,
+        shards: list
+    ) -> list:
+        """
+        Read the jobs of monthly shards, composed into a temporary blob of the run so that they are read at once.
+        
+        Parameters
+        ----------
+        bucket_name : str
+            The bucket name of the shards.
+        year_month : str
+            The month of the shards, e.g. '2026-09'.
+        shards : list
+            The names of the shards to read, in order.
+            
+        Returns
+        -------
+        list
+            The jobs of the shards
+        """
+        composed_shards = f'{COMPACTION_FOLDER}/{year_month}/{self.run_id}.ndjson'
+        try:
+            # A compose in several steps may fail after the first one, so the temporary blob is deleted in any case
+            self.store.compose_blobs(
                 bucket_name=bucket_name,
-                source_file_path=self.monthly_jobs_list_json,
-                destination_blob_name=self.monthly_jobs_list_json
+                source_blob_names=shards,
+                destination_blob_name=composed_shards
             )
-            
-            # Remove the local file
-            os.remove(self.monthly_jobs_list_json)
-        except Exception as e:
-            logger.error(f"Error when adding jobs to monthly list: {e}")
-            raise e  
+            with self.store.open_blob_reader(bucket_name=bucket_name, blob_name=composed_shards) as reader:
+                return [json.loads(line) for line in reader if line.strip()]
+        finally:
+            self.store.delete_blob(bucket_name=bucket_name, blob_name=composed_shards)
 
     def generate_json_to_upload(
         self,
         job_to_scrap: str,
         date: str,
-        urls_list: list
+        job_cards: list
     ):
         """
         Generate a JSON formatted dict to upload.
+        Along with the urls, the details of each job card are added so that 
+        the downstream service does not need to fetch them again.
         """
         try:
             logger.info(f'Generating {job_to_scrap} JSON')
             job_data = {
                 'date': date,
                 'job': {
-                    job_to_scrap: urls_list
-                }
+                    job_to_scrap: [job_card.url for job_card in job_cards]
+                },
+                'jobs_details': [job_card.to_dict() for job_card in job_cards]
             }
             json_data = json.dumps(job_data, indent=2)
             return json_data
@@ -166,75 +376,372 @@ class DataStats:
             logger.error(f'Error while generating JSON: {e}')
             raise e
 
-    def start_workflow(self):
+    def update_monthly_job_titles(
+        self,
+        pg: PostgresUtils,
+        connection
+    ) -> None:
+        """
+        Add the scraped job titles to the monthly titles frequency table, with a batched upsert
+        of the titles counts of the run. The monthly analysis then reads distinct titles 
+        with their count instead of the raw list of every scraped title.
         
-        logger.info('Starting workflow to interact with Datastats resources...')
+        Parameters
+        ----------
+        pg : PostgresUtils
+            The Postgres utilities instance.
+        connection : pg8000.dbapi.Connection
+            The connection object to the Postgres database.
+            
+        Returns
+        -------
+        None
+        """
+        titles_count = Counter(
+            job_card.normalized_title for job_card in self.scrapped_jobs_list if job_card.normalized_title
+        )
+        table_name = self.monthly_job_titles_table_name
+        pg.upsert_data(
+            connection=connection,
+            table_name=table_name,
+            data=[
+                {
+                    'MONTH': self.year_month,
+                    'NORMALIZED_TITLE': normalized_title,
+                    'COUNT': count,
+                    'FIRST_SEEN': self.script_execution_start_time,
+                    'LAST_SEEN': self.script_execution_start_time
+                }
+                for normalized_title, count in titles_count.items()
+            ],
+            conflict_columns=['MONTH', 'NORMALIZED_TITLE'],
+            update_columns={
+                'COUNT': f'{table_name}.count + EXCLUDED.count',
+                'FIRST_SEEN': f'LEAST({table_name}.first_seen, EXCLUDED.first_seen)',
+                'LAST_SEEN': f'GREATEST({table_name}.last_seen, EXCLUDED.last_seen)'
+            }
+        )
+        logger.info(f'{len(titles_count)} distinct job titles added to monthly titles frequency')
+
+    def filter_new_job_cards(
+        self,
+        pg: PostgresUtils,
+        connection,
+        job_to_scrap: str,
+        job_cards: list
+    ) -> list:
+        """
+        Keep only the job cards not already handed off today, whatever the job name
+        or the run they have been scraped from, by registering their job id in the dedup index.
+        Job cards without job id are always kept.
+        The registration is left uncommitted, so that it is only committed once the jobs are handed off:
+        other runs registering the same job ids wait for it, and see them as new again if it is rolled back.
         
-        try:
-            logger.info('Setting connection to pgsql...')
-            pg = PostgresUtils()  
-            conn = pg.connect_with_ssl(
-                db_host=self.db_host,
-                db_user=self.db_user,
-                db_password=self.db_password,
-                db_name=self.db_name,
-                db_port=self.db_port,
-                db_root_cert=self.db_root_cert,
-                db_cert=self.db_cert,
-                db_key=self.db_key            
-            )
+        Parameters
+        ----------
+        pg : PostgresUtils
+            The Postgres utilities instance.
+        connection : pg8000.dbapi.Connection
+            The connection object to the Postgres database.
+        job_to_scrap : str
+            The job name the jobs have been matched with.
+        job_cards : list
+            The list of matched JobCard.
+            
+        Returns
+        -------
+        list
+            The list of JobCard to hand off
+        """
+        job_ids = {job_card.job_id for job_card in job_cards if job_card.job_id is not None}
+        new_job_ids = set(pg.insert_data_if_not_exists(
+            connection=connection,
+            table_name=self.urls_dedup_index_table_name,
+            data=[
+                {'JOB_ID': job_id, 'SCRAP_DAY': self.today, 'JOB_TO_SCRAP': job_to_scrap}
+                for job_id in job_ids
+            ],
+            conflict_columns=['JOB_ID', 'SCRAP_DAY'],
+            returning='JOB_ID',
+            commit=False
+        ))
+        new_job_cards = [
+            job_card for job_card in job_cards 
+            if job_card.job_id is None or job_card.job_id in new_job_ids
+        ]
+        logger.info(f'{len(job_cards) - len(new_job_cards)} {job_to_scrap} jobs already handed off today')
+        return new_job_cards
+
+    def upload_daily_jobs_file(
+        self,
+        job_to_scrap: str,
+        job_cards: list
+    ) -> None:
+        """
+        Upload the daily file containing the matched jobs of a job name.
+        Nothing is uploaded if no job has been matched.
         
-            logger.info('Checking if urls statistics table exists or create it...')
-            pg.create_table_if_not_exists(
+        Parameters
+        ----------
+        job_to_scrap : str
+            The job name the jobs have been matched with.
+        job_cards : list
+            The list of matched JobCard.
+            
+        Returns
+        -------
+        None
+        """
+        if len(job_cards) > 0:
+            logger.info('Generating JSON to upload...')
+            json_data = self.generate_json_to_upload(
+                job_to_scrap=job_to_scrap,
+                date=self.today,
+                job_cards=job_cards
+            )
+
+            daily_jobs_file_name = f'{self.file_name_date_time}_{job_to_scrap}.json'
+            logger.info(f'Uploading {daily_jobs_file_name} to GCP...')
+            self.store.upload_non_physical_file(
+                bucket_name=self.datastats_bucket_urls,
+                data=json_data,
+                destination_blob_name=daily_jobs_file_name,
+                content_type='application/json'
+            )
+        else:
+            logger.warning(f'No jobs have been scraped and matched with {job_to_scrap}.')
+
+    @contextmanager
+    def _pg_connection(self):
+        """
+        Borrow a connection to pgsql from the process pool for a sink, and return it once the sink is done.
+        Each sink has its own connection, as connections cannot be shared between threads.
+
+        Yields
+        ------
+        tuple
+            The PostgresUtils instance and the connection
+        """
+        pg = PostgresUtils()
+        pool = pg.get_pool(
+            db_host=self.db_host,
+            db_user=self.db_user,
+            db_password=self.db_password,
+            db_name=self.db_name,
+            db_port=self.db_port,
+            db_root_cert=self.db_root_cert,
+            db_cert=self.db_cert,
+            db_key=self.db_key            
+        )
+        with pool.connection() as conn:
+            yield pg, conn
+
+    def _statistics_sink(self) -> None:
+        """
+        Insert a statistics row for each job name.
+        """
+        with self._pg_connection() as (pg, conn):
+            logger.info('Checking urls statistics table schema...')
+            pg.ensure_table(
+                connection=conn,
+                table_name=self.urls_scrapper_statistics_table_name,
+                table_schema=self.urls_scrapper_statistics_table_schema,
+                version=self.urls_scrapper_statistics_table_version,
+                migrations=self._get_statistics_table_migrations(),
+                partition_by=self.urls_scrapper_statistics_table_partition,
+                indexes=self.urls_scrapper_statistics_table_indexes
+            )
+            pg.ensure_monthly_partition(
                 connection=conn,
                 table_name=self.urls_scrapper_statistics_table_name,
-                table_schema=self.urls_scrapper_statistics_table_schema
+                day=self.script_execution_start_time
             )
         
             logger.info('Inserting statistics data...')
             script_duration = self._set_script_execution_duration()
-            pg.insert_data(
+            # Stages done so far, the sinks still running are not included
+            stage_timings = json.dumps(timings.summary())
+            for job_to_scrap, matched_jobs_list in self.matched_jobs_lists.items():
+                pg.insert_data(
+                    connection=conn,
+                    table_name=self.urls_scrapper_statistics_table_name,
+                    data={
+                        'SCRAP_DATE': self.script_execution_start_time,
+                        'JOB_TO_SCRAP': job_to_scrap,
+                        'JOBS_SCRAPED': len(self.scrapped_jobs_list),
+                        'JOBS_SCRAPED_MATCHED': len(matched_jobs_list),
+                        'SCRAP_DURATION': script_duration,
+                        'STAGE_TIMINGS': stage_timings
+                    }
+                )
+
+    def _monthly_job_titles_sink(self) -> None:
+        """
+        Update the monthly job titles frequency.
+        """
+        with self._pg_connection() as (pg, conn):
+            logger.info('Checking monthly job titles table schema...')
+            pg.ensure_table(
                 connection=conn,
-                table_name=self.urls_scrapper_statistics_table_name,
-                data={
-                    'SCRAP_DATE': self.today,
-                    'JOB_TO_SCRAP': self.job_to_scrap,
-                    'JOBS_SCRAPED': len(self.scrapped_jobs_list),
-                    'JOBS_SCRAPED_MATCHED': len(self.matched_jobs_list),
-                    'SCRAP_DURATION': script_duration
-                }
+                table_name=self.monthly_job_titles_table_name,
+                table_schema=self.monthly_job_titles_table_schema
             )
             
-            logger.info('Adding scraped jobs to monthly list...')
-            self.add_scraped_jobs_to_monhtly_list(
-                bucket_name=self.datastats_bucket_utils,
-                jobs_list=self.scrapped_jobs_list
+            logger.info('Updating monthly job titles frequency...')
+            self.update_monthly_job_titles(pg=pg, connection=conn)
+
+    def _job_listings_sink(self) -> None:
+        """
+        Bulk insert a row for each scraped job card.
+        """
+        with self._pg_connection() as (pg, conn):
+            logger.info('Checking job listings table schema...')
+            pg.ensure_table(
+                connection=conn,
+                table_name=self.job_listings_table_name,
+                table_schema=self.job_listings_table_schema
             )
             
-            if len(self.matched_jobs_list) > 0:  
-                logger.info('Generating JSON to upload...')
-                json_data = self.generate_json_to_upload(
-                    job_to_scrap=self.job_to_scrap,
-                    date=self.today,
-                    urls_list=self.matched_jobs_list
-                )
+            logger.info('Inserting job listings...')
+            inserted = pg.copy_data(
+                connection=conn,
+                table_name=self.job_listings_table_name,
+                data=[
+                    {
+                        'JOB_ID': job_card.job_id,
+                        'TITLE': job_card.title,
+                        'COMPANY': job_card.company,
+                        'LOCATION': job_card.location,
+                        'POSTED_AT': job_card.posted_at,
+                        'MATCHED_JOBS': job_card.matched_jobs,
+                        'SCRAPED_AT': self.script_execution_start_time
+                    }
+                    for job_card in self.scrapped_jobs_list
+                ]
+            )
+            logger.info(f'{inserted} job listings inserted')
 
-                logger.info(f'Uploading {self.daily_jobs_file_name} to GCP...')
-                gcp = GoogleUtils()
-                gcp.upload_non_physical_file(
-                    bucket_name=self.datastats_bucket_urls,
-                    data=json_data,
-                    destination_blob_name=self.daily_jobs_file_name,
-                    content_type='application/json'
+    def _monthly_jobs_list_sink(self) -> None:
+        """
+        Add the scraped jobs to the monthly list: the shard of the run is written, then the shards
+        of the month are compacted, so that the monthly list includes the run as soon as it ends.
+        The previous month is compacted first, for the shards written late by its last runs.
+        """
+        logger.info('Adding scraped jobs to monthly list...')
+        self.add_scraped_jobs_to_monthly_shard(
+            bucket_name=self.datastats_bucket_utils,
+            jobs_list=[job_card.title for job_card in self.scrapped_jobs_list if job_card.title]
+        )
+        for year_month in (self.previous_year_month, self.year_month):
+            self.compact_monthly_shards(
+                bucket_name=self.datastats_bucket_utils,
+                year_month=year_month
+            )
+
+    def _daily_jobs_files_sink(self) -> None:
+        """
+        Hand off the matched jobs of each job name to the downstream service.
+        The job ids are only registered in the dedup index once the daily file is uploaded,
+        so that the jobs of a failed upload are handed off again by the next run.
+        If the dedup index is not reachable, every matched job is handed off rather than none.
+
+        Raises
+        ------
+        RuntimeError
+            If the jobs of one or more job names could not be handed off
+        """
+        with ExitStack() as stack:
+            try:
+                pg, conn = stack.enter_context(self._pg_connection())
+                logger.info('Checking urls dedup index table schema...')
+                pg.ensure_table(
+                    connection=conn,
+                    table_name=self.urls_dedup_index_table_name,
+                    table_schema=self.urls_dedup_index_table_schema
                 )
-            else:
-                logger.warning(f'No jobs have been scraped and matched with {self.job_to_scrap}.')
-                
-        except Exception as e:
-            logger.error(f'Error while executing Datastats workflow: {e}')
-            raise e
+            except Exception as e:
+                logger.error(f'Dedup index not available, handing off every matched job: {e}')
+                conn = None
+            
+            failed_jobs = []
+            for job_to_scrap, matched_jobs_list in self.matched_jobs_lists.items():
+                try:
+                    if conn is not None:
+                        matched_jobs_list = self.filter_new_job_cards(
+                            pg=pg,
+                            connection=conn,
+                            job_to_scrap=job_to_scrap,
+                            job_cards=matched_jobs_list
+                        )
+                    self.upload_daily_jobs_file(
+                        job_to_scrap=job_to_scrap,
+                        job_cards=matched_jobs_list
+                    )
+                    if conn is not None:
+                        conn.commit()
+                except Exception as e:
+                    logger.error(f'Error while handing off {job_to_scrap} jobs: {e}')
+                    failed_jobs.append(job_to_scrap)
+                    if conn is not None:
+                        conn.rollback()
+
+            if failed_jobs:
+                raise RuntimeError(f"Jobs not handed off for: {', '.join(failed_jobs)}")
+
+    def _run_sink(self, name: str, sink) -> float:
+        """
+        Run a sink and measure its duration.
+
+        Parameters
+        ----------
+        name : str
+            The name of the sink.
+        sink : callable
+            The sink to run.
+
+        Returns
+        -------
+        float
+            The duration of the sink in seconds
+        """
+        start_time = time.monotonic()
+        with span(f'sink.{name}'):
+            sink()
+        duration = time.monotonic() - start_time
+        logger.success(f'{name} sink done in {duration:.2f}s')
+        return duration
+
+    def start_workflow(self):
+        """
+        Run the sinks of the workflow (statistics, monthly titles, job listings, monthly list and daily files) 
+        concurrently on a thread pool. A failing sink does not prevent the others from completing, 
+        and the failures are reported once every sink is done.
+
+        Raises
+        ------
+        RuntimeError
+            If one or more sinks failed
+        """
+        logger.info('Starting workflow to interact with Datastats resources...')
         
-        finally:
-            if conn is not None:
-                logger.info('Closing connection to pgsql...')
-                pg.close_connection(conn)
+        sinks = {
+            'daily_jobs_files': self._daily_jobs_files_sink,
+            'statistics': self._statistics_sink,
+            'monthly_job_titles': self._monthly_job_titles_sink,
+            'job_listings': self._job_listings_sink,
+            'monthly_jobs_list': self._monthly_jobs_list_sink,
+        }
+        errors = {}
+        with ThreadPoolExecutor(max_workers=len(sinks), thread_name_prefix='sink') as executor:
+            futures = {executor.submit(self._run_sink, name, sink): name for name, sink in sinks.items()}
+            for future in as_completed(futures):
+                name = futures[future]
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f'Error while executing {name} sink: {e}')
+                    errors[name] = e
+        
+        self.store.log_stats()
+        if errors:
+            raise RuntimeError(f"Datastats workflow failed for sinks: {', '.join(errors)}")
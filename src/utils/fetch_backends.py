@@ -0,0 +1,328 @@
+import re
+import requests
+from abc import ABC, abstractmethod
+from loguru import logger
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from .fingerprints import FALLBACK_USER_AGENT, FingerprintPool
+from .timing import span
+
+
+HTTP_TIMEOUT = 10                # seconds
+GUEST_SEARCH_PATH = '/jobs-guest/jobs/api/seeMoreJobPostings/search'
+GUEST_PAGE_SIZE = 25             # cards returned by the guest endpoint per page
+CARD_PATTERN = re.compile(r'<li[\s>]')
+RESULTS_LIST_TEMPLATE = '<ul class="jobs-search__results-list">{cards}</ul>'
+
+
+class AuthwallError(Exception):
+    """
+    Raised when a fetch backend is blocked by an authwall.
+    """
+    pass
+
+
+class EmptyResultsError(Exception):
+    """
+    Raised when the first result page of a fetch backend contains no job card.
+    """
+    pass
+
+
+class FetchBackend(ABC):
+    """
+    Interface of the backends used to fetch the job search webpage.
+
+    Every backend returns html code containing the `ul.jobs-search__results-list`
+    element, so that UrlsScraper does not depend on how the webpage has been fetched.
+    """
+
+    @abstractmethod
+    def start(self, url: str) -> str:
+        """
+        Fetch the job search webpage.
+
+        Parameters
+        ----------
+        url: str
+            URL to scrape
+
+        Returns
+        -------
+        webpage: str
+            html code of the webpage
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Release the resources used by the backend.
+        """
+        pass
+
+
+class HttpFetchBackend(FetchBackend):
+    def __init__(
+        self,
+        timeout: int = HTTP_TIMEOUT,
+        max_pages: int = 40,
+        pool_size: int = 4,
+        user_agent: str = FALLBACK_USER_AGENT,
+        accept_language: str = 'fr-FR,fr;q=0.9'
+    ) -> None:
+        """
+        Fetch the job search results from the guest job-search listing endpoint
+        with a pooled HTTP client, without starting a browser.
+
+        The host of the guest endpoint is the one of the url to scrape,
+        so the backend can be pointed to a local stub HTTP server.
+        Requests present a desktop browser user agent, as the endpoint answers
+        the default python-requests one with an authwall.
+
+        Parameters
+        ----------
+        timeout: int [optional]
+            timeout of each HTTP request in seconds, default to 10
+        max_pages: int [optional]
+            max result pages fetched, default to 40
+        pool_size: int [optional]
+            max connections kept in the pool, default to 4
+        user_agent: str [optional]
+            the User-Agent header, default to a desktop Chrome user agent
+        accept_language: str [optional]
+            the Accept-Language header, default to 'fr-FR,fr;q=0.9'
+        """
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self.session = requests.Session()
+        retries = Retry(
+            total=2,
+            backoff_factor=0.5,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=('GET',)
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retries)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers.update({
+            'User-Agent': user_agent,
+            'Accept': 'text/html',
+            'Accept-Language': accept_language
+        })
+
+    @staticmethod
+    def _generate_guest_url(url: str, start: int) -> str:
+        """
+        Convert a job search url to the guest listing endpoint url of a result page.
+
+        Parameters
+        ----------
+        url: str
+            The job search url
+        start: int
+            The index of the first card of the page
+
+        Returns
+        -------
+        guest_url: str
+            The url of the guest listing endpoint
+        """
+        parts = urlsplit(url)
+        query = [
+            (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+            if key not in ('start', 'position', 'pageNum')
+        ]
+        query.append(('start', str(start)))
+        return urlunsplit((parts.scheme, parts.netloc, GUEST_SEARCH_PATH, urlencode(query), ''))
+
+    def _get_page(self, url: str) -> str:
+        """
+        Get a result page from the guest listing endpoint.
+
+        Parameters
+        ----------
+        url: str
+            The guest listing endpoint url
+
+        Returns
+        -------
+        page: str
+            The cards of the result page as html code
+
+        Raises
+        ------
+        AuthwallError
+            If the request is redirected to an authwall or rate limited
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        if response.status_code in (429, 999) or 'authwall' in response.url:
+            raise AuthwallError(f'HTTP {response.status_code} on {response.url}')
+        # The endpoint answers 400 or an empty body once the results are exhausted
+        if response.status_code == 400:
+            return ''
+        response.raise_for_status()
+        page = response.text
+        if 'authwall' in page[:2000]:
+            raise AuthwallError(f'authwall detected on {response.url}')
+        return page
+
+    def start(self, url: str) -> str:
+        """
+        Fetch every result page of the job search and merge them in a single results list.
+
+        Parameters
+        ----------
+        url: str
+            URL to scrape
+
+        Returns
+        -------
+        webpage: str
+            html code of the results list
+
+        Raises
+        ------
+        EmptyResultsError
+            If the first result page contains no job card
+        """
+        pages = []
+        for page_number in range(self.max_pages):
+            guest_url = self._generate_guest_url(url, start=page_number * GUEST_PAGE_SIZE)
+            logger.info(f'Fetching result page {page_number + 1}')
+            with span('http.page'):
+                page = self._get_page(guest_url)
+            cards_count = len(CARD_PATTERN.findall(page))
+            if cards_count == 0:
+                # A search without any result in the last 24 hours is unlikely, the endpoint is rather degraded
+                if page_number == 0:
+                    raise EmptyResultsError(f'No job card in the first result page: {guest_url}')
+                break
+            pages.append(page)
+            if cards_count < GUEST_PAGE_SIZE:
+                break
+
+        logger.success(f'{len(pages)} result pages successfully fetched')
+        return RESULTS_LIST_TEMPLATE.format(cards=''.join(pages))
+
+    def close(self) -> None:
+        """
+        Close the pooled connections.
+        """
+        self.session.close()
+
+
+class FallbackFetchBackend(FetchBackend):
+    def __init__(
+        self,
+        primary: FetchBackend,
+        fallback_factory
+    ) -> None:
+        """
+        Fetch the webpage with a primary backend, and with a fallback backend
+        when the primary one fails (e.g. on an authwall or an empty first result page).
+        The fallback backend is only created when it is needed.
+
+        Parameters
+        ----------
+        primary: FetchBackend
+            The backend used first
+        fallback_factory: callable
+            A callable returning the fallback backend
+        """
+        self.primary = primary
+        self.fallback_factory = fallback_factory
+        self.fallback = None
+
+    def start(self, url: str) -> str:
+        """
+        Fetch the job search webpage, falling back on the fallback backend if needed.
+
+        Parameters
+        ----------
+        url: str
+            URL to scrape
+
+        Returns
+        -------
+        webpage: str
+            html code of the webpage
+        """
+        try:
+            return self.primary.start(url)
+        except (AuthwallError, EmptyResultsError, requests.RequestException) as e:
+            logger.warning(f'{type(self.primary).__name__} failed ({e}), falling back...')
+
+        self.fallback = self.fallback_factory()
+        return self.fallback.start(url)
+
+    def close(self) -> None:
+        """
+        Release the resources used by both backends.
+        """
+        self.primary.close()
+        if self.fallback is not None:
+            self.fallback.close()
+
+
+def get_fetch_backend(
+    name: str,
+    headless: bool = True,
+    store=None,
+    bucket_name: str = None,
+    browser_manager_factory=None
+) -> FetchBackend:
+    """
+    Get the fetch backend from its name.
+    The http backend presents a fingerprint chosen from the Chrome fingerprint pool,
+    the pool being then shared with the Chrome fallback.
+
+    Parameters
+    ----------
+    name: str
+        'http' (guest endpoint with Chrome as fallback) or 'chrome'
+    headless: bool [optional]
+        run Chrome headless, default to True
+    store: ObjectStore [optional]
+        the object store persisting the Chrome fingerprint pool, default to none (not persisted)
+    bucket_name: str [optional]
+        the bucket name of the fingerprint pool
+    browser_manager_factory: callable [optional]
+        a callable returning the manager of the Chrome browser (possibly prewarmed), only called
+        when Chrome is needed, default to a new BrowserManager
+
+    Returns
+    -------
+    FetchBackend
+        The fetch backend
+
+    Raises
+    ------
+    ValueError
+        If the backend name is unknown
+    """
+    def chrome_factory(fingerprint_pool: FingerprintPool = None):
+        from .webpage_generator import WebpageGenerator
+        generator = WebpageGenerator(
+            headless=headless,
+            store=store,
+            bucket_name=bucket_name,
+            browser_manager=browser_manager_factory() if browser_manager_factory else None
+        )
+        generator.fingerprint_pool = fingerprint_pool
+        return generator
+
+    if name == 'chrome':
+        return chrome_factory()
+    if name == 'http':
+        if store is not None:
+            fingerprint_pool = FingerprintPool.load(store=store, bucket_name=bucket_name)
+        else:
+            fingerprint_pool = FingerprintPool.build()
+        fingerprint = fingerprint_pool.choose()
+        logger.info(f'Using fingerprint {fingerprint.key}')
+        return FallbackFetchBackend(
+            primary=HttpFetchBackend(user_agent=fingerprint.user_agent, accept_language=fingerprint.accept_language),
+            fallback_factory=lambda: chrome_factory(fingerprint_pool)
+        )
+    raise ValueError(f'Unknown fetch backend: {name}')
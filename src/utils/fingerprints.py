@@ -0,0 +1,322 @@
+import json
+import random
+import hashlib
+from loguru import logger
+from datetime import datetime, timedelta
+from dataclasses import dataclass, asdict
+from google.api_core.exceptions import PreconditionFailed
+from .retry_policy import Outcome, BLOCK_OUTCOMES
+
+
+FINGERPRINT_POOL_BLOB = 'fingerprints/pool.json'
+POOL_SIZE = 24
+POOL_MAX_AGE = timedelta(days=30)
+DECAY = 0.98  # weight kept by the stored outcomes at each saved run, so that recent outcomes prevail
+SAVE_ATTEMPTS = 3
+
+WINDOW_SIZES = [
+    "1920,1080",  # Full HD
+    "2560,1440",  # QHD (2K)
+    "3840,2160",  # 4K UHD
+    "1366,768",   # HD
+    "1440,900",   # WXGA+
+    "1600,900",   # HD+
+    "1280,720",   # HD
+    "1680,1050",  # WSXGA+
+    "1024,768",   # XGA
+    "800,600",    # SVGA
+    "2560,1600",  # WQXGA
+    "3200,1800",  # QHD+
+    "1360,768",   # WXGA
+]
+LANGUAGES = ['fr-FR', 'fr', 'en-US', 'en-GB']
+FALLBACK_USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+    'Chrome/130.0.0.0 Safari/537.36'
+)
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """
+    dataclass containing the browser settings presented to the website.
+    """
+    user_agent: str
+    window_size: str
+    language: str
+
+    @property
+    def key(self) -> str:
+        """
+        Stable identifier of the fingerprint.
+        """
+        value = f'{self.user_agent}|{self.window_size}|{self.language}'
+        return hashlib.sha1(value.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def accept_language(self) -> str:
+        """
+        Accept-Language header of the fingerprint language, e.g. "fr-FR,fr;q=0.9".
+        """
+        if '-' in self.language:
+            return f"{self.language},{self.language.split('-')[0]};q=0.9"
+        return self.language
+
+
+class FingerprintPool:
+    def __init__(self, fingerprints: list, stats: dict = None, created_at: str = None) -> None:
+        """
+        Pool of browser fingerprints chosen with a success-weighted policy.
+
+        Each fingerprint is an arm of a Beta-Bernoulli bandit: an attempt passing the website
+        is a success, a block (authwall, blocked message, error code) a failure, and other
+        outcomes (timeouts, driver errors, empty pages, missing results lists) are not related to the fingerprint.
+        A fingerprint is chosen by Thompson sampling, so the ones getting past the authwall
+        are preferred while the others are still explored from time to time.
+
+        Parameters
+        ----------
+        fingerprints: list
+            The fingerprints of the pool
+        stats: dict [optional]
+            The successes and failures of each fingerprint key, default to none
+        created_at: str [optional]
+            The ISO date when the pool was built, default to now
+        """
+        self.fingerprints = {fingerprint.key: fingerprint for fingerprint in fingerprints}
+        self.stats = {key: {'successes': 0.0, 'failures': 0.0} for key in self.fingerprints}
+        for key, key_stats in (stats or {}).items():
+            if key in self.stats:
+                self.stats[key].update(key_stats)
+        self.created_at = created_at or datetime.now().isoformat(timespec='seconds')
+        self._deltas = {}
+        # The persisted pool and its generation when it was last read, None if unknown
+        self._stored_data = None
+        self._generation = None
+
+    @classmethod
+    def build(cls, size: int = POOL_SIZE, rng: random.Random = None) -> 'FingerprintPool':
+        """
+        Build a new pool, pairing desktop Chrome user agents (consistent with the driven browser)
+        with window sizes and languages. The user agents dataset is only loaded here.
+
+        Parameters
+        ----------
+        size: int [optional]
+            The number of fingerprints, default to 24
+        rng: random.Random [optional]
+            The random generator, default to the random module
+
+        Returns
+        -------
+        FingerprintPool
+            The new pool
+        """
+        rng = rng or random
+        user_agents = []
+        try:
+            from fake_useragent import UserAgent
+            dataset = UserAgent(browsers=['Chrome'], platforms=['desktop'], fallback=FALLBACK_USER_AGENT)
+            for _ in range(size * 10):
+                user_agent = dataset.random
+                if user_agent not in user_agents:
+                    user_agents.append(user_agent)
+                if len(user_agents) == size:
+                    break
+        except Exception as e:
+            logger.warning(f'Error while loading the user agents dataset: {e}')
+        if not user_agents:
+            user_agents = [FALLBACK_USER_AGENT]
+
+        fingerprints = {}
+        for index in range(size * 10):
+            fingerprint = Fingerprint(
+                user_agent=user_agents[index % len(user_agents)],
+                window_size=rng.choice(WINDOW_SIZES),
+                language=rng.choice(LANGUAGES)
+            )
+            fingerprints[fingerprint.key] = fingerprint
+            if len(fingerprints) == size:
+                break
+        logger.info(f'Fingerprint pool built with {len(fingerprints)} fingerprints')
+        return cls(list(fingerprints.values()))
+
+    def choose(self, rng: random.Random = None) -> Fingerprint:
+        """
+        Choose a fingerprint by Thompson sampling.
+
+        Parameters
+        ----------
+        rng: random.Random [optional]
+            The random generator, default to the random module
+
+        Returns
+        -------
+        Fingerprint
+            The fingerprint with the highest success rate drawn from its Beta distribution
+        """
+        rng = rng or random
+        key = max(
+            self.fingerprints,
+            key=lambda key: rng.betavariate(1 + self.stats[key]['successes'], 1 + self.stats[key]['failures'])
+        )
+        return self.fingerprints[key]
+
+    def record(self, fingerprint: Fingerprint, outcome: Outcome) -> None:
+        """
+        Record the outcome of an attempt made with a fingerprint.
+
+        Parameters
+        ----------
+        fingerprint: Fingerprint
+            The fingerprint of the attempt
+        outcome: Outcome
+            The outcome of the attempt
+        """
+        if outcome is Outcome.SUCCESS:
+            counter = 'successes'
+        elif outcome in BLOCK_OUTCOMES:
+            counter = 'failures'
+        else:
+            return
+        if fingerprint.key not in self.stats:
+            return
+        self.stats[fingerprint.key][counter] += 1
+        deltas = self._deltas.setdefault(fingerprint.key, {'successes': 0, 'failures': 0})
+        deltas[counter] += 1
+
+    def is_stale(self) -> bool:
+        """
+        Check if the pool is too old, its user agents no longer matching current browsers.
+        """
+        return datetime.now() - datetime.fromisoformat(self.created_at) > POOL_MAX_AGE
+
+    def to_dict(self) -> dict:
+        return {
+            'created_at': self.created_at,
+            'fingerprints': [asdict(fingerprint) for fingerprint in self.fingerprints.values()],
+            'stats': self.stats
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'FingerprintPool':
+        return cls(
+            fingerprints=[Fingerprint(**fingerprint) for fingerprint in data['fingerprints']],
+            stats=data.get('stats'),
+            created_at=data.get('created_at')
+        )
+
+    @classmethod
+    def load(cls, store, bucket_name: str) -> 'FingerprintPool':
+        """
+        Load the pool persisted by the previous runs, or build a new one if there is none or if it is stale.
+        Errors are logged, so that the pool never fails a run.
+
+        Parameters
+        ----------
+        store: ObjectStore
+            The object store persisting the pool
+        bucket_name: str
+            The bucket name of the pool
+
+        Returns
+        -------
+        FingerprintPool
+            The pool
+        """
+        generation = None
+        try:
+            blob_content, generation = store.download_blob_with_generation(
+                bucket_name=bucket_name,
+                source_blob_name=FINGERPRINT_POOL_BLOB
+            )
+            if blob_content is not None:
+                stored_data = json.loads(blob_content)
+                pool = cls.from_dict(stored_data)
+                if not pool.is_stale():
+                    logger.info(f'Fingerprint pool loaded with {len(pool.fingerprints)} fingerprints')
+                    pool._stored_data, pool._generation = stored_data, generation
+                    return pool
+                logger.info('Fingerprint pool is stale, building a new one...')
+        except Exception as e:
+            logger.warning(f'Error while loading the fingerprint pool: {e}')
+        pool = cls.build()
+        # The new pool replaces the stale or missing one, if it has not changed in the meantime
+        pool._generation = generation
+        return pool
+
+    def _merge(self, stored_data: dict) -> 'FingerprintPool':
+        """
+        Merge the outcomes of this run into a persisted pool.
+
+        Parameters
+        ----------
+        stored_data: dict
+            The persisted pool, None if there is none
+
+        Returns
+        -------
+        FingerprintPool
+            The pool to persist, None if another run replaced the pool
+        """
+        if stored_data is None:
+            return self
+        stored = FingerprintPool.from_dict(stored_data)
+        if stored.created_at > self.created_at:
+            # Another run replaced the pool, its arms are kept and the outcomes of this run are dropped
+            return None
+        if stored.created_at < self.created_at:
+            # This run replaced a stale pool
+            return self
+        for key, key_stats in stored.stats.items():
+            for counter, value in key_stats.items():
+                key_stats[counter] = round(value * DECAY + self._deltas.get(key, {}).get(counter, 0), 3)
+        return stored
+
+    def save(self, store, bucket_name: str) -> None:
+        """
+        Persist the outcomes of this run: they are added to the decayed stored outcomes, and the pool
+        is only written if it has not changed since it was read (generation-match precondition).
+        When another run wrote the pool in the meantime, the pool is read again and the outcomes merged again,
+        so that concurrent runs neither lose outcomes nor overwrite a pool created by another run.
+        Errors are logged, so that the pool never fails a run.
+
+        Parameters
+        ----------
+        store: ObjectStore
+            The object store persisting the pool
+        bucket_name: str
+            The bucket name of the pool
+        """
+        try:
+            stored_data, generation = self._stored_data, self._generation
+            for _ in range(SAVE_ATTEMPTS):
+                if generation is None:
+                    blob_content, generation = store.download_blob_with_generation(
+                        bucket_name=bucket_name,
+                        source_blob_name=FINGERPRINT_POOL_BLOB
+                    )
+                    stored_data = json.loads(blob_content) if blob_content is not None else None
+                pool = self._merge(stored_data)
+                if pool is None:
+                    break
+                try:
+                    store.upload_non_physical_file(
+                        bucket_name=bucket_name,
+                        data=json.dumps(pool.to_dict()),
+                        destination_blob_name=FINGERPRINT_POOL_BLOB,
+                        content_type='application/json',
+                        if_generation_match=generation
+                    )
+                    self._deltas = {}
+                    break
+                except PreconditionFailed:
+                    logger.info('Fingerprint pool written by another run, merging again...')
+                    generation = None
+            else:
+                logger.warning(f'Fingerprint pool still written by other runs after {SAVE_ATTEMPTS} attempts')
+        except Exception as e:
+            logger.warning(f'Error while saving the fingerprint pool: {e}')
+        finally:
+            # The generation written is unknown, the next save reads the pool again
+            self._stored_data, self._generation = None, None
@@ -1,23 +1,105 @@
-import io
+import os
+import google.auth
 from loguru import logger
+from contextlib import contextmanager
 from google.cloud import storage
+from google.api_core.exceptions import NotFound
+from google.cloud.storage.retry import DEFAULT_RETRY
+from google.auth.transport.requests import AuthorizedSession
+from requests.adapters import HTTPAdapter
+from .object_store import ObjectStore
+from .timing import span
 
-class GoogleUtils:
-    def __init__(self) -> None:
+
+GCS_POOL_SIZE = 10          # connections kept in the pool
+GCS_TIMEOUT = (5, 60)       # seconds (connect, read)
+GCS_RETRY_TIMEOUT = 120     # seconds spent retrying an operation
+
+
+class GoogleUtils(ObjectStore):
+    name = 'GCS'
+
+    def __init__(
+        self,
+        pool_size: int = GCS_POOL_SIZE,
+        timeout: tuple = GCS_TIMEOUT,
+        retry_timeout: int = GCS_RETRY_TIMEOUT
+    ) -> None:
+        """
+        Utilities for operations in Google Cloud Platform.
+
+        An instance is a storage session: it owns a single client with a sized connection pool,
+        tuned timeout and retry settings, caches blob metadata for the length of a run and
+        counts API calls and bytes per operation. Use one instance for a whole workflow,
+        it can be shared between threads.
+
+        Parameters
+        ----------
+        pool_size: int [optional]
+            Max connections kept in the pool, default to 10
+        timeout: tuple [optional]
+            Connect and read timeouts of each request in seconds, default to (5, 60)
+        retry_timeout: int [optional]
+            Max time spent retrying an operation in seconds, default to 120
+        """
+        super().__init__()
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.retry = DEFAULT_RETRY.with_timeout(retry_timeout)
+        self._client = None
+        self._buckets = {}
+        self._blobs_metadata = {}
+
+    @property
+    def client(self) -> storage.Client:
+        """
+        The storage client, created on first use with a sized connection pool.
+        The credentials are scoped, as service account keys have no default scope.
+        """
+        with self._lock:
+            if self._client is None:
+                credentials, project = google.auth.default(scopes=storage.Client.SCOPE)
+                session = AuthorizedSession(credentials)
+                adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                self._client = storage.Client(project=project, credentials=credentials, _http=session)
+            return self._client
+
+    def _bucket(self, bucket_name: str) -> storage.Bucket:
         """
-        Utilities for operations in Google Cloud Platform
+        Get a bucket handle, without any API call.
         """
-        pass
+        if bucket_name not in self._buckets:
+            self._buckets[bucket_name] = self.client.bucket(bucket_name)
+        return self._buckets[bucket_name]
 
-    @staticmethod
+    def _get_blob_metadata(self, bucket_name: str, blob_path: str) -> storage.Blob:
+        """
+        Get the metadata of a blob, from the run cache or with a single API call.
+
+        Returns
+        -------
+        storage.Blob
+            The blob with its metadata, or None if it does not exist
+        """
+        key = (bucket_name, blob_path)
+        if key not in self._blobs_metadata:
+            self._record('get_metadata')
+            self._blobs_metadata[key] = self._bucket(bucket_name).get_blob(
+                blob_path, timeout=self.timeout, retry=self.retry
+            )
+        return self._blobs_metadata[key]
+
+    @span('gcs.upload')
     def upload_file(
-        bucket_name: str, 
-        source_file_path: str, 
-        destination_blob_name: str, 
+        self,
+        bucket_name: str,
+        source_file_path: str,
+        destination_blob_name: str,
         folder_path: str = ""
     ) -> None:
         """
-        Upload a file to a GCP bucket. 
+        Upload a file to a GCP bucket.
 
         Parameters
         ----------
@@ -29,25 +111,26 @@ class GoogleUtils:
             Name of the file in the bucket
         folder_path: str
             Optional, the path of the blob in the bucket
-        
+
         Returns
         -------
         None
         """
         try:
             blob_path = folder_path + destination_blob_name
-            client = storage.Client()
-            bucket = client.bucket(bucket_name)
-            blob = bucket.blob(blob_path)
-            blob.upload_from_filename(source_file_path)
+            blob = self._bucket(bucket_name).blob(blob_path)
+            blob.upload_from_filename(source_file_path, timeout=self.timeout)
+            self._record('upload', os.path.getsize(source_file_path))
+            self._blobs_metadata[(bucket_name, blob_path)] = blob
             logger.success(f"File {source_file_path} successfully uploaded as {blob_path} in bucket {bucket_name}.")
         except Exception as e:
             logger.error(f"Error when uploading file: {e}")
-    
-    @staticmethod
+
+    @span('gcs.get_metadata')
     def file_exists(
-        bucket_name: str, 
-        blob_name: str, 
+        self,
+        bucket_name: str,
+        blob_name: str,
         folder_path: str = ""
     ) -> bool:
         """
@@ -69,28 +152,28 @@ class GoogleUtils:
         """
         try:
             blob_path = folder_path + blob_name if folder_path else blob_name
-            client = storage.Client()
-            bucket = client.bucket(bucket_name)
-            blob = bucket.blob(blob_path)
-            logger.info(f"Blob {blob_path} {'exists' if blob.exists() else 'does not exist'} in bucket {bucket_name}.")
-            return True if blob.exists() else False
+            exists = self._get_blob_metadata(bucket_name, blob_path) is not None
+            logger.info(f"Blob {blob_path} {'exists' if exists else 'does not exist'} in bucket {bucket_name}.")
+            return exists
         except Exception as e:
             logger.error(f"Error occurred while checking for file existence: {e}")
-        
-    @staticmethod
+
+    @span('gcs.upload')
     def upload_non_physical_file(
+        self,
         bucket_name: str,
         data: str,
         destination_blob_name: str,
         content_type: str,
-        folder_path: str = ""
+        folder_path: str = "",
+        if_generation_match: int = None
     ) -> None:
         """
         Upload a non-physical file (e.g., JSON, CSV, TXT) to a GCP bucket.
 
         Parameters
         ----------
-        bucket_name: str 
+        bucket_name: str
             Name of the bucket
         data: str
             Data to upload as a string
@@ -100,30 +183,49 @@ class GoogleUtils:
             Content type of the file (e.g., 'application/json', 'text/csv')
         folder_path: str
             Optional, the path of the blob in the bucket
+        if_generation_match: int
+            Optional, only upload if the blob generation matches (0 if the blob must not exist)
 
         Returns
         -------
         None
+
+        Raises
+        ------
+        Exception
+            If the upload fails, e.g. google.api_core.exceptions.PreconditionFailed
+            if the blob generation does not match
         """
         try:
             blob_path = folder_path + destination_blob_name if folder_path else destination_blob_name
-            client = storage.Client()
-            bucket = client.bucket(bucket_name)
-            blob = bucket.blob(blob_path)
-            blob.upload_from_string(data, content_type=content_type)
+            blob = self._bucket(bucket_name).blob(blob_path)
+            data = data.encode('utf-8') if isinstance(data, str) else data
+            # Uploads are only retried when a precondition makes them idempotent
+            retry_kwargs = {'retry': self.retry} if if_generation_match is not None else {}
+            blob.upload_from_string(
+                data,
+                content_type=content_type,
+                if_generation_match=if_generation_match,
+                timeout=self.timeout,
+                **retry_kwargs
+            )
+            self._record('upload', len(data))
+            self._blobs_metadata[(bucket_name, blob_path)] = blob
             logger.success(f"File successfully uploaded as {blob_path} in bucket {bucket_name}.")
         except Exception as e:
             logger.error(f"Error when uploading file: {e}")
-            
-    @staticmethod
+            raise e
+
+    @span('gcs.download')
     def download_blob(
-        bucket_name: str, 
-        source_blob_name: str, 
+        self,
+        bucket_name: str,
+        source_blob_name: str,
         destination_file_name: str,
         folder_path: str = ""
     ) -> None:
         """Downloads a blob from a bucket.
-        
+
         Parameters
         ----------
         bucket_name: str
@@ -131,7 +233,7 @@ class GoogleUtils:
         source_blob_name: str
             Name of the blob to download
         destination_file_name: str
-            Name of the file to download from the bucket 
+            Name of the file to download from the bucket
         folder_path: str
             Optional, the path of the blob in the bucket
 
@@ -141,23 +243,61 @@ class GoogleUtils:
         """
         try:
             blob_path = folder_path + source_blob_name if folder_path else source_blob_name
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_path)
-            blob.download_to_filename(destination_file_name)
+            blob = self._bucket(bucket_name).blob(blob_path)
+            blob.download_to_filename(destination_file_name, timeout=self.timeout, retry=self.retry)
+            self._record('download', os.path.getsize(destination_file_name))
             logger.success(f"Downloaded storage object {source_blob_name} from bucket {bucket_name} to local file {destination_file_name}.")
         except Exception as e:
             logger.error(f"Error when downloading file: {e}")
-            
-    @staticmethod
-    def download_blob_as_string(
-        bucket_name: str, 
-        source_blob_name: str, 
+
+    @span('gcs.download')
+    def download_blob_as_bytes(
+        self,
+        bucket_name: str,
+        source_blob_name: str,
         folder_path: str = ""
-    ) -> str:
+    ) -> bytes:
         """
-        Downloads a blob from a bucket and returns its content as a string.
-        
+        Downloads a blob from a bucket and returns its content as bytes.
+
+        Parameters
+        ----------
+        bucket_name: str
+            Name of the bucket
+        source_blob_name: str
+            Name of the blob to download
+        folder_path: str
+            Optional, the path of the blob in the bucket
+
+        Returns
+        -------
+        bytes
+            The content of the blob, or None if an error occurs.
+        """
+        try:
+            blob_path = folder_path + source_blob_name if folder_path else source_blob_name
+            blob = self._bucket(bucket_name).blob(blob_path)
+
+            blob_content = blob.download_as_bytes(timeout=self.timeout, retry=self.retry)
+            self._record('download', len(blob_content))
+
+            logger.success(f"Downloaded storage object {source_blob_name} from bucket {bucket_name}.")
+            return blob_content
+        except Exception as e:
+            logger.error(f"Error when downloading file: {e}")
+            return None
+
+    @span('gcs.download')
+    def download_blob_with_generation(
+        self,
+        bucket_name: str,
+        source_blob_name: str,
+        folder_path: str = ""
+    ) -> tuple:
+        """
+        Downloads a blob from a bucket with the generation it has been read at,
+        to be used as an `if_generation_match` precondition of the next write.
+
         Parameters
         ----------
         bucket_name: str
@@ -169,34 +309,109 @@ class GoogleUtils:
 
         Returns
         -------
-        str
-            The content of the blob as a string, or None if an error occurs.
+        tuple
+            The content of the blob as bytes and its generation, (None, 0) if the blob does not exist
+
+        Raises
+        ------
+        Exception
+            If the download fails for another reason than a missing blob
         """
         try:
             blob_path = folder_path + source_blob_name if folder_path else source_blob_name
-            storage_client = storage.Client()
-            bucket = storage_client.bucket(bucket_name)
-            blob = bucket.blob(blob_path)
+            blob = self._bucket(bucket_name).blob(blob_path)
 
-            blob_content = blob.download_as_bytes()
-            blob_string = blob_content.decode("utf-8")
+            # The generation is read from the headers of the download response
+            blob_content = blob.download_as_bytes(timeout=self.timeout, retry=self.retry)
+            self._record('download', len(blob_content))
 
-            logger.success(f"Downloaded storage object {source_blob_name} from bucket {bucket_name} as string.")
-            return blob_string
+            logger.success(f"Downloaded storage object {source_blob_name} from bucket {bucket_name}.")
+            return blob_content, int(blob.generation)
+        except NotFound:
+            self._record('download')
+            return None, 0
         except Exception as e:
             logger.error(f"Error when downloading file: {e}")
-            return None         
-            
-    @staticmethod        
-    def list_blobs(bucket_name: str) -> list:
+            raise e
+
+    @contextmanager
+    def open_blob_reader(self, bucket_name: str, blob_name: str):
+        """
+        Open a blob as a binary file-like object, read in chunks.
+
+        Parameters
+        ----------
+        bucket_name: str
+            Name of the bucket
+        blob_name: str
+            Name of the blob to read
+
+        Yields
+        ------
+        BlobReader
+            The binary file-like object
+        """
+        blob = self._bucket(bucket_name).blob(blob_name)
+        self._record('download')
+        with blob.open('rb', timeout=self.timeout, retry=self.retry) as reader:
+            yield reader
+
+    @contextmanager
+    def open_blob_writer(
+        self,
+        bucket_name: str,
+        blob_name: str,
+        content_type: str = 'application/octet-stream',
+        if_generation_match: int = None
+    ):
+        """
+        Open a blob for writing as a binary file-like object, uploaded in chunks with a resumable upload.
+        The blob is only visible once the writer is closed.
+
+        Parameters
+        ----------
+        bucket_name: str
+            Name of the bucket
+        blob_name: str
+            Name of the blob to write
+        content_type: str [optional]
+            Content type of the blob, default to 'application/octet-stream'
+        if_generation_match: int [optional]
+            Only write if the blob generation matches (0 if the blob must not exist)
+
+        Yields
+        ------
+        BlobWriter
+            The binary file-like object
+        """
+        blob = self._bucket(bucket_name).blob(blob_name)
+        # Uploads are only retried when a precondition makes them idempotent
+        retry_kwargs = {'retry': self.retry} if if_generation_match is not None else {'retry': None}
+        with blob.open(
+            'wb',
+            content_type=content_type,
+            if_generation_match=if_generation_match,
+            timeout=self.timeout,
+            **retry_kwargs
+        ) as writer:
+            yield writer
+            size = writer.tell()
+        self._record('upload', size)
+        self._blobs_metadata[(bucket_name, blob_name)] = blob
+
+    @span('gcs.list')
+    def list_blobs(self, bucket_name: str, prefix: str = None) -> list:
         """
         Lists all the blobs in the bucket.
-        
+        The metadata of the listed blobs are cached for the run.
+
         Parameters
         ----------
         bucket_name: str
             Name of the bucket
-            
+        prefix: str
+            Optional, only list the blobs whose name starts with this prefix
+
         Returns
         -------
         list
@@ -204,11 +419,95 @@ class GoogleUtils:
         """
         try:
             blobs_list = []
-            storage_client = storage.Client()
-            blobs = storage_client.list_blobs(bucket_name)
-            for blob in blobs:
-                blobs_list.append(blob.name)
+            blobs = self.client.list_blobs(bucket_name, prefix=prefix, timeout=self.timeout, retry=self.retry)
+            for page in blobs.pages:
+                self._record('list')
+                for blob in page:
+                    self._blobs_metadata[(bucket_name, blob.name)] = blob
+                    blobs_list.append(blob.name)
             return blobs_list
         except Exception as e:
             logger.error(f"Error when listing blobs: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @span('gcs.compose')
+    def compose_blobs(
+        self,
+        bucket_name: str,
+        source_blob_names: list,
+        destination_blob_name: str,
+        if_generation_match: int = None
+    ) -> int:
+        """
+        Concatenate blobs of a bucket into a destination blob, without downloading them.
+        GCS composes up to 32 blobs at once, so more blobs are composed in several steps.
+
+        Parameters
+        ----------
+        bucket_name: str
+            Name of the bucket
+        source_blob_names: list
+            Names of the blobs to concatenate, in order
+        destination_blob_name: str
+            Name of the composed blob
+        if_generation_match: int
+            Optional, only compose if the destination blob generation matches (0 if it must not exist)
+
+        Returns
+        -------
+        int
+            The generation of the composed blob
+
+        Raises
+        ------
+        google.api_core.exceptions.PreconditionFailed
+            If the destination blob generation does not match
+        """
+        try:
+            bucket = self._bucket(bucket_name)
+            destination = bucket.blob(destination_blob_name)
+            sources = [bucket.blob(name) for name in source_blob_names]
+
+            step_sources, sources = sources[:32], sources[32:]
+            self._record('compose')
+            destination.compose(step_sources, if_generation_match=if_generation_match, timeout=self.timeout)
+            while sources:
+                # The composed blob is the first source of the next steps
+                step_sources, sources = sources[:31], sources[31:]
+                self._record('compose')
+                destination.compose(
+                    [destination, *step_sources],
+                    if_generation_match=destination.generation,
+                    timeout=self.timeout
+                )
+
+            self._blobs_metadata[(bucket_name, destination_blob_name)] = destination
+            logger.success(f"{len(source_blob_names)} blobs composed as {destination_blob_name} in bucket {bucket_name}.")
+            return destination.generation
+        except Exception as e:
+            logger.error(f"Error when composing blobs: {e}")
+            raise e
+
+    @span('gcs.delete')
+    def delete_blob(self, bucket_name: str, blob_name: str) -> None:
+        """
+        Delete a blob from a bucket.
+
+        Parameters
+        ----------
+        bucket_name: str
+            Name of the bucket
+        blob_name: str
+            Name of the blob to delete
+
+        Returns
+        -------
+        None
+        """
+        try:
+            self._record('delete')
+            self._bucket(bucket_name).blob(blob_name).delete(timeout=self.timeout, retry=self.retry)
+            self._blobs_metadata[(bucket_name, blob_name)] = None
+            logger.success(f"Blob {blob_name} deleted from bucket {bucket_name}.")
+        except Exception as e:
+            logger.error(f"Error when deleting blob: {e}")
@@ -0,0 +1,376 @@
+import re
+import codecs
+from collections import deque
+from html.parser import HTMLParser
+from abc import ABC, abstractmethod
+from loguru import logger
+
+try:
+    from lxml import etree, html as lxml_html
+except ImportError:  # pragma: no cover
+    lxml_html = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxHTMLParser
+except ImportError:  # pragma: no cover
+    SelectolaxHTMLParser = None
+
+
+RESULTS_LIST_CLASS = 'jobs-search__results-list'
+RESULTS_LIST_START = re.compile(r'<ul\b[^>]*\b' + RESULTS_LIST_CLASS + r'\b[^>]*>')
+UL_TAG = re.compile(r'<(/?)ul\b', re.IGNORECASE)
+
+TITLE_CLASS = 'base-search-card__title'
+COMPANY_CLASS = 'base-search-card__subtitle'
+LOCATION_CLASS = 'job-search-card__location'
+TITLE_SELECTOR = f'h3.{TITLE_CLASS}'
+COMPANY_SELECTOR = f'h4.{COMPANY_CLASS}'
+LOCATION_SELECTOR = f'span.{LOCATION_CLASS}'
+LINK_SELECTOR = 'a[href]'
+POSTED_SELECTOR = 'time[datetime]'
+URN_SELECTOR = '[data-entity-urn]'
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def slice_results_list(webpage: str) -> str:
+    """
+    Slice the results list out of the webpage, so that only this subtree is parsed.
+
+    Parameters
+    ----------
+    webpage: str
+        The html code of the webpage
+
+    Returns
+    -------
+    results_list: str
+        The html code of the `ul.jobs-search__results-list` element, or an empty string if not found
+    """
+    match = RESULTS_LIST_START.search(webpage)
+    if match is None:
+        return ''
+
+    # Find the matching closing tag, in case cards contain nested lists
+    depth = 0
+    for tag in UL_TAG.finditer(webpage, match.start()):
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return webpage[match.start():webpage.index('>', tag.end()) + 1]
+    return webpage[match.start():]
+
+
+class ParserBackend(ABC):
+    """
+    Interface of the backends used to extract the job cards from the webpage.
+    """
+    name = None
+
+    @abstractmethod
+    def iter_cards(self, webpage: str):
+        """
+        Extract the job cards of the results list.
+
+        Parameters
+        ----------
+        webpage: str
+            The html code of the webpage
+
+        Yields
+        ------
+        card: dict
+            The raw title, link, company, location, posted date and urn of a job card, None when not found
+        """
+        pass
+
+
+class SoupParser(ParserBackend):
+    """
+    Extract the job cards with BeautifulSoup from the sliced results list,
+    only building the results list tree.
+    """
+    name = 'bs4'
+
+    def __init__(self) -> None:
+        # Imported here, as BeautifulSoup is only the fallback backend
+        from bs4 import BeautifulSoup, SoupStrainer
+        self.beautiful_soup = BeautifulSoup
+        self.strainer = SoupStrainer('ul', {'class': RESULTS_LIST_CLASS})
+
+    def iter_cards(self, webpage: str):
+        soup = self.beautiful_soup(slice_results_list(webpage), 'html.parser', parse_only=self.strainer)
+        results_list = soup.find('ul')
+        if results_list is None:
+            return
+        for card in results_list.find_all('li', recursive=False):
+            title = card.find('h3', {'class': TITLE_CLASS})
+            company = card.find('h4', {'class': COMPANY_CLASS})
+            location = card.find('span', {'class': LOCATION_CLASS})
+            link = card.find('a', href=True)
+            posted = card.find('time', datetime=True)
+            urn = card.find(attrs={'data-entity-urn': True})
+            yield {
+                'title': title.get_text().strip() if title is not None else None,
+                'link': link['href'] if link is not None else None,
+                'company': company.get_text().strip() if company is not None else None,
+                'location': location.get_text().strip() if location is not None else None,
+                'posted': posted['datetime'] if posted is not None else None,
+                'urn': urn['data-entity-urn'] if urn is not None else None
+            }
+
+
+class LxmlParser(ParserBackend):
+    """
+    Extract the job cards with lxml and precompiled XPath expressions from the sliced results list.
+    """
+    name = 'lxml'
+
+    def __init__(self) -> None:
+        self.cards_xpath = etree.XPath('./li')
+        self.title_xpath = etree.XPath(
+            ".//h3[contains(concat(' ', normalize-space(@class), ' '), ' base-search-card__title ')]"
+        )
+        self.company_xpath = etree.XPath(
+            ".//h4[contains(concat(' ', normalize-space(@class), ' '), ' base-search-card__subtitle ')]"
+        )
+        self.location_xpath = etree.XPath(
+            ".//span[contains(concat(' ', normalize-space(@class), ' '), ' job-search-card__location ')]"
+        )
+        self.link_xpath = etree.XPath('(.//a[@href])[1]/@href')
+        self.posted_xpath = etree.XPath('(.//time[@datetime])[1]/@datetime')
+        self.urn_xpath = etree.XPath('(descendant-or-self::*[@data-entity-urn])[1]/@data-entity-urn')
+
+    def iter_cards(self, webpage: str):
+        results_list = slice_results_list(webpage)
+        if not results_list:
+            return
+        root = lxml_html.fragment_fromstring(results_list)
+        for card in self.cards_xpath(root):
+            titles = self.title_xpath(card)
+            companies = self.company_xpath(card)
+            locations = self.location_xpath(card)
+            links = self.link_xpath(card)
+            posted = self.posted_xpath(card)
+            urns = self.urn_xpath(card)
+            yield {
+                'title': titles[0].text_content().strip() if titles else None,
+                'link': str(links[0]) if links else None,
+                'company': companies[0].text_content().strip() if companies else None,
+                'location': locations[0].text_content().strip() if locations else None,
+                'posted': str(posted[0]) if posted else None,
+                'urn': str(urns[0]) if urns else None
+            }
+
+
+class SelectolaxParser(ParserBackend):
+    """
+    Extract the job cards with selectolax from the sliced results list.
+    """
+    name = 'selectolax'
+
+    def iter_cards(self, webpage: str):
+        results_list = slice_results_list(webpage)
+        if not results_list:
+            return
+        tree = SelectolaxHTMLParser(results_list)
+        for card in tree.css(f'ul.{RESULTS_LIST_CLASS} > li'):
+            title = card.css_first(TITLE_SELECTOR)
+            company = card.css_first(COMPANY_SELECTOR)
+            location = card.css_first(LOCATION_SELECTOR)
+            link = card.css_first(LINK_SELECTOR)
+            posted = card.css_first(POSTED_SELECTOR)
+            urn = card.css_first(URN_SELECTOR)
+            yield {
+                'title': title.text().strip() if title is not None else None,
+                'link': link.attributes.get('href') if link is not None else None,
+                'company': company.text().strip() if company is not None else None,
+                'location': location.text().strip() if location is not None else None,
+                'posted': posted.attributes.get('datetime') if posted is not None else None,
+                'urn': urn.attributes.get('data-entity-urn') if urn is not None else None
+            }
+
+
+class _CardStreamParser(HTMLParser):
+    """
+    Incremental html parser collecting the job cards of the results list
+    as soon as their closing `</li>` tag is fed.
+    """
+    text_fields = {
+        ('h3', TITLE_CLASS): 'title',
+        ('h4', COMPANY_CLASS): 'company',
+        ('span', LOCATION_CLASS): 'location',
+    }
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.cards = deque()
+        self._list_depth = 0
+        self._li_depth = 0
+        self._card = None
+        self._text_field = None
+        self._text_tag = None
+        self._text_parts = None
+
+    def _new_card(self) -> dict:
+        return {'title': None, 'link': None, 'company': None, 'location': None, 'posted': None, 'urn': None}
+
+    def handle_starttag(self, tag, attrs):
+        if tag == 'ul':
+            if self._list_depth:
+                self._list_depth += 1
+            elif RESULTS_LIST_CLASS in (dict(attrs).get('class') or '').split():
+                self._list_depth = 1
+            return
+        if not self._list_depth:
+            return
+
+        if tag == 'li':
+            if self._li_depth == 0 and self._list_depth == 1:
+                self._card = self._new_card()
+            self._li_depth += 1
+        if self._card is None:
+            return
+
+        attrs = dict(attrs)
+        if self._card['urn'] is None and attrs.get('data-entity-urn'):
+            self._card['urn'] = attrs['data-entity-urn']
+        if tag == 'a' and self._card['link'] is None:
+            self._card['link'] = attrs.get('href')
+        elif tag == 'time' and self._card['posted'] is None:
+            self._card['posted'] = attrs.get('datetime')
+        elif self._text_parts is None:
+            for css_class in (attrs.get('class') or '').split():
+                field = self.text_fields.get((tag, css_class))
+                if field is not None and self._card[field] is None:
+                    self._text_field, self._text_tag, self._text_parts = field, tag, []
+                    break
+
+    def handle_endtag(self, tag):
+        if not self._list_depth:
+            return
+        if tag == 'ul':
+            self._list_depth -= 1
+        elif tag == self._text_tag and self._text_parts is not None:
+            self._card[self._text_field] = ''.join(self._text_parts).strip()
+            self._text_field, self._text_tag, self._text_parts = None, None, None
+        elif tag == 'li' and self._li_depth:
+            self._li_depth -= 1
+            if self._li_depth == 0 and self._card is not None:
+                self.cards.append(self._card)
+                self._card = None
+
+    def handle_data(self, data):
+        if self._text_parts is not None:
+            self._text_parts.append(data)
+
+
+def _iter_chunks(source, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Split a webpage source in text chunks.
+
+    Parameters
+    ----------
+    source: str, bytes, file-like or iterable
+        The webpage as a string, bytes, a file-like object opened in text or binary mode,
+        or an iterable of string or bytes chunks
+    chunk_size: int [optional]
+        The size of the chunks read from strings and file-like objects, default to 64 KiB
+
+    Yields
+    ------
+    chunk: str
+        A chunk of the webpage
+    """
+    if isinstance(source, (str, bytes)):
+        chunks = (source[i:i + chunk_size] for i in range(0, len(source), chunk_size))
+    elif hasattr(source, 'read'):
+        chunks = iter(lambda: source.read(chunk_size), source.read(0))
+    else:
+        chunks = source
+
+    decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+    for chunk in chunks:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    yield decoder.decode(b'', final=True)
+
+
+def iter_cards(source, chunk_size: int = STREAM_CHUNK_SIZE):
+    """
+    Stream the job cards of the results list, without building the webpage tree.
+    Each card is yielded as soon as its closing `</li>` tag is parsed, so memory stays flat
+    whatever the size of the webpage.
+
+    Parameters
+    ----------
+    source: str, bytes, file-like or iterable
+        The webpage as a string, bytes, a file-like object opened in text or binary mode,
+        or an iterable of string or bytes chunks
+    chunk_size: int [optional]
+        The size of the chunks read from strings and file-like objects, default to 64 KiB
+
+    Yields
+    ------
+    card: dict
+        The raw title, link, company, location, posted date and urn of a job card, None when not found
+    """
+    parser = _CardStreamParser()
+    for chunk in _iter_chunks(source, chunk_size):
+        parser.feed(chunk)
+        while parser.cards:
+            yield parser.cards.popleft()
+    parser.close()
+    while parser.cards:
+        yield parser.cards.popleft()
+
+
+class StreamingParser(ParserBackend):
+    """
+    Extract the job cards with an incremental (feed-based) parser.
+    Accepts string, bytes, file-like or chunks iterable webpages.
+    """
+    name = 'stream'
+
+    def iter_cards(self, webpage):
+        return iter_cards(webpage)
+
+
+# Ordered from the fastest to the slowest backend
+PARSER_BACKENDS = {
+    'lxml': (LxmlParser, lxml_html is not None),
+    'selectolax': (SelectolaxParser, SelectolaxHTMLParser is not None),
+    'bs4': (SoupParser, True),
+    'stream': (StreamingParser, True),
+}
+
+
+def get_parser_backend(name: str = 'auto') -> ParserBackend:
+    """
+    Get the parser backend from its name.
+    With 'auto', or if the backend is not installed, the fastest available backend is used.
+
+    Parameters
+    ----------
+    name: str [optional]
+        'auto', 'lxml', 'selectolax', 'bs4' or 'stream', default to 'auto'
+
+    Returns
+    -------
+    ParserBackend
+        The parser backend
+
+    Raises
+    ------
+    ValueError
+        If the backend name is unknown
+    """
+    if name != 'auto' and name not in PARSER_BACKENDS:
+        raise ValueError(f'Unknown parser backend: {name}')
+
+    parser_class, available = PARSER_BACKENDS.get(name, (None, False))
+    if available:
+        return parser_class()
+
+    if name != 'auto':
+        logger.warning(f'Parser backend {name} is not installed, falling back...')
+    for parser_class, available in PARSER_BACKENDS.values():
+        if available:
+            return parser_class()
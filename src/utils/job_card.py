@@ -0,0 +1,146 @@
+import re
+import sys
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from datetime import datetime
+from dataclasses import dataclass
+from .job_matcher import normalize_title
+
+
+JOB_ID_FROM_URN = re.compile(r'jobPosting:(\d+)')
+JOB_ID_FROM_URL = re.compile(r'/jobs/view/(?:[^/?#]*?-)?(\d+)/?(?:[?#]|$)')
+CANONICAL_HOST = 'www.linkedin.com'
+TRACKING_PARAMS = frozenset({'refId', 'trackingId', 'position', 'pageNum', 'trk', 'originalSubdomain'})
+
+
+def _parse_job_id(urn: str, link: str) -> int:
+    """
+    Get the numeric job id from the card urn, or from its link.
+
+    Parameters
+    ----------
+    urn: str
+        The card urn, e.g. "urn:li:jobPosting:4012345678"
+    link: str
+        The card link, e.g. "https://fr.linkedin.com/jobs/view/data-engineer-at-acme-4012345678?refId=..."
+
+    Returns
+    -------
+    job_id: int
+        The job id, None if not found
+    """
+    for pattern, value in ((JOB_ID_FROM_URN, urn), (JOB_ID_FROM_URL, link)):
+        match = pattern.search(value) if value else None
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def canonicalize_url(link: str, job_id: int) -> str:
+    """
+    Canonicalize a job link, so that the same job offer always has the same url
+    whatever the job name, the search or the run it has been scraped from.
+    Links with a job id are reduced to it, tracking parameters are removed from the others.
+
+    Parameters
+    ----------
+    link: str
+        The job link, e.g. "https://fr.linkedin.com/jobs/view/data-engineer-at-acme-4012345678?refId=...&trackingId=..."
+    job_id: int
+        The job id, e.g. 4012345678
+
+    Returns
+    -------
+    url: str
+        The canonical url, e.g. "https://www.linkedin.com/jobs/view/4012345678/", None if there is no link
+    """
+    if not link:
+        return None
+    parts = urlsplit(link)
+    host = CANONICAL_HOST if parts.netloc.endswith('linkedin.com') else parts.netloc
+    if job_id is not None:
+        return urlunsplit((parts.scheme or 'https', host, f'/jobs/view/{job_id}/', '', ''))
+    query = [(key, value) for key, value in parse_qsl(parts.query) if key not in TRACKING_PARAMS]
+    return urlunsplit((parts.scheme, host, parts.path, urlencode(query), ''))
+
+
+def _parse_posted_at(posted: str) -> datetime:
+    """
+    Get the posting datetime from the card `time` element.
+
+    Parameters
+    ----------
+    posted: str
+        The datetime attribute of the card `time` element, e.g. "2026-10-16"
+
+    Returns
+    -------
+    posted_at: datetime
+        The posting datetime, None if not found or invalid
+    """
+    try:
+        return datetime.fromisoformat(posted) if posted else None
+    except ValueError:
+        return None
+
+
+@dataclass(slots=True)
+class JobCard:
+    """
+    dataclass containing the informations of a job card, extracted in the same pass as the title.
+    Slots and interned titles keep thousands of cards compact in memory.
+    """
+    title: str
+    normalized_title: str
+    company: str = None
+    location: str = None
+    posted_at: datetime = None
+    job_id: int = None
+    url: str = None
+    matched_jobs: tuple = ()
+
+    @classmethod
+    def from_raw(cls, raw_card: dict) -> 'JobCard':
+        """
+        Create a job card from the raw card extracted by a parser backend.
+
+        Parameters
+        ----------
+        raw_card: dict
+            The raw card: title, link, company, location, posted and urn, None when not found
+
+        Returns
+        -------
+        JobCard
+            The job card
+        """
+        title = sys.intern((raw_card.get('title') or '').lower().strip())
+        job_id = _parse_job_id(raw_card.get('urn'), raw_card.get('link'))
+        return cls(
+            title=title,
+            normalized_title=sys.intern(normalize_title(title)),
+            company=raw_card.get('company') or None,
+            location=raw_card.get('location') or None,
+            posted_at=_parse_posted_at(raw_card.get('posted')),
+            job_id=job_id,
+            url=canonicalize_url(raw_card.get('link'), job_id)
+        )
+
+    def to_dict(self) -> dict:
+        """
+        Convert the job card to a JSON serializable dict.
+
+        Returns
+        -------
+        dict
+            The job card informations
+        """
+        return {
+            'job_id': self.job_id,
+            'url': self.url,
+            'title': self.title,
+            'normalized_title': self.normalized_title,
+            'company': self.company,
+            'location': self.location,
+            'posted_at': self.posted_at.isoformat() if self.posted_at else None,
+            'matched_jobs': list(self.matched_jobs)
+        }
@@ -0,0 +1,189 @@
+import re
+import unicodedata
+from functools import lru_cache
+from collections import deque
+
+
+# Gender markers such as "(H/F)", "F/H", "(M/W)", "(m/f/d)", "(H/F/NB)"
+GENDER_MARKERS = re.compile(r'\(?\b(?:nb|[hfmwxd])(?:\s*[/|]\s*(?:nb|[hfmwxd]))+\b\)?')
+# Inclusive writing suffixes such as "ingénieur·e", "développeur.euse", "chef·fe", "analyste(s)"
+INCLUSIVE_SUFFIXES = re.compile(r'(?<=\w)(?:[·•.\-]|\()(?:e|ne|se|fe|euse|rice|trice|ère|ere|s)\)?(?:[·•.]s)?\b')
+NON_ALPHANUMERIC = re.compile(r'[^a-z0-9+#]+')
+# Feminine forms folded to the masculine ones, once the accents are stripped,
+# e.g. "ingenieure", "technicienne", "developpeuse", "directrice", "consultante", "chargee"
+FEMININE_SUFFIXES = (
+    ('ienne', 'ien'),
+    ('trice', 'teur'),
+    ('euse', 'eur'),
+    ('eure', 'eur'),
+    ('ante', 'ant'),
+    ('ere', 'er'),
+    ('ee', 'e'),
+)
+# French forms folded to the English ones, e.g. "analyste", "scientiste"
+FRENCH_SUFFIXES = (
+    ('yste', 'yst'),
+    ('iste', 'ist'),
+)
+# Synonyms of the usual job names, extended by the configured ones (JOB_SYNONYMS)
+DEFAULT_JOB_SYNONYMS = {
+    'data engineer': ['ingénieur data', 'ingénieur big data', 'ingénieur données', 'ingénieur de données'],
+    'data analyst': ['analyste data', 'analyste données', 'analyste de données'],
+    'data scientist': ['scientifique des données', 'scientifique de données'],
+}
+MATCH_CACHE_SIZE = 65536
+
+
+def _normalize_token(token: str) -> str:
+    """
+    Normalize a token by removing its plural mark and folding its feminine and French forms.
+    """
+    if len(token) > 3 and token.endswith('s') and not token.endswith('ss'):
+        token = token[:-1]
+    for suffix, replacement in FEMININE_SUFFIXES + FRENCH_SUFFIXES:
+        if len(token) > len(suffix) + 2 and token.endswith(suffix):
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+@lru_cache(maxsize=65536)
+def normalize_title(title: str) -> str:
+    """
+    Normalize a job title: lowercase, gender markers and inclusive suffixes removed,
+    accents stripped, punctuation replaced by spaces, plural marks removed and
+    feminine and French forms folded.
+    Results are cached, as the same titles are seen many times.
+
+    Parameters
+    ----------
+    title: str
+        The job title, e.g. "Ingénieure Data (H/F)"
+
+    Returns
+    -------
+    str
+        The normalized title, e.g. "ingenieur data"
+    """
+    title = title.lower()
+    title = GENDER_MARKERS.sub(' ', title)
+    title = INCLUSIVE_SUFFIXES.sub('', title)
+    title = unicodedata.normalize('NFKD', title)
+    title = ''.join(char for char in title if not unicodedata.combining(char))
+    tokens = NON_ALPHANUMERIC.sub(' ', title).split()
+    return ' '.join(_normalize_token(token) for token in tokens)
+
+
+class JobMatcher:
+    def __init__(self, vocabulary: dict) -> None:
+        """
+        Classify job titles against a vocabulary of job names and synonyms in one pass.
+
+        The normalized synonyms are compiled in an Aho-Corasick automaton over tokens,
+        so a title is scanned once whatever the number of job names. The last token of a
+        synonym also matches the title tokens it prefixes, e.g. "data engineer" matches
+        "data engineering manager", as the former substring test did.
+        The matches are cached per matcher, as the same titles are seen many times.
+
+        Parameters
+        ----------
+        vocabulary: dict
+            A dict containing, for each job name, the list of its synonyms.
+            Each job name is also a synonym of itself.
+        """
+        self.job_names = list(vocabulary)
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [set()]
+        self._prefix_output = [{}]
+        self.match = lru_cache(maxsize=MATCH_CACHE_SIZE)(self._match)
+
+        for job_name, synonyms in vocabulary.items():
+            for synonym in [job_name, *synonyms]:
+                tokens = normalize_title(synonym).split()
+                if tokens:
+                    self._add_pattern(tokens, job_name)
+        self._build_failure_links()
+
+    @classmethod
+    def from_job_names(cls, job_names: list, synonyms: dict = None) -> 'JobMatcher':
+        """
+        Create a matcher for a list of job names.
+
+        Parameters
+        ----------
+        job_names: list
+            The job names to match
+        synonyms: dict [optional]
+            A dict containing synonyms for some job names, added to the default ones (DEFAULT_JOB_SYNONYMS)
+
+        Returns
+        -------
+        JobMatcher
+            The compiled matcher
+        """
+        synonyms = synonyms or {}
+        return cls({
+            job_name: [*DEFAULT_JOB_SYNONYMS.get(job_name, []), *synonyms.get(job_name, [])]
+            for job_name in job_names
+        })
+
+    def _add_pattern(self, tokens: list, job_name: str) -> None:
+        """
+        Add the tokens of a synonym to the automaton trie.
+        The job name is also added to the prefix output of the state before the last token.
+        """
+        state = 0
+        for token in tokens:
+            previous_state = state
+            if token not in self._goto[state]:
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(set())
+                self._prefix_output.append({})
+                self._goto[state][token] = len(self._goto) - 1
+            state = self._goto[state][token]
+        self._output[state].add(job_name)
+        self._prefix_output[previous_state].setdefault(tokens[-1], set()).add(job_name)
+
+    def _build_failure_links(self) -> None:
+        """
+        Compute the failure link of each state with a breadth-first traversal of the trie.
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(token, 0)
+                self._output[next_state] |= self._output[self._fail[next_state]]
+                for last_token, job_names in self._prefix_output[self._fail[next_state]].items():
+                    self._prefix_output[next_state].setdefault(last_token, set()).update(job_names)
+
+    def _match(self, title: str) -> frozenset:
+        """
+        Get the job names matched by a title.
+
+        Parameters
+        ----------
+        title: str
+            The job title
+
+        Returns
+        -------
+        frozenset
+            The job names whose name or one of the synonyms is found in the title
+        """
+        matched = set()
+        state = 0
+        for token in normalize_title(title).split():
+            for last_token, job_names in self._prefix_output[state].items():
+                if token.startswith(last_token):
+                    matched |= job_names
+            while state and token not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(token, 0)
+            matched |= self._output[state]
+        return frozenset(matched)
@@ -0,0 +1,472 @@
+import io
+import os
+import threading
+from pathlib import Path
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from collections import defaultdict
+from loguru import logger
+from google.api_core.exceptions import PreconditionFailed, NotFound
+
+
+class ObjectStore(ABC):
+    """
+    Interface of the object stores used to read and write the Datastats files.
+
+    Blobs are read and written as bytes or as streams, without staging through local files.
+    Preconditions follow GCS semantics: `if_generation_match=0` means the blob must not exist,
+    and a failed precondition raises `google.api_core.exceptions.PreconditionFailed` whatever the backend.
+    Each store counts its calls and bytes per operation, so the I/O path can be measured offline.
+    """
+    name = None
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.stats = defaultdict(lambda: {'calls': 0, 'bytes': 0})
+
+    def _record(self, operation: str, size: int = 0) -> None:
+        """
+        Count a call and the bytes it transferred.
+        """
+        with self._lock:
+            self.stats[operation]['calls'] += 1
+            self.stats[operation]['bytes'] += size
+
+    def log_stats(self) -> None:
+        """
+        Log the calls and bytes counted per operation.
+        """
+        for operation, stats in sorted(self.stats.items()):
+            logger.info(f"{self.name} {operation}: {stats['calls']} calls, {stats['bytes']} bytes")
+
+    @abstractmethod
+    def file_exists(self, bucket_name: str, blob_name: str, folder_path: str = "") -> bool:
+        """
+        Check if a blob exists.
+        """
+        pass
+
+    @abstractmethod
+    def download_blob_as_bytes(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> bytes:
+        """
+        Get the content of a blob, None if an error occurs.
+        """
+        pass
+
+    @abstractmethod
+    def download_blob_with_generation(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> tuple:
+        """
+        Get the content of a blob and the generation it has been read at, to be used as
+        an `if_generation_match` precondition. (None, 0) if the blob does not exist, other errors are raised.
+        """
+        pass
+
+    def download_blob_as_string(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> str:
+        """
+        Get the content of a blob as a string, None if an error occurs.
+        """
+        blob_content = self.download_blob_as_bytes(bucket_name, source_blob_name, folder_path)
+        return blob_content.decode('utf-8') if blob_content is not None else None
+
+    @abstractmethod
+    def upload_non_physical_file(
+        self,
+        bucket_name: str,
+        data: str,
+        destination_blob_name: str,
+        content_type: str,
+        folder_path: str = "",
+        if_generation_match: int = None
+    ) -> None:
+        """
+        Write a string or bytes in a blob, raising if the upload fails.
+        """
+        pass
+
+    @abstractmethod
+    def open_blob_reader(self, bucket_name: str, blob_name: str):
+        """
+        Open a blob as a binary file-like object, to be used as a context manager.
+        """
+        pass
+
+    @abstractmethod
+    def open_blob_writer(
+        self,
+        bucket_name: str,
+        blob_name: str,
+        content_type: str = 'application/octet-stream',
+        if_generation_match: int = None
+    ):
+        """
+        Open a blob for writing as a binary file-like object, to be used as a context manager.
+        The blob is only visible once the writer is closed.
+        """
+        pass
+
+    @abstractmethod
+    def list_blobs(self, bucket_name: str, prefix: str = None) -> list:
+        """
+        List the blob names of a bucket, optionally starting with a prefix.
+        """
+        pass
+
+    @abstractmethod
+    def compose_blobs(
+        self,
+        bucket_name: str,
+        source_blob_names: list,
+        destination_blob_name: str,
+        if_generation_match: int = None
+    ) -> int:
+        """
+        Concatenate blobs into a destination blob and return its generation.
+        """
+        pass
+
+    @abstractmethod
+    def delete_blob(self, bucket_name: str, blob_name: str) -> None:
+        """
+        Delete a blob.
+        """
+        pass
+
+
+class _MemoryBlobWriter(io.BytesIO):
+    """
+    Buffer committing its content to the memory store when closed.
+    """
+    def __init__(self, commit) -> None:
+        super().__init__()
+        self._commit = commit
+
+    def close(self) -> None:
+        if not self.closed:
+            data = self.getvalue()
+            super().close()
+            self._commit(data)
+
+
+class MemoryObjectStore(ObjectStore):
+    """
+    Object store keeping the blobs in memory, for offline runs, profiling and benchmarks.
+    """
+    name = 'memory'
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._blobs = {}
+        self._generation = 0
+
+    def _check_generation(self, key: tuple, if_generation_match: int) -> None:
+        """
+        Raise if the generation of the blob does not match the precondition.
+        """
+        if if_generation_match is None:
+            return
+        current = self._blobs[key][1] if key in self._blobs else 0
+        if current != if_generation_match:
+            raise PreconditionFailed(f'Generation of {key[1]} is {current}, expected {if_generation_match}')
+
+    def _put(self, key: tuple, data: bytes, if_generation_match: int = None) -> int:
+        """
+        Store the blob content with a new generation.
+        """
+        with self._lock:
+            self._check_generation(key, if_generation_match)
+            self._generation += 1
+            self._blobs[key] = (bytes(data), self._generation)
+            return self._generation
+
+    def file_exists(self, bucket_name: str, blob_name: str, folder_path: str = "") -> bool:
+        self._record('get_metadata')
+        return (bucket_name, folder_path + blob_name) in self._blobs
+
+    def download_blob_as_bytes(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> bytes:
+        try:
+            blob_content = self._blobs[(bucket_name, folder_path + source_blob_name)][0]
+            self._record('download', len(blob_content))
+            return blob_content
+        except KeyError as e:
+            logger.error(f"Error when downloading file: {e}")
+            return None
+
+    def download_blob_with_generation(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> tuple:
+        with self._lock:
+            blob_content, generation = self._blobs.get((bucket_name, folder_path + source_blob_name), (None, 0))
+        self._record('download', len(blob_content or b''))
+        return blob_content, generation
+
+    def upload_non_physical_file(
+        self,
+        bucket_name: str,
+        data: str,
+        destination_blob_name: str,
+        content_type: str,
+        folder_path: str = "",
+        if_generation_match: int = None
+    ) -> None:
+        try:
+            data = data.encode('utf-8') if isinstance(data, str) else data
+            self._put((bucket_name, folder_path + destination_blob_name), data, if_generation_match)
+            self._record('upload', len(data))
+        except Exception as e:
+            logger.error(f"Error when uploading file: {e}")
+            raise e
+
+    @contextmanager
+    def open_blob_reader(self, bucket_name: str, blob_name: str):
+        key = (bucket_name, blob_name)
+        if key not in self._blobs:
+            raise NotFound(f'{blob_name} not found in bucket {bucket_name}')
+        blob_content = self._blobs[key][0]
+        self._record('download', len(blob_content))
+        with io.BytesIO(blob_content) as reader:
+            yield reader
+
+    @contextmanager
+    def open_blob_writer(
+        self,
+        bucket_name: str,
+        blob_name: str,
+        content_type: str = 'application/octet-stream',
+        if_generation_match: int = None
+    ):
+        key = (bucket_name, blob_name)
+        with self._lock:
+            self._check_generation(key, if_generation_match)
+
+        def commit(data: bytes) -> None:
+            self._put(key, data, if_generation_match)
+            self._record('upload', len(data))
+
+        writer = _MemoryBlobWriter(commit)
+        try:
+            yield writer
+        except BaseException:
+            writer._commit = lambda data: None
+            raise
+        finally:
+            writer.close()
+
+    def list_blobs(self, bucket_name: str, prefix: str = None) -> list:
+        self._record('list')
+        return sorted(
+            blob_name for bucket, blob_name in list(self._blobs)
+            if bucket == bucket_name and blob_name.startswith(prefix or '')
+        )
+
+    def compose_blobs(
+        self,
+        bucket_name: str,
+        source_blob_names: list,
+        destination_blob_name: str,
+        if_generation_match: int = None
+    ) -> int:
+        try:
+            self._record('compose')
+            missing = [name for name in source_blob_names if (bucket_name, name) not in self._blobs]
+            if missing:
+                raise NotFound(f'{missing[0]} not found in bucket {bucket_name}')
+            data = b''.join(self._blobs[(bucket_name, name)][0] for name in source_blob_names)
+            generation = self._put((bucket_name, destination_blob_name), data, if_generation_match)
+            logger.success(f"{len(source_blob_names)} blobs composed as {destination_blob_name} in bucket {bucket_name}.")
+            return generation
+        except Exception as e:
+            logger.error(f"Error when composing blobs: {e}")
+            raise e
+
+    def delete_blob(self, bucket_name: str, blob_name: str) -> None:
+        self._record('delete')
+        if self._blobs.pop((bucket_name, blob_name), None) is None:
+            logger.error(f"Error when deleting blob: {blob_name} not found in bucket {bucket_name}")
+        else:
+            logger.success(f"Blob {blob_name} deleted from bucket {bucket_name}.")
+
+
+class LocalObjectStore(ObjectStore):
+    """
+    Object store keeping the blobs as files of a local directory, one sub-directory per bucket.
+    Writes go to a temporary file next to the blob, renamed once complete, so readers never see partial blobs.
+    The generation of a blob is its modification time in nanoseconds.
+    """
+    name = 'local'
+
+    def __init__(self, root_dir: str = '.storage') -> None:
+        """
+        Parameters
+        ----------
+        root_dir: str [optional]
+            The directory containing the buckets, default to '.storage'
+        """
+        super().__init__()
+        self.root_dir = Path(root_dir)
+
+    def _path(self, bucket_name: str, blob_name: str) -> Path:
+        return self.root_dir / bucket_name / blob_name
+
+    def _generation(self, path: Path) -> int:
+        try:
+            return path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def _check_generation(self, path: Path, if_generation_match: int) -> None:
+        """
+        Raise if the generation of the blob does not match the precondition.
+        """
+        if if_generation_match is not None and self._generation(path) != if_generation_match:
+            raise PreconditionFailed(f'Generation of {path} does not match {if_generation_match}')
+
+    @contextmanager
+    def _atomic_writer(self, path: Path, if_generation_match: int = None):
+        """
+        Write a blob through a temporary file renamed once complete.
+        """
+        self._check_generation(path, if_generation_match)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        try:
+            with open(temp_path, 'wb') as writer:
+                yield writer
+            with self._lock:
+                self._check_generation(path, if_generation_match)
+                os.replace(temp_path, path)
+            self._record('upload', path.stat().st_size)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def file_exists(self, bucket_name: str, blob_name: str, folder_path: str = "") -> bool:
+        self._record('get_metadata')
+        return self._path(bucket_name, folder_path + blob_name).is_file()
+
+    def download_blob_as_bytes(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> bytes:
+        try:
+            blob_content = self._path(bucket_name, folder_path + source_blob_name).read_bytes()
+            self._record('download', len(blob_content))
+            return blob_content
+        except Exception as e:
+            logger.error(f"Error when downloading file: {e}")
+            return None
+
+    def download_blob_with_generation(self, bucket_name: str, source_blob_name: str, folder_path: str = "") -> tuple:
+        try:
+            with open(self._path(bucket_name, folder_path + source_blob_name), 'rb') as reader:
+                blob_content = reader.read()
+                # Blobs are replaced by a rename, so the opened file is the generation read
+                generation = os.fstat(reader.fileno()).st_mtime_ns
+        except FileNotFoundError:
+            return None, 0
+        self._record('download', len(blob_content))
+        return blob_content, generation
+
+    def upload_non_physical_file(
+        self,
+        bucket_name: str,
+        data: str,
+        destination_blob_name: str,
+        content_type: str,
+        folder_path: str = "",
+        if_generation_match: int = None
+    ) -> None:
+        try:
+            data = data.encode('utf-8') if isinstance(data, str) else data
+            with self._atomic_writer(self._path(bucket_name, folder_path + destination_blob_name), if_generation_match) as writer:
+                writer.write(data)
+        except Exception as e:
+            logger.error(f"Error when uploading file: {e}")
+            raise e
+
+    @contextmanager
+    def open_blob_reader(self, bucket_name: str, blob_name: str):
+        path = self._path(bucket_name, blob_name)
+        self._record('download', path.stat().st_size)
+        with open(path, 'rb') as reader:
+            yield reader
+
+    def open_blob_writer(
+        self,
+        bucket_name: str,
+        blob_name: str,
+        content_type: str = 'application/octet-stream',
+        if_generation_match: int = None
+    ):
+        return self._atomic_writer(self._path(bucket_name, blob_name), if_generation_match)
+
+    def list_blobs(self, bucket_name: str, prefix: str = None) -> list:
+        self._record('list')
+        bucket_path = self.root_dir / bucket_name
+        if not bucket_path.is_dir():
+            return []
+        return sorted(
+            blob_name for blob_name in (
+                path.relative_to(bucket_path).as_posix() for path in bucket_path.rglob('*')
+                if path.is_file() and not path.name.endswith('.tmp')
+            )
+            if blob_name.startswith(prefix or '')
+        )
+
+    def compose_blobs(
+        self,
+        bucket_name: str,
+        source_blob_names: list,
+        destination_blob_name: str,
+        if_generation_match: int = None
+    ) -> int:
+        try:
+            self._record('compose')
+            path = self._path(bucket_name, destination_blob_name)
+            with self._atomic_writer(path, if_generation_match) as writer:
+                for name in source_blob_names:
+                    try:
+                        reader = open(self._path(bucket_name, name), 'rb')
+                    except FileNotFoundError:
+                        raise NotFound(f'{name} not found in bucket {bucket_name}')
+                    with reader:
+                        while chunk := reader.read(1024 * 1024):
+                            writer.write(chunk)
+            logger.success(f"{len(source_blob_names)} blobs composed as {destination_blob_name} in bucket {bucket_name}.")
+            return self._generation(path)
+        except Exception as e:
+            logger.error(f"Error when composing blobs: {e}")
+            raise e
+
+    def delete_blob(self, bucket_name: str, blob_name: str) -> None:
+        try:
+            self._record('delete')
+            self._path(bucket_name, blob_name).unlink()
+            logger.success(f"Blob {blob_name} deleted from bucket {bucket_name}.")
+        except Exception as e:
+            logger.error(f"Error when deleting blob: {e}")
+
+
+def get_object_store(name: str = 'gcs', root_dir: str = '.storage') -> ObjectStore:
+    """
+    Get the object store from its name.
+
+    Parameters
+    ----------
+    name: str [optional]
+        'gcs', 'local' or 'memory', default to 'gcs'
+    root_dir: str [optional]
+        The directory containing the buckets of the local store, default to '.storage'
+
+    Returns
+    -------
+    ObjectStore
+        The object store
+
+    Raises
+    ------
+    ValueError
+        If the store name is unknown
+    """
+    if name == 'gcs':
+        # Imported here so that offline stores do not load the GCS client
+        from .gcp_utils import GoogleUtils
+        return GoogleUtils()
+    if name == 'local':
+        return LocalObjectStore(root_dir=root_dir)
+    if name == 'memory':
+        return MemoryObjectStore()
+    raise ValueError(f'Unknown storage backend: {name}')
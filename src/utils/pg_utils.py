@@ -1,74 +1,259 @@
+import io
+import os
+import csv
 import ssl
+import time
+import queue
+import atexit
 import tempfile
+import threading
 import pg8000.dbapi
 from loguru import logger
+from functools import lru_cache
+from datetime import date, timedelta
+from contextlib import contextmanager
+from .timing import span
 
-class PostgresUtils:
-    def __init__(self):
-        pass
-    
-    def _generate_temp_pem_file(
+
+SCHEMA_VERSIONS_TABLE_NAME = 'schema_versions'
+COPY_CHUNK_SIZE = 64 * 1024
+# NULL marker of the COPY csv rows, so that empty strings are not read as NULL
+COPY_NULL = '\\N'
+
+# Schema versions known by the process, to skip the DDL once a table is up to date
+_known_schema_versions = {}
+_schema_versions_loaded = threading.Event()
+_schema_versions_lock = threading.Lock()
+
+# Partitions known by the process to exist
+_known_partitions = set()
+
+# Connection pools of the process, one per database and user
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+@lru_cache(maxsize=4)
+def _get_ssl_context(
+    db_root_cert: str, 
+    db_cert: str, 
+    db_key: str
+) -> ssl.SSLContext:
+    """
+    Build the SSL context used to create a secured SSL connection with Postgres, once per process.
+    The root certificate is loaded from memory. The certificate and the private key can only be loaded 
+    from files, so they are written in a private temp directory removed as soon as they are loaded.
+
+    Parameters
+    ----------
+    db_root_cert: str
+        The value of SSL root (server) certificate
+    db_cert: str
+        The value of SSL certificate
+    db_key: str
+        The value of SSL private key
+            
+    Returns
+    -------
+    ssl_context: ssl.SSLContext 
+        The SSL context
+    """
+    try:
+        ssl_context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        ssl_context.check_hostname = False
+        ssl_context.verify_mode = ssl.CERT_REQUIRED
+        ssl_context.load_verify_locations(cadata=db_root_cert)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cert_path = os.path.join(temp_dir, 'cert.pem')
+            key_path = os.path.join(temp_dir, 'key.pem')
+            for path, value in ((cert_path, db_cert), (key_path, db_key)):
+                with open(os.open(path, os.O_WRONLY | os.O_CREAT, 0o600), 'w') as pem_file:
+                    pem_file.write(value)
+            ssl_context.load_cert_chain(cert_path, key_path)
+        return ssl_context
+    except Exception as e:
+        logger.error(f'Failed to verify SSL elements: {e}')
+        raise e
+
+
+def _format_copy_value(value) -> str:
+    """
+    Format a value as a field of a COPY csv row, None being the NULL marker.
+    """
+    if value is None:
+        return COPY_NULL
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set, frozenset)):
+        elements = (str(element).replace('\\', '\\\\').replace('"', '\\"') for element in value)
+        return '{' + ','.join(f'"{element}"' for element in elements) + '}'
+    return str(value)
+
+
+def _iter_copy_chunks(data: list, columns: list, chunk_size: int = COPY_CHUNK_SIZE):
+    """
+    Serialize rows as csv for COPY FROM STDIN, in chunks of about chunk_size characters.
+    NULL values are written as COPY_NULL, and empty strings as empty fields.
+
+    Parameters
+    ----------
+    data: list
+        A list of dictionaries where keys are column names and values are the data to copy
+    columns: list
+        The columns to copy, in order
+    chunk_size: int [optional]
+        The size of the yielded chunks, default to 64 KiB
+
+    Yields
+    ------
+    chunk: str
+        Csv rows
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    for row in data:
+        writer.writerow([_format_copy_value(row[column]) for column in columns])
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+class ConnectionPool:
+    def __init__(
         self,
-        value:str
-    ) -> str:
+        connect,
+        max_size: int = 4,
+        max_idle: float = 60.0
+    ) -> None:
         """
-        Generate a temp file from a string value.
-        Used to generate .PEM files used in SSL connection on Postgres
-        
+        Thread-safe pool of Postgres connections, reused across the jobs handled in one process.
+        Connections are opened on demand up to max_size, and checked with a ping 
+        when they have been idle for more than max_idle seconds.
+
         Parameters
         ----------
-        value: str
-            The string value that will be stored in a temp file
+        connect: callable
+            The function opening a new connection
+        max_size: int [optional]
+            The max number of connections, default to 4
+        max_idle: float [optional]
+            The idle time after which a connection is checked before reuse, default to 60 seconds
+        """
+        self._connect = connect
+        self.max_size = max_size
+        self.max_idle = max_idle
+        self._idle = queue.LifoQueue()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
         
-        Returns
-        -------
-        temp_file.name: str
-            The path as string of the temp file created
+    def _is_alive(self, connection: pg8000.dbapi.Connection) -> bool:
+        """
+        Check that an idle connection can still be used.
         """
         try:
-            with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-                temp_file.write(value.encode())
-                temp_file.flush()  
-            return temp_file.name
-        except Exception as e:
-            logger.error(f'Failed to generate temp file: {e}')
-    
-    def _generate_ssl_args( 
-        self,
-        db_root_cert: str, 
-        db_cert: str, 
-        db_key: str
-    ) -> dict:
+            cursor = connection.cursor()
+            cursor.execute('SELECT 1')
+            cursor.fetchall()
+            connection.rollback()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, connection: pg8000.dbapi.Connection) -> None:
+        """
+        Close a connection and free its slot.
+        """
+        with self._lock:
+            self._size -= 1
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def _acquire(self) -> pg8000.dbapi.Connection:
+        """
+        Get an idle connection, or open a new one.
+        """
+        while True:
+            try:
+                connection, released_at = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - released_at < self.max_idle or self._is_alive(connection):
+                return connection
+            logger.warning('Discarding a dead pgsql connection...')
+            self._discard(connection)
         
+        connection = self._connect()
+        with self._lock:
+            self._size += 1
+        return connection
+
+    @contextmanager
+    def connection(self):
         """
-        Generate the SSL dict context to create a secured SSL connection with Postgres
+        Borrow a connection from the pool, returned to the pool when done.
+        A connection is not returned if it failed, and a transaction left open is rolled back.
 
-        Parameters
-        ----------
-        db_root_cert: str
-            The path of the database root certificate
-        db_cert: str
-            The path of the database certificate
-        db_key: str
-            The path of the private key
-                
-        Returns
-        -------
-        connect_args: dict 
-            The dict containing ssl context elements. Can be used as **connect_args
-        """
-        connect_args = {}
-        
-        try:            
-            ssl_context = ssl.SSLContext()
-            ssl_context.verify_mode = ssl.CERT_REQUIRED
-            ssl_context.load_verify_locations(db_root_cert)
-            ssl_context.load_cert_chain(db_cert, db_key)
-            connect_args["ssl_context"] = ssl_context
-            return connect_args
-        except Exception as e:
-            logger.error(f'Failed to verify SSL elements: {e}')
+        Yields
+        ------
+        connection: pg8000.dbapi.Connection
+            The connection
+        """
+        self._slots.acquire()
+        connection = None
+        try:
+            connection = self._acquire()
+            yield connection
+        except Exception:
+            if connection is not None:
+                self._discard(connection)
+                connection = None
+            raise
+        finally:
+            if connection is not None:
+                try:
+                    connection.rollback()
+                    self._idle.put((connection, time.monotonic()))
+                except Exception:
+                    self._discard(connection)
+            self._slots.release()
+
+    def close(self) -> None:
+        """
+        Close the idle connections of the pool.
+        """
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(connection)
+
+
+def close_pools() -> None:
+    """
+    Close the connection pools of the process.
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+atexit.register(close_pools)
+
+
+class PostgresUtils:
+    def __init__(self):
+        pass
     
+    @span('pg.connect')
     def connect_with_ssl(
         self,
         db_host: str,
@@ -109,10 +294,7 @@ class PostgresUtils:
             The connection that will be used to interact with Postgres instance
         """
         
-        db_root_cert = self._generate_temp_pem_file(db_root_cert)
-        db_cert = self._generate_temp_pem_file(db_cert)
-        db_key = self._generate_temp_pem_file(db_key)
-        connect_args = self._generate_ssl_args(db_root_cert, db_cert, db_key)
+        ssl_context = _get_ssl_context(db_root_cert, db_cert, db_key)
         db_port = int(db_port)
         
         try:
@@ -122,7 +304,7 @@ class PostgresUtils:
                 host=db_host,
                 port=db_port,
                 database=db_name,
-                **connect_args
+                ssl_context=ssl_context
             )
             
             logger.success(f'Connection successfully established with {db_name}')
@@ -131,6 +313,255 @@ class PostgresUtils:
             logger.error(f'Failed to establish connection: {e}')
             raise e        
 
+    def get_pool(
+        self,
+        db_host: str,
+        db_user: str,
+        db_password: str,
+        db_name: str,
+        db_port: str,
+        db_root_cert: str,
+        db_cert: str,
+        db_key: str,
+        max_size: int = 4
+    ) -> ConnectionPool:
+        """
+        Get the pool of SSL secured connections with Postgres Cloud SQL, 
+        created once per process for a database and a user.
+        
+        Parameters
+        ----------
+        db_host: str
+            The database host
+        db_user: str
+            The database username
+        db_password: str
+            The database username password
+        db_name: str
+            The name of the database
+        db_port: str
+            The port of the database
+        db_root_cert: str
+            The value of SSL root (server) certificate
+        db_cert: str
+            The value of SSL certificate
+        db_key: str
+            The value of SSL private key
+        max_size: int [optional]
+            The max number of connections of the pool, default to 4
+        
+        Returns
+        -------
+        pool: ConnectionPool
+            The connection pool
+        """
+        key = (db_host, str(db_port), db_name, db_user)
+        with _pools_lock:
+            if key not in _pools:
+                _pools[key] = ConnectionPool(
+                    connect=lambda: self.connect_with_ssl(
+                        db_host=db_host,
+                        db_user=db_user,
+                        db_password=db_password,
+                        db_name=db_name,
+                        db_port=db_port,
+                        db_root_cert=db_root_cert,
+                        db_cert=db_cert,
+                        db_key=db_key
+                    ),
+                    max_size=max_size
+                )
+            return _pools[key]
+
+    def _load_schema_versions(self, connection: pg8000.dbapi.Connection) -> None:
+        """
+        Load the schema version of every registered table, creating the registry table if needed.
+        """
+        cursor = connection.cursor()
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [SCHEMA_VERSIONS_TABLE_NAME])
+        if not cursor.fetchone()[0]:
+            cursor.execute(
+                f"CREATE TABLE IF NOT EXISTS {SCHEMA_VERSIONS_TABLE_NAME} "
+                "(table_name TEXT PRIMARY KEY, version INTEGER NOT NULL, applied_at TIMESTAMPTZ NOT NULL DEFAULT now())"
+            )
+        cursor.execute(f"SELECT table_name, version FROM {SCHEMA_VERSIONS_TABLE_NAME}")
+        _known_schema_versions.update({table_name: version for table_name, version in cursor.fetchall()})
+        connection.commit()
+        cursor.close()
+
+    def generate_create_table_statement(
+        self,
+        table_name: str, 
+        table_schema: dict,
+        partition_by: str = None
+    ) -> str:
+        """
+        Generate the statement creating a table if it does not already exist.
+
+        Parameters
+        ----------
+        table_name: str
+            The name of the table to create
+        table_schema: dict
+            A dictionary where keys are column names and values are column definitions (e.g., "id": "SERIAL PRIMARY KEY")
+        partition_by: str [optional]
+            The partitioning of the table (e.g., "RANGE (scrap_date)")
+
+        Returns
+        -------
+        str
+            The CREATE TABLE statement
+        """
+        columns_def = ", ".join([f"{col_name} {col_def}" for col_name, col_def in table_schema.items()])
+        partition_clause = f" PARTITION BY {partition_by}" if partition_by else ""
+        return f"CREATE TABLE IF NOT EXISTS {table_name} ({columns_def}){partition_clause}"
+
+    @span('pg.ensure_table')
+    def ensure_table(
+        self, 
+        connection: pg8000.dbapi.Connection, 
+        table_name: str, 
+        table_schema: dict,
+        version: int = 1,
+        migrations: dict = None,
+        partition_by: str = None,
+        indexes: dict = None
+    ) -> None:
+        """
+        Create or migrate a table to a schema version, only when its version is not known to be up to date.
+        The versions are registered in the schema_versions table and cached by the process, 
+        so once a table is up to date no DDL is issued anymore.
+        
+        A missing table is created with table_schema, which describes the latest version.
+        An existing table is upgraded by running the migrations above its version, a table created 
+        before the registry being at version 1. Migrations run in a single transaction, 
+        under an advisory lock so that concurrent runs do not migrate the same table twice.
+
+        Parameters
+        ----------
+        connection: pg8000.dbapi.Connection
+            The connection object to the Postgres database
+        table_name: str
+            The name of the table
+        table_schema: dict
+            A dictionary where keys are column names and values are column definitions (e.g., "id": "SERIAL PRIMARY KEY")
+        version: int [optional]
+            The schema version of table_schema, default to 1
+        migrations: dict [optional]
+            A dictionary where keys are schema versions and values are the list of SQL statements 
+            upgrading the table from the previous version
+        partition_by: str [optional]
+            The partitioning of the table (e.g., "RANGE (scrap_date)")
+        indexes: dict [optional]
+            A dictionary where keys are index names and values are the indexed columns (e.g., "(job_to_scrap, scrap_date)"),
+            created after the table creation or migrations
+
+        Returns
+        -------
+        None
+        """
+        if _known_schema_versions.get(table_name, 0) >= version:
+            return
+
+        with _schema_versions_lock:
+            if not _schema_versions_loaded.is_set():
+                self._load_schema_versions(connection)
+                _schema_versions_loaded.set()
+        if _known_schema_versions.get(table_name, 0) >= version:
+            return
+        
+        # Start a transaction
+        connection.autocommit = False
+
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext(%s))", [table_name])
+            cursor.execute(f"SELECT version FROM {SCHEMA_VERSIONS_TABLE_NAME} WHERE table_name = %s", [table_name])
+            row = cursor.fetchone()
+            current_version = row[0] if row else None
+            
+            if current_version is None:
+                cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [table_name])
+                table_exists = cursor.fetchone()[0]
+                current_version = 1 if table_exists else 0
+            
+            if current_version == 0:
+                logger.info(f"Creating table '{table_name}' at version {version}...")
+                cursor.execute(self.generate_create_table_statement(table_name, table_schema, partition_by))
+                current_version = version
+                
+            for migration_version in sorted(migrations or {}):
+                if current_version < migration_version <= version:
+                    logger.info(f"Migrating table '{table_name}' to version {migration_version}...")
+                    for sql_statement in migrations[migration_version]:
+                        cursor.execute(sql_statement)
+            
+            for index_name, index_columns in (indexes or {}).items():
+                cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} {index_columns}")
+            
+            cursor.execute(
+                f"INSERT INTO {SCHEMA_VERSIONS_TABLE_NAME} (table_name, version) VALUES (%s, %s) "
+                "ON CONFLICT (table_name) DO UPDATE SET version = EXCLUDED.version, applied_at = now()",
+                [table_name, max(version, current_version)]
+            )
+            connection.commit()
+            cursor.close()
+            _known_schema_versions[table_name] = max(version, current_version)
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Failed to ensure table '{table_name}': {e}")
+            raise e
+
+    @span('pg.ensure_partition')
+    def ensure_monthly_partition(
+        self, 
+        connection: pg8000.dbapi.Connection, 
+        table_name: str, 
+        day: date
+    ) -> str:
+        """
+        Create the monthly partition of a table partitioned by range on a date, if it does not already exist.
+        The partitions are cached by the process, and only created after a lookup, so no DDL is issued
+        once the partition exists.
+
+        Parameters
+        ----------
+        connection: pg8000.dbapi.Connection
+            The connection object to the Postgres database
+        table_name: str
+            The name of the partitioned table
+        day: date
+            A day of the month of the partition
+
+        Returns
+        -------
+        partition_name: str
+            The name of the partition, e.g. "urls_scrapper_statistics_2026_10"
+        """
+        month_start = date(day.year, day.month, 1)
+        next_month_start = (month_start + timedelta(days=32)).replace(day=1)
+        partition_name = f"{table_name}_{month_start:%Y_%m}"
+        if partition_name in _known_partitions:
+            return partition_name
+        
+        try:
+            cursor = connection.cursor()
+            cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [partition_name])
+            if not cursor.fetchone()[0]:
+                logger.info(f"Creating partition '{partition_name}'...")
+                cursor.execute(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name} PARTITION OF {table_name} "
+                    f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{next_month_start.isoformat()}')"
+                )
+            connection.commit()
+            cursor.close()
+            _known_partitions.add(partition_name)
+            return partition_name
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Failed to create partition '{partition_name}': {e}")
+            raise e
+
     def create_table_if_not_exists(
         self, 
         connection: pg8000.dbapi.Connection, 
@@ -166,6 +597,7 @@ class PostgresUtils:
             logger.error(f"Failed to create table '{table_name}': {e}")
             raise e
         
+    @span('pg.insert')
     def insert_data(
         self, 
         connection: pg8000.dbapi.Connection, 
@@ -217,6 +649,232 @@ class PostgresUtils:
             logger.error(f"Failed to insert data into '{table_name}': {e}")
             raise e
         
+    @span('pg.insert_batches')
+    def _insert_batches(
+        self, 
+        connection: pg8000.dbapi.Connection, 
+        table_name: str, 
+        data: list,
+        on_conflict: str,
+        returning: str = None,
+        batch_size: int = 1000,
+        commit: bool = True
+    ) -> list:
+        """
+        Insert rows into a table in the Postgres database with multi-rows INSERT statements,
+        in a single transaction.
+
+        Parameters
+        ----------
+        connection: pg8000.dbapi.Connection
+            The connection object to the Postgres database
+        table_name: str
+            The name of the table to insert data into
+        data: list
+            A list of dictionaries where keys are column names and values are the data to insert.
+            Every dictionary must have the same keys.
+        on_conflict: str
+            The ON CONFLICT clause of the statements
+        returning: str [optional]
+            The column returned for each inserted row
+        batch_size: int [optional]
+            The number of rows inserted by statement, default to 1000
+        commit: bool [optional]
+            Commit the transaction, default to True. If False, the transaction is left open
+            and must be committed or rolled back by the caller
+
+        Returns
+        -------
+        returned: list
+            The returned column value of each inserted row, empty if returning is not set
+        """
+        if not data:
+            return []
+
+        # Start a transaction
+        connection.autocommit = False
+        
+        try:
+            columns = list(data[0].keys())
+            row_placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+            returning_clause = f" RETURNING {returning}" if returning else ""
+            returned = []
+            
+            cursor = connection.cursor()
+            for start in range(0, len(data), batch_size):
+                batch = data[start:start + batch_size]
+                values = [row[column] for row in batch for column in columns]
+                cursor.execute(
+                    f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                    f"VALUES {', '.join([row_placeholders] * len(batch))} "
+                    f"{on_conflict}{returning_clause}",
+                    values
+                )
+                if returning:
+                    returned.extend(row[0] for row in cursor.fetchall())
+            if commit:
+                connection.commit()
+            cursor.close()
+            return returned
+
+        except Exception as e:
+            connection.rollback()
+            logger.error(f"Failed to insert data into '{table_name}': {e}")
+            raise e
+
+    def insert_data_if_not_exists(
+        self, 
+        connection: pg8000.dbapi.Connection, 
+        table_name: str, 
+        data: list,
+        conflict_columns: list,
+        returning: str,
+        batch_size: int = 1000,
+        commit: bool = True
+    ) -> list:
+        """
+        Insert rows into a table in the Postgres database, skipping the rows conflicting
+        with existing ones, and return a column of the rows actually inserted.
+
+        Parameters
+        ----------
+        connection: pg8000.dbapi.Connection
+            The connection object to the Postgres database
+        table_name: str
+            The name of the table to insert data into
+        data: list
+            A list of dictionaries where keys are column names and values are the data to insert.
+            Every dictionary must have the same keys.
+        conflict_columns: list
+            The columns of the unique constraint used to detect existing rows
+        returning: str
+            The column returned for each inserted row
+        batch_size: int [optional]
+            The number of rows inserted by statement, default to 1000
+        commit: bool [optional]
+            Commit the transaction, default to True. If False, the transaction is left open
+            and must be committed or rolled back by the caller, e.g. once the inserted rows are used
+
+        Returns
+        -------
+        inserted: list
+            The returned column value of each inserted row
+        """
+        return self._insert_batches(
+            connection=connection,
+            table_name=table_name,
+            data=data,
+            on_conflict=f"ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING",
+            returning=returning,
+            batch_size=batch_size,
+            commit=commit
+        )
+
+    def upsert_data(
+        self, 
+        connection: pg8000.dbapi.Connection, 
+        table_name: str, 
+        data: list,
+        conflict_columns: list,
+        update_columns: dict,
+        batch_size: int = 1000
+    ) -> None:
+        """
+        Insert rows into a table in the Postgres database, updating the rows conflicting
+        with existing ones, with batched multi-rows statements.
+
+        Parameters
+        ----------
+        connection: pg8000.dbapi.Connection
+            The connection object to the Postgres database
+        table_name: str
+            The name of the table to upsert data into
+        data: list
+            A list of dictionaries where keys are column names and values are the data to insert.
+            Every dictionary must have the same keys.
+        conflict_columns: list
+            The columns of the unique constraint used to detect existing rows
+        update_columns: dict
+            A dictionary where keys are the column names to update on conflict and values 
+            are the SQL expressions of their new value (e.g., "count": "t.count + EXCLUDED.count")
+        batch_size: int [optional]
+            The number of rows upserted by statement, default to 1000
+
+        Returns
+        -------
+        None
+        """
+        update_set = ", ".join([f"{column} = {expression}" for column, expression in update_columns.items()])
+        self._insert_batches(
+            connection=connection,
+            table_name=table_name,
+            data=data,
+            on_conflict=f"ON CONFLICT ({', '.join(conflict_columns)}) DO UPDATE SET {update_set}",
+            batch_size=batch_size
+        )
+        
+    @span('pg.copy')
+    def copy_data(
+        self, 
+        connection: pg8000.dbapi.Connection, 
+        table_name: str, 
+        data: list,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Bulk insert rows into a table in the Postgres database by streaming them with COPY FROM STDIN, 
+        in a single round-trip and transaction. If COPY is not available (e.g. not allowed by a proxy),
+        rows are inserted with batched multi-rows INSERT statements instead.
+
+        Parameters
+        ----------
+        connection: pg8000.dbapi.Connection
+            The connection object to the Postgres database
+        table_name: str
+            The name of the table to insert data into
+        data: list
+            A list of dictionaries where keys are column names and values are the data to insert.
+            Every dictionary must have the same keys. Lists are inserted as arrays.
+        batch_size: int [optional]
+            The number of rows inserted by statement with the fallback, default to 1000
+
+        Returns
+        -------
+        int
+            The number of inserted rows
+        """
+        if not data:
+            return 0
+
+        # Start a transaction
+        connection.autocommit = False
+
+        columns = list(data[0].keys())
+        try:
+            cursor = connection.cursor()
+            cursor.execute(
+                f"COPY {table_name} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+                stream=_iter_copy_chunks(data, columns)
+            )
+            connection.commit()
+            cursor.close()
+            return len(data)
+        except Exception as e:
+            connection.rollback()
+            logger.warning(f"COPY into '{table_name}' failed, falling back to batched inserts: {e}")
+        
+        self._insert_batches(
+            connection=connection,
+            table_name=table_name,
+            data=[
+                {column: list(value) if isinstance(value, (tuple, set, frozenset)) else value for column, value in row.items()}
+                for row in data
+            ],
+            on_conflict="",
+            batch_size=batch_size
+        )
+        return len(data)
+
     def close_connection(self, connection: pg8000.dbapi.Connection) -> None:
         """
         Close the connection to the Postgres database.
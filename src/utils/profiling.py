@@ -0,0 +1,213 @@
+import io
+import os
+import json
+import pstats
+import marshal
+import cProfile
+import resource
+import threading
+import tracemalloc
+from loguru import logger
+from collections import defaultdict
+
+
+PROFILES_FOLDER = 'profiles'
+RSS_SAMPLING_INTERVAL = 0.5  # seconds
+TRACEMALLOC_FRAMES = 25
+TOP_STATS = 50
+
+
+def _read_children_map() -> dict:
+    """
+    Map each process id to its children ids, from /proc.
+    """
+    children = defaultdict(list)
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue
+        # The process name can contain spaces and parentheses, the fields start after the last one
+        ppid = int(stat[stat.rindex(')') + 2:].split()[1])
+        children[ppid].append(int(entry))
+    return children
+
+
+def _read_rss(pid: int) -> tuple:
+    """
+    Get the name and the resident set size in bytes of a process, from /proc.
+    """
+    name, rss = None, 0
+    try:
+        with open(f'/proc/{pid}/status') as status_file:
+            for line in status_file:
+                if line.startswith('Name:'):
+                    name = line.split()[1]
+                elif line.startswith('VmRSS:'):
+                    rss = int(line.split()[1]) * 1024
+                    break
+    except OSError:
+        pass
+    return name, rss
+
+
+class RunProfiler:
+    def __init__(self, run_id: str) -> None:
+        """
+        Opt-in CPU and memory profiler of a run.
+
+        The pipeline is profiled with cProfile (main thread) and tracemalloc (every thread),
+        while a background thread samples the resident memory of the child processes
+        (Chrome and chromedriver) to record their high-water marks.
+        Profiles are written through the object store, so they can be compared between runs.
+
+        Parameters
+        ----------
+        run_id: str
+            The run identifier, used as the folder of the profiles
+        """
+        self.run_id = run_id
+        self.profile = cProfile.Profile()
+        self.traced_memory_peak = None
+        self.children_rss_peak = 0
+        self.processes_rss_peak = {}
+        self._snapshot = None
+        self._stop_sampling = threading.Event()
+        self._sampler = None
+
+    def _sample_children_rss(self) -> None:
+        """
+        Record the resident memory of the descendant processes.
+        """
+        children = _read_children_map()
+        pending, total_rss = list(children[os.getpid()]), 0
+        while pending:
+            pid = pending.pop()
+            pending.extend(children[pid])
+            name, rss = _read_rss(pid)
+            total_rss += rss
+            if name is not None:
+                self.processes_rss_peak[name] = max(self.processes_rss_peak.get(name, 0), rss)
+        self.children_rss_peak = max(self.children_rss_peak, total_rss)
+
+    def _sampling_loop(self) -> None:
+        while not self._stop_sampling.wait(RSS_SAMPLING_INTERVAL):
+            try:
+                self._sample_children_rss()
+            except Exception as e:
+                logger.warning(f'Error while sampling child processes memory: {e}')
+                return
+
+    def start(self) -> None:
+        """
+        Start profiling.
+        """
+        logger.info('Profiling mode enabled, starting profilers...')
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+        if os.path.isdir('/proc'):
+            self._sampler = threading.Thread(target=self._sampling_loop, name='rss-sampler', daemon=True)
+            self._sampler.start()
+        self.profile.enable()
+
+    def stop(self) -> None:
+        """
+        Stop profiling and take the memory snapshot.
+        """
+        self.profile.disable()
+        self._stop_sampling.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+            self.traced_memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def summary(self) -> dict:
+        """
+        Summarize the memory high-water marks of the run.
+
+        Returns
+        -------
+        dict
+            The peaks of the Python heap, of the process and of its child processes, in bytes
+        """
+        return {
+            'run_id': self.run_id,
+            'traced_memory_peak': self.traced_memory_peak,
+            'process_rss_peak': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+            'children_rss_peak': self.children_rss_peak,
+            'processes_rss_peak': self.processes_rss_peak
+        }
+
+    def _cpu_report(self) -> str:
+        """
+        Format the functions with the highest cumulative and own time.
+        """
+        report = io.StringIO()
+        stats = pstats.Stats(self.profile, stream=report)
+        stats.sort_stats('cumulative').print_stats(TOP_STATS)
+        stats.sort_stats('tottime').print_stats(TOP_STATS)
+        return report.getvalue()
+
+    def _memory_report(self) -> str:
+        """
+        Format the lines holding the most memory at the end of the run.
+        """
+        if self._snapshot is None:
+            return ''
+        snapshot = self._snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        return '\n'.join(str(stat) for stat in snapshot.statistics('lineno')[:TOP_STATS])
+
+    def save(self, store, bucket_name: str) -> None:
+        """
+        Write the profiles in the folder of the run: the raw cProfile stats (loadable with pstats),
+        the CPU and memory reports and the memory high-water marks.
+
+        Parameters
+        ----------
+        store: ObjectStore
+            The object store to write the profiles to
+        bucket_name: str
+            The bucket name to store the profiles
+        """
+        self.profile.create_stats()
+        folder_path = f'{PROFILES_FOLDER}/{self.run_id}/'
+        files = {
+            'cpu.pstats': (marshal.dumps(self.profile.stats), 'application/octet-stream'),
+            'cpu.txt': (self._cpu_report(), 'text/plain'),
+            'memory.txt': (self._memory_report(), 'text/plain'),
+            'summary.json': (json.dumps(self.summary(), indent=2), 'application/json'),
+        }
+        for file_name, (data, content_type) in files.items():
+            store.upload_non_physical_file(
+                bucket_name=bucket_name,
+                data=data,
+                destination_blob_name=file_name,
+                content_type=content_type,
+                folder_path=folder_path
+            )
+        logger.info(f'Profiles saved in {folder_path} of bucket {bucket_name}: {self.summary()}')
+
+    def finish(self, store, bucket_name: str) -> None:
+        """
+        Stop profiling and save the profiles, e.g. when the process exits.
+        Errors are logged, so that profiling never fails a run.
+
+        Parameters
+        ----------
+        store: ObjectStore
+            The object store to write the profiles to
+        bucket_name: str
+            The bucket name to store the profiles
+        """
+        try:
+            self.stop()
+            self.save(store=store, bucket_name=bucket_name)
+        except Exception as e:
+            logger.error(f'Error while saving profiles: {e}')
@@ -0,0 +1,244 @@
+import time
+import random
+from enum import Enum
+from loguru import logger
+from collections import Counter, deque
+from dataclasses import dataclass
+
+
+class Outcome(Enum):
+    """
+    Outcome of an attempt to generate a webpage.
+    """
+    SUCCESS = 'success'
+    EMPTY = 'empty'
+    NOT_READY = 'not_ready'
+    TIMEOUT = 'timeout'
+    DRIVER_ERROR = 'driver_error'
+    AUTHWALL = 'authwall'
+    BLOCKED = 'blocked'
+    ERROR_CODE = 'error_code'
+
+
+class RetryAction(Enum):
+    """
+    Action to take before retrying a failed attempt.
+    """
+    RETRY = 'retry'        # retry with the same driver
+    ROTATE = 'rotate'      # retry with a new browser fingerprint
+    RESTART = 'restart'    # retry with a new fingerprint after a driver failure, Chrome restarts if they repeat
+
+
+BLOCK_OUTCOMES = frozenset({Outcome.AUTHWALL, Outcome.BLOCKED, Outcome.ERROR_CODE})
+
+DEFAULT_ACTIONS = {
+    Outcome.EMPTY: RetryAction.RETRY,
+    Outcome.NOT_READY: RetryAction.RETRY,
+    Outcome.TIMEOUT: RetryAction.RETRY,
+    Outcome.DRIVER_ERROR: RetryAction.RESTART,
+    Outcome.AUTHWALL: RetryAction.ROTATE,
+    Outcome.BLOCKED: RetryAction.ROTATE,
+    Outcome.ERROR_CODE: RetryAction.ROTATE,
+}
+
+
+class CircuitOpenError(RuntimeError):
+    """
+    Raised when the block rate is too high to keep retrying.
+    """
+    pass
+
+
+@dataclass
+class AttemptRecord:
+    """
+    dataclass recording the outcome of an attempt.
+    """
+    attempt: int
+    outcome: Outcome
+    duration: float
+    delay: float = 0.0
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_attempts: int = 50,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        breaker_window: int = 15,
+        breaker_threshold: float = 0.9,
+        actions: dict = None
+    ) -> None:
+        """
+        Retry policy with exponential backoff, full jitter and circuit breaking.
+
+        The delay before a retry grows exponentially with the consecutive failures
+        and is drawn uniformly between 0 and this value. The circuit opens, and no
+        retry is allowed anymore, when the block rate over the last attempts is too high.
+
+        Parameters
+        ----------
+        max_attempts: int [optional]
+            max attempts, default to 50
+        base_delay: float [optional]
+            delay after the first failure in seconds, default to 0.5
+        max_delay: float [optional]
+            max delay between two attempts in seconds, default to 30
+        multiplier: float [optional]
+            growth factor of the delay, default to 2
+        breaker_window: int [optional]
+            number of last attempts used to compute the block rate, default to 15
+        breaker_threshold: float [optional]
+            block rate opening the circuit once the window is full, default to 0.9
+        actions: dict [optional]
+            the action to take for each failure outcome, default to DEFAULT_ACTIONS
+        """
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.breaker_threshold = breaker_threshold
+        self.actions = actions or DEFAULT_ACTIONS
+        self.records = []
+        self._window = deque(maxlen=breaker_window)
+        self._consecutive_failures = 0
+
+    @property
+    def attempts(self) -> int:
+        """
+        The number of recorded attempts.
+        """
+        return len(self.records)
+
+    def block_rate(self) -> float:
+        """
+        Compute the block rate over the last attempts.
+
+        Returns
+        -------
+        float
+            The share of blocked attempts in the window
+        """
+        if not self._window:
+            return 0.0
+        return sum(outcome in BLOCK_OUTCOMES for outcome in self._window) / len(self._window)
+
+    def is_circuit_open(self) -> bool:
+        """
+        Check if the block rate is clearly too high to keep retrying.
+
+        Returns
+        -------
+        bool
+            True if the window is full and its block rate reaches the threshold
+        """
+        return len(self._window) == self._window.maxlen and self.block_rate() >= self.breaker_threshold
+
+    def can_retry(self) -> bool:
+        """
+        Check if a new attempt is allowed.
+
+        Returns
+        -------
+        bool
+            True if a new attempt is allowed
+
+        Raises
+        ------
+        CircuitOpenError
+            If the circuit is open
+        """
+        if self.is_circuit_open():
+            raise CircuitOpenError(
+                f'Block rate of {self.block_rate():.0%} over the last {len(self._window)} attempts, giving up'
+            )
+        return self.attempts < self.max_attempts
+
+    def has_next_attempt(self) -> bool:
+        """
+        Check, without raising, if an attempt is left after the recorded ones.
+
+        Returns
+        -------
+        bool
+            True if the attempts are not exhausted and the circuit is closed
+        """
+        return self.attempts < self.max_attempts and not self.is_circuit_open()
+
+    def record(self, outcome: Outcome, duration: float) -> AttemptRecord:
+        """
+        Record the outcome of an attempt.
+
+        Parameters
+        ----------
+        outcome: Outcome
+            The outcome of the attempt
+        duration: float
+            The duration of the attempt in seconds
+
+        Returns
+        -------
+        AttemptRecord
+            The attempt record
+        """
+        record = AttemptRecord(attempt=self.attempts + 1, outcome=outcome, duration=duration)
+        self.records.append(record)
+        self._window.append(outcome)
+        self._consecutive_failures = 0 if outcome is Outcome.SUCCESS else self._consecutive_failures + 1
+        return record
+
+    def action_for(self, outcome: Outcome) -> RetryAction:
+        """
+        Get the action to take before retrying after a failure.
+
+        Parameters
+        ----------
+        outcome: Outcome
+            The outcome of the failed attempt
+
+        Returns
+        -------
+        RetryAction
+            The action to take
+        """
+        return self.actions.get(outcome, RetryAction.RETRY)
+
+    def compute_delay(self) -> float:
+        """
+        Compute the delay before the next attempt with exponential backoff and full jitter.
+
+        Returns
+        -------
+        float
+            The delay in seconds
+        """
+        if self._consecutive_failures == 0:
+            return 0.0
+        ceiling = min(self.max_delay, self.base_delay * self.multiplier ** (self._consecutive_failures - 1))
+        return random.uniform(0, ceiling)
+
+    def wait(self) -> None:
+        """
+        Sleep before the next attempt and record the delay on the last attempt.
+        Nothing is done when no attempt is left.
+        """
+        if not self.has_next_attempt():
+            return
+        delay = self.compute_delay()
+        if self.records:
+            self.records[-1].delay = delay
+        logger.info(f'Waiting {delay:.2f}s before next attempt')
+        time.sleep(delay)
+
+    def summary(self) -> dict:
+        """
+        Summarize the recorded attempts.
+
+        Returns
+        -------
+        dict
+            The number of attempts for each outcome
+        """
+        return dict(Counter(record.outcome.value for record in self.records))
@@ -0,0 +1,138 @@
+import time
+import logging
+import threading
+from loguru import logger
+from contextlib import contextmanager
+
+
+# Span fields totaled per stage in the summary
+SUMMED_FIELDS = ('attempts', 'cards', 'bytes', 'blocked_requests')
+
+
+class Timings:
+    def __init__(self) -> None:
+        """
+        Registry of the timing spans of a run.
+
+        A span measures a stage of the run (Chrome startup, page load, parsing, Postgres, GCS...)
+        with a millisecond resolution. Spans with the same name are aggregated, so that a stage
+        repeated by retries reports its total duration and its number of attempts.
+        Spans can be recorded from several threads.
+        """
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.spans = []
+
+    @contextmanager
+    def span(self, name: str, **fields):
+        """
+        Measure the duration of a stage. Can also be used as a decorator.
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage, e.g. 'webpage.page_load'
+        **fields
+            Additional fields recorded with the span
+
+        Yields
+        ------
+        fields: dict
+            The fields of the span, that can be completed while the stage runs (e.g. attempts)
+        """
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            yield fields
+            status = 'ok'
+        finally:
+            self._append(name, start, time.perf_counter(), status, fields)
+
+    def record(self, name: str, start: float, **fields) -> None:
+        """
+        Record a stage that started before it could be measured with a span, e.g. the process startup.
+
+        Parameters
+        ----------
+        name: str
+            The name of the stage, e.g. 'main.startup'
+        start: float
+            The time.perf_counter() value when the stage started, the stage ends now
+        **fields
+            Additional fields recorded with the span
+        """
+        self._append(name, start, time.perf_counter(), 'ok', fields)
+
+    def _append(self, name: str, start: float, end: float, status: str, fields: dict) -> None:
+        record = {
+            'name': name,
+            'start_ms': round((start - self._origin) * 1000, 3),
+            'duration_ms': round((end - start) * 1000, 3),
+            'status': status,
+            **fields
+        }
+        with self._lock:
+            self.spans.append(record)
+
+    def summary(self) -> dict:
+        """
+        Aggregate the spans per stage.
+
+        Returns
+        -------
+        dict
+            For each stage, its total duration in milliseconds, its number of spans,
+            its number of failed spans and the totals of the summed fields when recorded
+        """
+        summary = {}
+        with self._lock:
+            spans = list(self.spans)
+        for record in spans:
+            stage = summary.setdefault(record['name'], {'duration_ms': 0.0, 'count': 0, 'errors': 0})
+            stage['duration_ms'] = round(stage['duration_ms'] + record['duration_ms'], 3)
+            stage['count'] += 1
+            stage['errors'] += record['status'] != 'ok'
+            for field in SUMMED_FIELDS:
+                if field in record:
+                    stage[field] = stage.get(field, 0) + record[field]
+        return summary
+
+    def log(self) -> None:
+        """
+        Log the stages summary, with structured fields for Cloud Logging.
+        """
+        summary = self.summary()
+        for name, stage in sorted(summary.items(), key=lambda item: -item[1]['duration_ms']):
+            logger.info(f"Stage {name}: {stage['duration_ms']:.1f} ms over {stage['count']} span(s)")
+        logging.getLogger(__name__).info('Run stage timings', extra={'json_fields': {'stage_timings': summary}})
+
+    def reset(self) -> None:
+        """
+        Forget the recorded spans, e.g. before handling a new job in the same process.
+        """
+        with self._lock:
+            self._origin = time.perf_counter()
+            self.spans.clear()
+
+
+# Timings of the current run
+timings = Timings()
+
+
+def span(name: str, **fields):
+    """
+    Measure the duration of a stage of the current run. Can also be used as a decorator.
+
+    Parameters
+    ----------
+    name: str
+        The name of the stage, e.g. 'webpage.page_load'
+    **fields
+        Additional fields recorded with the span
+
+    Returns
+    -------
+    contextmanager
+        The span context manager, yielding its fields
+    """
+    return timings.span(name, **fields)
@@ -1,95 +1,164 @@
 from loguru import logger
-from bs4 import BeautifulSoup
+from .html_parsers import get_parser_backend, SoupParser
+from .job_matcher import JobMatcher
+from .job_card import JobCard
+from .timing import span
 
 class UrlsScraper:
     def __init__(
         self, 
-        webpage: str, 
-        job_to_scrap: str
+        webpage, 
+        job_to_scrap: str,
+        parser_backend: str = 'auto',
+        job_synonyms: dict = None
     ) -> None:
         """
-        Generate a soup from a Selenium webpage then scrap job informations
+        Parse the results list of a webpage then scrap job informations
         
         Parameters
         ----------
         webpage: str
-            The webpage from Selenium webdriver
+            The webpage from the fetch backend. 
+            With the 'stream' parser backend, it can also be bytes, a file-like object or an iterable of chunks
         job_to_scrap: str
             The job name that will be scraped
+        parser_backend: str [optional]
+            The parser backend name ('auto', 'lxml', 'selectolax', 'bs4' or 'stream'), default to 'auto'
+        job_synonyms: dict [optional]
+            The synonyms of the job names, e.g. {"data engineer": ["ingénieur data"]}
 
         Returns
         -------
         None
         """
-        self.soup = BeautifulSoup(webpage, "html.parser")
-        self.formatted_jobs_list = []
+        self.webpage = webpage
+        self.parser = get_parser_backend(parser_backend)
+        self.job_cards = []
         self.job_to_scrap = job_to_scrap
+        self.job_synonyms = job_synonyms or {}
         self.urls_list = []
 
-    def _generate_jobs_list(self) -> list:
+    def _iter_jobs(self):
         """
-        Generate a job list from the soup generated at class init
+        Lazily iterate over the job cards of the results list of the webpage.
+        Falls back to BeautifulSoup if the parser backend fails before yielding any card
+        and the webpage has not been consumed (string webpage).
 
-        Returns
-        -------
-        jobs_list: list
-            A list containing each job on the webpage soup
+        Yields
+        ------
+        raw_card: dict
+            A raw job card of the webpage
         """
+        cards_count = 0
         try:
-            jobs_list = self.soup.find(
-                'ul', 
-                {'class': 'jobs-search__results-list'}
-            ).find_all('li')
-            return jobs_list
+            for raw_card in self.parser.iter_cards(self.webpage):
+                cards_count += 1
+                yield raw_card
+            return
+        except Exception as e:
+            if cards_count or not isinstance(self.webpage, str):
+                logger.error(f'Error while generating jobs list : {e}')
+                return
+            logger.warning(f'Error while parsing with {self.parser.name}, falling back to bs4 : {e}')
+        try:
+            yield from SoupParser().iter_cards(self.webpage)
         except Exception as e:
             logger.error(f'Error while generating jobs list : {e}')
-            return []
 
-        
-    def _get_lower_job_name(self, job_html_element) -> str:
+
+    def _generate_job_card(self, raw_card: dict) -> JobCard:
         """
-        Get the specific html element with the required informations.
+        Generate a job card from a raw card of the parser backend.
 
         Parameters
         ----------
-        job_html_element: str
-            The html element to get information from
+        raw_card: dict
+            The raw card to get information from
 
         Returns
         -------
-        element: str
-            The lower job name from html element
+        job_card: JobCard
+            The job card, None if it could not be generated
         """
         try:
-            element = job_html_element.find(
-                'h3', 
-                {'class': 'base-search-card__title'}
-            ).text.lower().strip()
-            return element
+            return JobCard.from_raw(raw_card)
         except Exception as e: 
-            logger.error(f'Error while getting lower job name : {e}')
-            return 'Not found'
-    
-    def _get_link(self, job_html_element) -> str:
-        """
-        Get the link to access the job html web page.
+            logger.error(f'Error while generating job card : {e}')
+            return None
 
+    def generate_cards_by_job(self, jobs_to_scrap: list) -> dict:
+        """
+        Generate, in a single pass over the webpage, the job cards to scrape for each job name.
+        Job urls are canonicalized to their job id and duplicated job offers are skipped.
+        A job offer is added to each job name it matches, once its title is normalized 
+        (accents, gender and plural marks) and compared with the job names and their synonyms.
+        
         Parameters
         ----------
-        job_html_element: str
-            tTe html element to get information from
+        jobs_to_scrap: list
+            The job names the scraped jobs are classified for
 
         Returns
         -------
-        link: str
-            The link from html element.
+        cards_by_job: dict
+            A dict containing, for each job name, the list of matched JobCard
         """
+        self.job_cards = []
+        seen_job_ids = set()
+        cards_by_job = {job_to_scrap: [] for job_to_scrap in jobs_to_scrap}
+        matcher = JobMatcher.from_job_names(jobs_to_scrap, synonyms=self.job_synonyms)
         try:
-            link = job_html_element.find('a', href=True)['href']
-            return link
+            with span('scraper.parse_and_match', parser=self.parser.name) as parse_span:
+                for raw_card in self._iter_jobs():
+                    job_card = self._generate_job_card(raw_card)
+                    if job_card is None:
+                        continue
+                    # The same job offer can be displayed several times in the results list
+                    if job_card.job_id is not None:
+                        if job_card.job_id in seen_job_ids:
+                            continue
+                        seen_job_ids.add(job_card.job_id)
+                    self.job_cards.append(job_card)
+                    if not job_card.title:
+                        logger.error('Error while getting lower job name : no title in job card')
+                        continue
+
+                    job_card.matched_jobs = tuple(sorted(matcher.match(job_card.title)))
+                    if not job_card.matched_jobs:
+                        logger.warning(f"{job_card.title} won't be scraped because it DOES NOT match : {', '.join(jobs_to_scrap)}.")
+                    elif job_card.url is None:
+                        logger.error(f'Error while getting link : no link in {job_card.title} job card')
+                    else:
+                        # Adding scraped data to the cards list of each matched job
+                        # The job will be added only if it matches job search
+                        logger.success(f"{job_card.title} will be scraped because it DOES match: {', '.join(job_card.matched_jobs)}.")
+                        for job_to_scrap in job_card.matched_jobs:
+                            cards_by_job[job_to_scrap].append(job_card)
+                parse_span['cards'] = len(self.job_cards)
+            return cards_by_job
         except Exception as e:
-            logger.error(f'Error while getting link : {e}')
-            return 'Not found'
+            logger.error(f'Error while scraping : {e}')
+            return cards_by_job
+
+    def generate_urls_by_job(self, jobs_to_scrap: list) -> dict:
+        """
+        Generate, in a single pass over the webpage, the job urls to scrape for each job name.
+        
+        Parameters
+        ----------
+        jobs_to_scrap: list
+            The job names the scraped jobs are classified for
+
+        Returns
+        -------
+        urls_by_job: dict
+            A dict containing, for each job name, the list of links related to jobs scrapped
+        """
+        cards_by_job = self.generate_cards_by_job(jobs_to_scrap)
+        return {
+            job_to_scrap: [job_card.url for job_card in job_cards]
+            for job_to_scrap, job_cards in cards_by_job.items()
+        }
 
     def generate_urls_list(self) -> list:
         """
@@ -100,31 +169,27 @@ class UrlsScraper:
         urls_list: list
             A list containing each link related to jobs scrapped
         """
-        try:
-            self.jobs_list = self._generate_jobs_list()
-            for job in self.jobs_list:
-                lower_job_name = self._get_lower_job_name(job)
-                self.formatted_jobs_list.append(lower_job_name)
-                if self.job_to_scrap in lower_job_name:
-                    # Adding scraped data to the url list
-                    # The job will be added only if it matches job search
-                    logger.success(f"{lower_job_name} will be scraped because it DOES match: {self.job_to_scrap}.")        
-                    self.link = self._get_link(job)
-                    self.urls_list.append(self.link)
-                else:
-                    logger.warning(f"{lower_job_name} won't be scraped because it DOES NOT match : {self.job_to_scrap}.")
-            return self.urls_list
-        except Exception as e:
-            logger.error(f'Error while scraping : {e}')
-            return self.urls_list   
-    
-    def get_jobs_list(self):
+        self.urls_list = self.generate_urls_by_job([self.job_to_scrap])[self.job_to_scrap]
+        return self.urls_list
+
+    def get_job_cards(self) -> list:
+        """
+        Get every job card generated from the webpage
+
+        Returns
+        -------
+        job_cards: list
+            A list containing each JobCard of the webpage
+        """
+        return self.job_cards
+
+    def get_jobs_list(self) -> list:
         """
-        Get the jobs list generated from the soup
+        Get the jobs list generated from the webpage
 
         Returns
         -------
         jobs_list: list
-            A list containing each job on the webpage soup
+            A list containing each lower job name of the webpage
         """
-        return self.formatted_jobs_list 
\ No newline at end of file
+        return [job_card.title for job_card in self.job_cards if job_card.title]
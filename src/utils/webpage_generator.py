@@ -1,108 +1,343 @@
 import time
-import random
 from loguru import logger
-from selenium import webdriver
-from fake_useragent import UserAgent
-from selenium.webdriver.common.by import By
+from dataclasses import dataclass, asdict
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import TimeoutException, WebDriverException
-
-
-PAGE_LOAD_TIMEOUT = 30  # seconds
-SCRIPT_TIMEOUT = 30     # seconds
-
-
-class WebpageGenerator():
-    def __init__(self, headless=True):
+from .fetch_backends import FetchBackend, RESULTS_LIST_TEMPLATE
+from .retry_policy import RetryPolicy, RetryAction, Outcome
+from .fingerprints import FingerprintPool
+from .browser_manager import BrowserManager
+from .timing import span
+
+
+HARVEST_STEP_TIMEOUT = 5  # seconds waited for new cards after each scroll
+READY_TIMEOUT = 10      # seconds waited for the results list after the page load
+MAX_CARDS = 1000
+
+
+@dataclass(frozen=True)
+class BlockRules:
+    """
+    dataclass containing the rules used to detect a blocked webpage.
+    """
+    results_selector: str = 'ul.jobs-search__results-list'
+    authwall_selector: str = '[class^="authwall"]'
+    error_code_selector: str = '.error-code'
+    # The welcome wall, in each language of the fingerprint pool (fingerprints.LANGUAGES)
+    blocked_texts: tuple = (
+        'Bienvenue dans votre communauté professionnelle',
+        'Welcome to your professional community',
+    )
+
+
+# Return the page state in a single round-trip, waiting for the results list
+# or a block with a MutationObserver instead of a fixed sleep.
+PAGE_STATE_SCRIPT = """
+const [rules, timeoutMs, done] = arguments;
+
+function probe() {
+    const body = document.body;
+    const list = document.querySelector(rules.results_selector);
+    const errorCode = document.querySelector(rules.error_code_selector);
+    const text = body && !list ? body.textContent : '';
+    return {
+        empty: !body || body.childElementCount === 0,
+        ready: list !== null,
+        authwall: document.querySelector(rules.authwall_selector) !== null,
+        blocked_text: rules.blocked_texts.find(blockedText => text.includes(blockedText)) || null,
+        error_code: errorCode ? errorCode.textContent.trim() || 'unknown' : null,
+        result_count: list ? list.querySelectorAll(':scope > li').length : 0
+    };
+}
+
+function isSettled(state) {
+    return state.authwall || state.blocked_text !== null || state.error_code !== null
+        || (state.ready && state.result_count > 0);
+}
+
+const state = probe();
+if (isSettled(state)) {
+    done(state);
+    return;
+}
+
+const observer = new MutationObserver(() => {
+    const state = probe();
+    if (isSettled(state)) {
+        observer.disconnect();
+        clearTimeout(timer);
+        done(state);
+    }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true});
+const timer = setTimeout(() => {
+    observer.disconnect();
+    done(probe());
+}, timeoutMs);
+"""
+
+# Return the outer html of the cards loaded after the n first ones
+NEW_CARDS_SCRIPT = """
+return Array.from(
+    document.querySelectorAll('ul.jobs-search__results-list > li')
+).slice(arguments[0]).map(card => card.outerHTML);
+"""
+
+# Scroll to the bottom of the page, then click "see more jobs" if the button is displayed
+SCROLL_SCRIPT = """
+window.scrollTo(0, document.body.scrollHeight);
+const button = document.querySelector('button.infinite-scroller__show-more-button');
+if (button && button.offsetParent !== null && !button.disabled) {
+    button.click();
+    return true;
+}
+return false;
+"""
+
+CARDS_COUNT_SCRIPT = "return document.querySelectorAll('ul.jobs-search__results-list > li').length;"
+
+
+class WebpageGenerator(FetchBackend):
+    def __init__(
+        self,
+        headless=True,
+        block_rules: BlockRules = None,
+        store=None,
+        bucket_name: str = None,
+        browser_manager: BrowserManager = None
+    ):
         """
         Class to generate a Selenium webpage avoiding http errors and empty pages.
+
+        Parameters
+        ----------
+        headless: bool [optional]
+            run Chrome headless, default to True
+        block_rules: BlockRules [optional]
+            the rules used to detect a blocked webpage, default to BlockRules()
+        store: ObjectStore [optional]
+            the object store persisting the fingerprint pool between runs, default to none (not persisted)
+        bucket_name: str [optional]
+            the bucket name of the fingerprint pool
+        browser_manager: BrowserManager [optional]
+            the manager of the Chrome browser, possibly prewarmed, default to a new BrowserManager
         """
         self.headless = headless
+        self.block_rules = block_rules or BlockRules()
+        self.store = store
+        self.bucket_name = bucket_name
+        self.browser_manager = browser_manager or BrowserManager(headless=headless)
+        self.fingerprint_pool = None
+        self.fingerprint = None
+        self.retry_policy = None
         self.driver = None
 
+    def _get_fingerprint_pool(self) -> FingerprintPool:
+        """
+        Get the fingerprint pool, loaded once per run.
+        """
+        if self.fingerprint_pool is None:
+            if self.store is not None:
+                self.fingerprint_pool = FingerprintPool.load(store=self.store, bucket_name=self.bucket_name)
+            else:
+                self.fingerprint_pool = FingerprintPool.build()
+        return self.fingerprint_pool
+
     def _initialize_driver(self) -> None:
         """
-        Initialize the Selenium webdriver with options
-        """
-
-        # Generate a random user agent
-        user_agent = UserAgent().random
-
-        window_sizes = [
-            "1920,1080",  # Full HD
-            "2560,1440",  # QHD (2K)
-            "3840,2160",  # 4K UHD
-            "1366,768",   # HD
-            "1440,900",   # WXGA+
-            "1600,900",   # HD+
-            "1280,720",   # HD
-            "1680,1050",  # WSXGA+
-            "1024,768",   # XGA
-            "800,600",    # SVGA
-            "2560,1600",  # WQXGA
-            "3200,1800",  # QHD+
-            "1360,768",   # WXGA
-        ]
-
-        # Selenium options
-        options = webdriver.ChromeOptions()
-        options.add_argument(f'user-agent={user_agent}')
-        options.add_argument(f"--window-size={random.choice(window_sizes)}")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument('--ignore-certificate-errors')
-        options.add_argument('--ignore-ssl-errors')
-        options.add_argument('--incognito')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--lang=fr-FR')
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-features=MediaSessionService')
-        options.add_argument('--disable-features=VizDisplayCompositor')
-        options.add_argument('--headless' if self.headless else "")
+        Get the Selenium webdriver from the browser manager, with a fingerprint chosen from the pool
+        """
+        self.fingerprint = self._get_fingerprint_pool().choose()
+        logger.info(f'Using fingerprint {self.fingerprint.key}')
+        self.driver = self.browser_manager.acquire(self.fingerprint)
 
-        try:
-            self.driver = webdriver.Chrome(options=options)
-            self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
-            self.driver.set_script_timeout(SCRIPT_TIMEOUT)
-        except Exception as e:
-            logger.error(f'Error while initializing Selenium webdriver : {e}')
-            raise e
+    def _recover_driver(self, url: str) -> None:
+        """
+        Recover the webdriver after a failed attempt, with a new fingerprint chosen from the pool.
+        Chrome is recycled in a fresh tab, and only restarted after repeated hard failures.
+        """
+        self.fingerprint = self._get_fingerprint_pool().choose()
+        logger.info(f'Using fingerprint {self.fingerprint.key}')
+        self.driver = self.browser_manager.recover(self.fingerprint, url=url)
 
     def _quit_driver(self) -> None:
         """
         Safely quit the webdriver.
         """
-        if self.driver:
-            try:
-                self.driver.quit()
-            except Exception:
-                pass
-            finally:
-                self.driver = None
+        self.browser_manager.quit()
+        self.driver = None
 
-    def scroll_down(self, scrolls=3) -> None:
+    def close(self) -> None:
+        """
+        Quit the webdriver once the webpage is generated, and persist the outcomes of the fingerprints.
         """
-        Scroll down the web page.
+        self._quit_driver()
+        if self.fingerprint_pool is not None and self.store is not None:
+            self.fingerprint_pool.save(store=self.store, bucket_name=self.bucket_name)
 
-        Parameters
-        ----------
-        scrolls: int [optional]
-            the number of times you want the page scrolled, default is 3
+    def _get_page_state(self) -> dict:
+        """
+        Get the state of the loaded webpage with a single injected script.
+        The script waits for the results list or a block, up to READY_TIMEOUT.
 
         Returns
         -------
-            None
+        page_state: dict
+            The page state: empty, ready, authwall, blocked_text, error_code and result_count
+        """
+        rules = asdict(self.block_rules)
+        rules['blocked_texts'] = list(rules['blocked_texts'])
+        return self.driver.execute_async_script(PAGE_STATE_SCRIPT, rules, READY_TIMEOUT * 1000)
+
+    def harvest_cards(
+        self,
+        max_cards: int = MAX_CARDS,
+        patience: int = 2
+    ):
         """
+        Scroll down the web page and yield the job cards as soon as they are loaded.
+        
+        Each step extracts only the cards added since the previous step, then scrolls
+        (clicking "see more jobs" when needed) and waits for new cards to be loaded.
+        The harvest stops when the cards count stops growing or the card budget is reached.
+
+        Parameters
+        ----------
+        max_cards: int [optional]
+            the card budget, default to 1000
+        patience: int [optional]
+            the number of steps without new cards before stopping, default to 2
+
+        Yields
+        ------
+        card: str
+            the html code of a job card
+        """
+        harvested = 0
+        stalled_steps = 0
         try:
-            main_scroll = self.driver.find_element(By.XPATH, '/html')
-            for _ in range(scrolls):
-                self.driver.execute_script(
-                    "arguments[0].scrollTop = arguments[0].scrollHeight", main_scroll
-                )
-                time.sleep(2)
+            while harvested < max_cards:
+                new_cards = self.driver.execute_script(NEW_CARDS_SCRIPT, harvested)[:max_cards - harvested]
+                for card in new_cards:
+                    yield card
+                harvested += len(new_cards)
+                if harvested >= max_cards:
+                    logger.info(f'Card budget of {max_cards} reached')
+                    break
+
+                self.driver.execute_script(SCROLL_SCRIPT)
+                try:
+                    WebDriverWait(self.driver, HARVEST_STEP_TIMEOUT, poll_frequency=0.2).until(
+                        lambda driver: driver.execute_script(CARDS_COUNT_SCRIPT) > harvested
+                    )
+                    stalled_steps = 0
+                except TimeoutException:
+                    stalled_steps += 1
+                    if stalled_steps >= patience:
+                        logger.info(f'No more cards loaded, {harvested} cards harvested')
+                        break
         except Exception as e:
-            logger.error(f'Error while scrolling down : {e}')
+            logger.error(f'Error while harvesting cards : {e}')
             raise e
 
+    def _attempt_webpage(self, url) -> Outcome:
+        """
+        Try once to load a Selenium webpage in the driver.
+
+        Parameters
+        ----------
+        url: str
+            the url that will be converted as web page
+
+        Returns
+        -------
+        outcome: Outcome
+            the outcome of the attempt
+        """
+        try:
+            self.driver.get(url)
+            page_state = self._get_page_state()
+        except TimeoutException:
+            logger.warning('Page load timed out')
+            return Outcome.TIMEOUT
+        except WebDriverException as e:
+            logger.warning(f'WebDriverException: {e}')
+            return Outcome.DRIVER_ERROR
+
+        if page_state['empty']:
+            logger.warning('Empty webpage')
+            return Outcome.EMPTY
+        if page_state['authwall']:
+            logger.warning('Authwall detected')
+            return Outcome.AUTHWALL
+        if page_state['blocked_text']:
+            logger.warning('Blocked message detected')
+            return Outcome.BLOCKED
+        if page_state['error_code']:
+            logger.warning(f"Error code {page_state['error_code']} detected")
+            return Outcome.ERROR_CODE
+
+        if not page_state['ready']:
+            logger.warning('Results list not found in the webpage')
+            return Outcome.NOT_READY
+        logger.success(f"Webpage successfully generated with {page_state['result_count']} results")
+        return Outcome.SUCCESS
+
+    def _load_webpage(self, url, max_attempts=50) -> None:
+        """
+        Load a Selenium webpage in the driver avoiding http errors and empty pages.
+        Failed attempts are retried according to a RetryPolicy, which backs off between
+        attempts, rotates the driver on blocks and gives up early on block storms.
+
+        Parameters
+        ----------
+        url: str
+            the url that will be converted as web page
+        max_attempts: int [optional]
+            max attempts to generate webpage, default to 50
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        CircuitOpenError
+            If the block rate is too high to keep retrying
+        RuntimeError
+            If the webpage could not be generated after max_attempts
+        """
+        self.retry_policy = RetryPolicy(max_attempts=max_attempts)
+        with span('webpage.load') as load_span:
+            while self.retry_policy.can_retry():
+                logger.info(f'Generating webpage, attempt {self.retry_policy.attempts + 1}')
+
+                attempt_start = time.monotonic()
+                with span('webpage.page_load', fingerprint=self.fingerprint.key) as attempt_span:
+                    outcome = self._attempt_webpage(url)
+                    attempt_span['outcome'] = outcome.value
+                self.retry_policy.record(outcome, duration=time.monotonic() - attempt_start)
+                self.fingerprint_pool.record(self.fingerprint, outcome)
+                load_span['attempts'] = self.retry_policy.attempts
+
+                if outcome is Outcome.SUCCESS:
+                    self.browser_manager.record_attempt()
+                    return
+
+                action = self.retry_policy.action_for(outcome)
+                self.browser_manager.record_attempt(hard_failure=action is RetryAction.RESTART)
+                # The driver is not recovered when no attempt is left
+                if action is not RetryAction.RETRY and self.retry_policy.has_next_attempt():
+                    logger.warning(f'Recovering driver ({action.value}) after {outcome.value}...')
+                    self._recover_driver(url)
+                with span('webpage.backoff'):
+                    self.retry_policy.wait()
+
+        # (évite un retour silencieux qui ferait crasher harvest_cards ensuite)
+        raise RuntimeError(
+            f"Failed to generate webpage after {max_attempts} attempts ({self.retry_policy.summary()}): {url}"
+        )
+
     def generate_webpage(self, url, max_attempts=50) -> str:
         """
         Generate a Selenium webpage avoiding http errors and empty pages.
@@ -119,94 +354,58 @@ class WebpageGenerator():
         webpage: str
             the webpage code as string
         """
-        attempts = 0
-        while attempts < max_attempts:
-            attempts += 1
-            logger.info(f'Generating webpage, attempt {attempts}')
-
-            try:
-                self.driver.get(url)
-            except TimeoutException:
-                logger.warning(
-                    f"Page load timed out on attempt {attempts}, reinitializing driver..."
-                )
-                self._quit_driver()
-                self._initialize_driver()
-                continue
-            except WebDriverException as e:
-                logger.warning(f"WebDriverException on attempt {attempts}: {e}. Retrying...")
-                self._quit_driver()
-                self._initialize_driver()
-                continue
-
-            time.sleep(1)
-
-            body_elements = self.driver.find_elements(By.TAG_NAME, "body")
-
-            if body_elements:
-                logger.info('Webpage is not empty, checking for authwalls...')
-
-                authwall_elements = self.driver.find_elements(By.XPATH, "//*[starts-with(@class, 'authwall')]")
-                specific_text_elements = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Bienvenue dans votre communauté professionnelle')]")
-                error_codes = self.driver.find_elements(By.CLASS_NAME, "error-code")
-
-                if authwall_elements or specific_text_elements or error_codes:
-                    reasons = []
-                    if authwall_elements:
-                        reasons.append("authwall detected")
-                    if specific_text_elements:
-                        reasons.append("blocked message detected")
-                    if error_codes:
-                        reasons.append("error code detected")
-
-                    logger.warning(
-                        f"Unable to generate webpage on attempt {attempts} due to: {', '.join(reasons)}. Retrying..."
-                    )
-                    continue
-
-                else:
-                    webpage = self.driver.page_source
-                    logger.success('Webpage successfully generated')
-                    return webpage
-
-        # (évite un retour None silencieux qui ferait crasher scroll_down ensuite)
-        raise RuntimeError(
-            f"Failed to generate webpage after {max_attempts} attempts: {url}"
-        )
+        self._load_webpage(url, max_attempts)
+        return self.driver.page_source
 
     def start(
         self,
         url: str,
-        scrolls: int = 3,
+        max_cards: int = MAX_CARDS,
         max_attempts: int = 50
     ):
         """
-        Start the whole process, including initialization and webpage generation.
+        Start the whole process, including initialization, webpage generation and cards harvest.
 
         Parameters
         ----------
         url: str
             URL to scrape
-        scrolls: int [optional]
-            scroll down the page n times
+        max_cards: int [optional]
+            the card budget, default to 1000
         max_attempts: int [optional]
             max attempts to generate webpage, default to 50
 
         Returns
         -------
         webpage: str
-            html code of the webpage
+            html code of the results list containing every harvested card
         """
         try:
             if not self.driver:
                 self._initialize_driver()
 
-            webpage = self.generate_webpage(url, max_attempts)
+            self._load_webpage(url, max_attempts)
 
-            self.scroll_down(scrolls)
+            with span('webpage.harvest') as harvest_span:
+                cards = list(self.harvest_cards(max_cards))
+                harvest_span['cards'] = len(cards)
 
-            return webpage
+            if self.browser_manager.network_logging:
+                with span('webpage.network') as network_span:
+                    network = self.browser_manager.network_report()
+                    network_span.update(
+                        bytes=network['bytes'],
+                        blocked_requests=network['blocked_requests'],
+                        bytes_saved_estimate=network['bytes_saved_estimate']
+                    )
+                logger.info(
+                    f"{network['bytes'] / 1024:.0f} KB transferred in {network['requests']} requests, "
+                    f"{network['blocked_requests']} requests blocked {network['blocked_by_category']}, "
+                    f"~{network['bytes_saved_estimate'] / 1024:.0f} KB saved"
+                )
+
+            return RESULTS_LIST_TEMPLATE.format(cards=''.join(cards))
 
         except Exception as e:
             logger.error(f"Error during the scraping process: {e}")
-            raise e
\ No newline at end of file
+            raise e
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from utils.browser_manager import RESOURCE_SIZES, BrowserManager
+from utils.fingerprints import Fingerprint
+
+
+FINGERPRINT = Fingerprint(user_agent='Mozilla/5.0 Chrome/130.0.0.0', window_size='1920,1080', language='fr-FR')
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    manager = BrowserManager(max_hard_failures=3)
+    manager.driver = object()
+    monkeypatch.setattr(manager, '_recycle', lambda fingerprint, url: None)
+    monkeypatch.setattr(manager, 'quit', lambda: setattr(manager, 'driver', None))
+    monkeypatch.setattr(manager, 'acquire', lambda fingerprint: manager.driver)
+    return manager
+
+
+def test_consecutive_hard_failures_restart_chrome(manager):
+    for _ in range(3):
+        manager.record_attempt(hard_failure=True)
+        manager.recover(FINGERPRINT)
+
+    assert manager.restarts == 1
+    assert manager.hard_failures == 0
+
+
+@pytest.mark.parametrize('hard_failures', [[True, True, False, True], [True, False, True, True]])
+def test_other_outcomes_reset_the_hard_failures(manager, hard_failures):
+    # e.g. driver errors interleaved with an authwall rotation or a timeout
+    for hard_failure in hard_failures:
+        manager.record_attempt(hard_failure=hard_failure)
+        manager.recover(FINGERPRINT)
+
+    assert manager.restarts == 0
+    assert manager.hard_failures == hard_failures[::-1].index(False)
+
+
+class FakeDriver:
+    def __init__(self, events):
+        self.entries = [{'message': json.dumps({'message': {'method': method, 'params': params}})} for method, params in events]
+
+    def get_log(self, log_type):
+        entries, self.entries = self.entries, []
+        return entries
+
+
+def request(request_id, url):
+    return 'Network.requestWillBeSent', {'requestId': request_id, 'request': {'url': url}}
+
+
+def loaded(request_id, size):
+    return 'Network.loadingFinished', {'requestId': request_id, 'encodedDataLength': size}
+
+
+def blocked(request_id):
+    return 'Network.loadingFailed', {'requestId': request_id, 'blockedReason': 'inspector'}
+
+
+def test_network_report_estimates_the_bytes_saved():
+    manager = BrowserManager(blocked_resources=('images', 'fonts'), network_logging=True)
+    manager.driver = FakeDriver([
+        request('1', 'https://fr.linkedin.com/jobs/search/'), loaded('1', 50_000),
+        request('2', 'https://static.licdn.com/sc/h/app.css'), loaded('2', 40_000),
+        request('3', 'https://static.licdn.com/sc/h/font.woff2'), loaded('3', 20_000),
+        request('4', 'https://media.licdn.com/dms/image/logo.png'), blocked('4'),
+        request('5', 'https://static.licdn.com/sc/h/icons.woff2'), blocked('5'),
+    ])
+    report = manager.network_report()
+
+    assert report['requests'] == 3
+    assert report['bytes'] == 110_000
+    assert report['loaded_by_category']['stylesheets'] == {'requests': 1, 'bytes': 40_000}
+    assert report['blocked_by_category'] == {'images': 1, 'fonts': 1}
+    # The font loaded before blocking gives its category average, images have none and use the reference size
+    assert report['bytes_saved_estimate'] == 20_000 + RESOURCE_SIZES['images']
+
+
+def test_network_logging_is_opt_in():
+    manager = BrowserManager()
+    manager.driver = FakeDriver([request('1', 'https://fr.linkedin.com/jobs/search/'), loaded('1', 50_000)])
+
+    assert 'goog:loggingPrefs' not in manager._build_options().to_capabilities()
+    assert manager.network_report()['requests'] == 0
+    assert manager.driver.entries
@@ -0,0 +1,76 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from utils.config_loader import Config
+from utils.datastats_utils import DataStats
+from utils.job_card import JobCard
+from utils.object_store import MemoryObjectStore
+
+
+BUCKET_NAME = 'utils'
+CONFIG = Config(
+    JOB_TO_SCRAP='data engineer',
+    DATASTATS_BUCKET_URLS='urls',
+    DATASTATS_BUCKET_UTILS=BUCKET_NAME,
+    URL_TO_SCRAP='',
+    DB_NAME='',
+    DB_USER='',
+    DB_PORT='',
+    DB_HOST='',
+    DB_ROOT_CERT='',
+    DB_CERT='',
+    DB_KEY='',
+    DB_USER_PASSWORD='',
+    STORAGE_BACKEND='memory'
+)
+
+
+@pytest.fixture
+def store():
+    return MemoryObjectStore()
+
+
+def run_monthly_sink(store, run_date: datetime, run_id: str, titles: list) -> None:
+    datastats = DataStats(
+        script_execution_start_time=run_date,
+        scraped_jobs_list=[JobCard(title=title, normalized_title=title) for title in titles],
+        matched_jobs_lists={},
+        config=CONFIG,
+        run_id=run_id,
+        store=store
+    )
+    datastats._monthly_jobs_list_sink()
+
+
+def monthly_jobs_list(store, year_month: str) -> list:
+    blob_content = store.download_blob_as_bytes(bucket_name=BUCKET_NAME, source_blob_name=f'{year_month}_jobs_list.json')
+    return json.loads(blob_content)['jobs_list']
+
+
+def test_monthly_list_includes_each_run_as_soon_as_it_ends(store):
+    run_monthly_sink(store, datetime(2026, 10, 16, 8), 'run-1', ['data engineer', 'data analyst'])
+    assert monthly_jobs_list(store, '2026-10') == ['data engineer', 'data analyst']
+
+    run_monthly_sink(store, datetime(2026, 10, 17, 8), 'run-2', ['data scientist'])
+    assert monthly_jobs_list(store, '2026-10') == ['data engineer', 'data analyst', 'data scientist']
+    assert store.list_blobs(bucket_name=BUCKET_NAME, prefix='2026-10/') == []
+
+
+def test_shards_written_late_are_merged_into_their_month(store):
+    run_monthly_sink(store, datetime(2026, 9, 30, 8), 'run-1', ['data engineer'])
+    # A run of September still writing its shard when the previous run compacted the month
+    late_run = DataStats(
+        script_execution_start_time=datetime(2026, 9, 30, 23),
+        scraped_jobs_list=[],
+        matched_jobs_lists={},
+        config=CONFIG,
+        run_id='run-2',
+        store=store
+    )
+    late_run.add_scraped_jobs_to_monthly_shard(bucket_name=BUCKET_NAME, jobs_list=['data analyst'])
+
+    run_monthly_sink(store, datetime(2026, 10, 1, 8), 'run-3', ['data scientist'])
+    assert monthly_jobs_list(store, '2026-09') == ['data engineer', 'data analyst']
+    assert monthly_jobs_list(store, '2026-10') == ['data scientist']
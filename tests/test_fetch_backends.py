@@ -0,0 +1,173 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+import pytest
+
+from utils.fetch_backends import (
+    GUEST_PAGE_SIZE,
+    GUEST_SEARCH_PATH,
+    EmptyResultsError,
+    FallbackFetchBackend,
+    FetchBackend,
+    HttpFetchBackend,
+    get_fetch_backend,
+)
+from utils.fingerprints import FINGERPRINT_POOL_BLOB, Fingerprint, FingerprintPool
+from utils.object_store import MemoryObjectStore
+
+
+SEARCH_URL_PATH = '/jobs/search/?keywords=data%20engineer&location=France&f_TPR=r86400'
+
+
+def make_cards(first: int, count: int) -> str:
+    return ''.join(
+        f'<li><div class="base-card" data-entity-urn="urn:li:jobPosting:{first + index}"></div></li>'
+        for index in range(count)
+    )
+
+
+class StubGuestEndpoint(BaseHTTPRequestHandler):
+    """
+    Guest listing endpoint answering with the pages of `server.pages`, indexed by their `start`.
+    A page is either an html string or an HTTP status code.
+    """
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path != GUEST_SEARCH_PATH:
+            self.send_error(404)
+            return
+        start = int(parse_qs(parts.query)['start'][0])
+        self.server.requests.append(start)
+        self.server.user_agents.append(self.headers['User-Agent'])
+        page = self.server.pages.get(start, 400)
+        if isinstance(page, int):
+            self.send_response(page)
+            self.end_headers()
+            return
+        body = page.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeFallback(FetchBackend):
+    def __init__(self):
+        self.urls = []
+
+    def start(self, url: str) -> str:
+        self.urls.append(url)
+        return '<ul class="jobs-search__results-list"><li>fallback</li></ul>'
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubGuestEndpoint)
+    server.pages, server.requests, server.user_agents = {}, [], []
+    thread = threading.Thread(target=server.serve_forever, kwargs={'poll_interval': 0.05}, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def search_url(stub_server):
+    host, port = stub_server.server_address
+    return f'http://{host}:{port}{SEARCH_URL_PATH}'
+
+
+def fallback_backend() -> tuple:
+    fallback = FakeFallback()
+    backend = FallbackFetchBackend(primary=HttpFetchBackend(timeout=5), fallback_factory=lambda: fallback)
+    return backend, fallback
+
+
+def test_http_backend_merges_result_pages(stub_server, search_url):
+    stub_server.pages = {
+        0: make_cards(0, GUEST_PAGE_SIZE),
+        GUEST_PAGE_SIZE: make_cards(GUEST_PAGE_SIZE, 3),
+    }
+    backend = HttpFetchBackend(timeout=5)
+    webpage = backend.start(search_url)
+    backend.close()
+
+    assert webpage.startswith('<ul class="jobs-search__results-list">')
+    assert webpage.count('<li>') == GUEST_PAGE_SIZE + 3
+    # The last page is not full, so the next one is not requested
+    assert stub_server.requests == [0, GUEST_PAGE_SIZE]
+
+
+def test_http_backend_stops_on_exhausted_results(stub_server, search_url):
+    stub_server.pages = {0: make_cards(0, GUEST_PAGE_SIZE), GUEST_PAGE_SIZE: 400}
+    backend = HttpFetchBackend(timeout=5)
+    webpage = backend.start(search_url)
+    backend.close()
+
+    assert webpage.count('<li>') == GUEST_PAGE_SIZE
+
+
+@pytest.mark.parametrize('first_page', ['', '<html><body>No results</body></html>', 400])
+def test_http_backend_raises_on_empty_first_page(stub_server, search_url, first_page):
+    stub_server.pages = {0: first_page}
+    backend = HttpFetchBackend(timeout=5)
+    with pytest.raises(EmptyResultsError):
+        backend.start(search_url)
+    backend.close()
+
+
+@pytest.mark.parametrize('first_page', ['', 400, 429])
+def test_fallback_runs_when_first_page_fails(stub_server, search_url, first_page):
+    stub_server.pages = {0: first_page}
+    backend, fallback = fallback_backend()
+    webpage = backend.start(search_url)
+    backend.close()
+
+    assert 'fallback' in webpage
+    assert fallback.urls == [search_url]
+
+
+def test_fallback_not_created_on_success(stub_server, search_url):
+    stub_server.pages = {0: make_cards(0, 5)}
+    backend, fallback = fallback_backend()
+    webpage = backend.start(search_url)
+    backend.close()
+
+    assert webpage.count('<li>') == 5
+    assert backend.fallback is None
+    assert fallback.urls == []
+
+
+def test_http_backend_presents_a_browser_user_agent(stub_server, search_url):
+    stub_server.pages = {0: make_cards(0, 5)}
+    backend = HttpFetchBackend(timeout=5)
+    backend.start(search_url)
+    backend.close()
+
+    assert stub_server.user_agents[0].startswith('Mozilla/5.0')
+    assert 'python-requests' not in stub_server.user_agents[0]
+
+
+def test_http_backend_uses_a_fingerprint_of_the_pool(stub_server, search_url):
+    fingerprint = Fingerprint(user_agent='Mozilla/5.0 Chrome/131.0.0.0', window_size='1920,1080', language='fr-FR')
+    store = MemoryObjectStore()
+    store.upload_non_physical_file(
+        bucket_name='utils',
+        data=json.dumps(FingerprintPool([fingerprint]).to_dict()),
+        destination_blob_name=FINGERPRINT_POOL_BLOB,
+        content_type='application/json'
+    )
+    stub_server.pages = {0: make_cards(0, 5)}
+    backend = get_fetch_backend(name='http', store=store, bucket_name='utils')
+    backend.start(search_url)
+    backend.close()
+
+    assert stub_server.user_agents == [fingerprint.user_agent]
+    assert backend.primary.session.headers['Accept-Language'] == 'fr-FR,fr;q=0.9'
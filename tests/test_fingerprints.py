@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from utils.fingerprints import FINGERPRINT_POOL_BLOB, DECAY, Fingerprint, FingerprintPool
+from utils.object_store import MemoryObjectStore
+from utils.retry_policy import Outcome
+
+
+BUCKET_NAME = 'utils'
+FINGERPRINTS = [
+    Fingerprint(user_agent='Mozilla/5.0 Chrome/130.0.0.0', window_size='1920,1080', language='fr-FR'),
+    Fingerprint(user_agent='Mozilla/5.0 Chrome/131.0.0.0', window_size='1366,768', language='en-US'),
+]
+
+
+@pytest.fixture
+def store():
+    store = MemoryObjectStore()
+    pool = FingerprintPool(FINGERPRINTS, created_at='2026-10-01T00:00:00')
+    store.upload_non_physical_file(
+        bucket_name=BUCKET_NAME,
+        data=json.dumps(pool.to_dict()),
+        destination_blob_name=FINGERPRINT_POOL_BLOB,
+        content_type='application/json'
+    )
+    return store
+
+
+@pytest.fixture(autouse=True)
+def fresh_pools(monkeypatch):
+    monkeypatch.setattr(FingerprintPool, 'is_stale', lambda self: False)
+
+
+def stored_pool(store) -> dict:
+    return json.loads(store.download_blob_as_bytes(bucket_name=BUCKET_NAME, source_blob_name=FINGERPRINT_POOL_BLOB))
+
+
+def test_save_adds_the_outcomes_of_the_run(store):
+    pool = FingerprintPool.load(store, BUCKET_NAME)
+    pool.record(FINGERPRINTS[0], Outcome.SUCCESS)
+    pool.record(FINGERPRINTS[0], Outcome.AUTHWALL)
+    pool.save(store, BUCKET_NAME)
+
+    stats = stored_pool(store)['stats'][FINGERPRINTS[0].key]
+    assert stats == {'successes': 1.0, 'failures': 1.0}
+
+
+def test_concurrent_saves_keep_the_outcomes_of_both_runs(store):
+    first = FingerprintPool.load(store, BUCKET_NAME)
+    second = FingerprintPool.load(store, BUCKET_NAME)
+    first.record(FINGERPRINTS[0], Outcome.SUCCESS)
+    second.record(FINGERPRINTS[1], Outcome.BLOCKED)
+    first.save(store, BUCKET_NAME)
+    second.save(store, BUCKET_NAME)
+
+    stats = stored_pool(store)['stats']
+    assert stats[FINGERPRINTS[0].key]['successes'] == pytest.approx(1.0 * DECAY)
+    assert stats[FINGERPRINTS[1].key]['failures'] == pytest.approx(1.0)
+
+
+def test_save_does_not_overwrite_a_pool_created_concurrently(store, monkeypatch):
+    pool = FingerprintPool.load(store, BUCKET_NAME)
+    pool.record(FINGERPRINTS[0], Outcome.SUCCESS)
+    new_pool = FingerprintPool(FINGERPRINTS[1:], created_at='2026-10-17T00:00:00')
+    upload = store.upload_non_physical_file
+
+    def upload_after_another_run(**kwargs):
+        # Another run replaces the pool between the read and the write of this run
+        monkeypatch.setattr(store, 'upload_non_physical_file', upload)
+        upload(
+            bucket_name=BUCKET_NAME,
+            data=json.dumps(new_pool.to_dict()),
+            destination_blob_name=FINGERPRINT_POOL_BLOB,
+            content_type='application/json'
+        )
+        upload(**kwargs)
+
+    monkeypatch.setattr(store, 'upload_non_physical_file', upload_after_another_run)
+    pool.save(store, BUCKET_NAME)
+
+    stored = stored_pool(store)
+    assert stored['created_at'] == new_pool.created_at
+    assert list(stored['stats']) == [FINGERPRINTS[1].key]
@@ -0,0 +1,94 @@
+import pytest
+
+from utils.job_matcher import JobMatcher, normalize_title
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('Data Engineer (H/F)', 'data engineer'),
+    ('Data Engineer (F/H)', 'data engineer'),
+    ('Data Engineer (M/F)', 'data engineer'),
+    ('Data Engineer (M/W)', 'data engineer'),
+    ('Data Engineer (m/w/d)', 'data engineer'),
+    ('Data Engineer (H/F/NB)', 'data engineer'),
+    ('Data Engineer H/F', 'data engineer'),
+    ('(F/H) Data Engineer', 'data engineer'),
+])
+def test_normalize_title_strips_gender_markers(title, expected):
+    assert normalize_title(title) == expected
+
+
+@pytest.mark.parametrize('feminine, masculine', [
+    ('Ingénieure Data', 'Ingénieur Data'),
+    ('Ingénieur·e Data', 'Ingénieur Data'),
+    ('Technicienne Data', 'Technicien Data'),
+    ('Développeuse Python', 'Développeur Python'),
+    ('Directrice Technique', 'Directeur Technique'),
+    ('Consultante Data', 'Consultant Data'),
+    ('Chargée de données', 'Chargé de données'),
+    ('Ingénieures Data', 'Ingénieurs Data'),
+])
+def test_normalize_title_folds_feminine_forms(feminine, masculine):
+    assert normalize_title(feminine) == normalize_title(masculine)
+
+
+def test_normalize_title_strips_accents_and_plural_marks():
+    assert normalize_title('Ingénieurs Systèmes') == 'ingenieur systeme'
+
+
+@pytest.mark.parametrize('french, english', [
+    ('Data Analyste', 'Data Analyst'),
+    ('Data Scientiste', 'Data Scientist'),
+    ('Data Analystes', 'Data Analysts'),
+])
+def test_normalize_title_folds_french_forms(french, english):
+    assert normalize_title(french) == normalize_title(english)
+
+
+@pytest.fixture
+def matcher():
+    return JobMatcher.from_job_names(
+        ['data engineer', 'data analyst', 'ingénieur data'],
+        synonyms={'data engineer': ['ingénieur big data']}
+    )
+
+
+@pytest.mark.parametrize('title, expected', [
+    # "ingénieur data" is also a default synonym of "data engineer"
+    ('Ingénieure Data (F/H)', {'ingénieur data', 'data engineer'}),
+    ('Data Engineer (M/W)', {'data engineer'}),
+    ('Senior Data Analyst (M/F)', {'data analyst'}),
+    ('Ingénieure Big Data (H/F)', {'data engineer'}),
+    ('Product Manager', set()),
+])
+def test_matcher_matches_title_variants(matcher, title, expected):
+    assert matcher.match(title) == frozenset(expected)
+
+
+def test_matcher_cache_is_per_instance():
+    first = JobMatcher.from_job_names(['data engineer'])
+    second = JobMatcher.from_job_names(['data analyst'])
+
+    assert first.match('Data Engineer') == frozenset({'data engineer'})
+    assert second.match('Data Engineer') == frozenset()
+    assert first.match.cache_info().hits == 0
+    first.match('Data Engineer')
+    assert first.match.cache_info().hits == 1
+    assert second.match.cache_info().hits == 0
+
+
+@pytest.fixture
+def default_matcher():
+    return JobMatcher.from_job_names(['data engineer', 'data analyst', 'data scientist'])
+
+
+@pytest.mark.parametrize('title, expected', [
+    ('Data Analyste', {'data analyst'}),
+    ('Data Scientiste (H/F)', {'data scientist'}),
+    ('Senior Data Engineering Manager', {'data engineer'}),
+    ('Ingénieur·e Data', {'data engineer'}),
+    ('Analyste de données F/H', {'data analyst'}),
+    ('Database Administrator', set()),
+    ('Engineer Data', set()),
+])
+def test_default_matcher_matches_the_former_substring_matches(default_matcher, title, expected):
+    assert default_matcher.match(title) == frozenset(expected)
@@ -0,0 +1,49 @@
+import re
+
+import pytest
+
+from utils.pg_utils import COPY_NULL, _iter_copy_chunks
+
+
+COPY_FIELD = re.compile(r'(?:^|,)(?:"((?:[^"]|"")*)"|([^,"]*))')
+
+
+def read_copy_rows(chunks) -> list:
+    """
+    Read COPY csv rows like Postgres does: an unquoted NULL marker is NULL, any other field is a string.
+    """
+    rows = []
+    for line in ''.join(chunks).splitlines():
+        row = []
+        for field in COPY_FIELD.finditer(line):
+            if field.group(1) is not None:
+                row.append(field.group(1).replace('""', '"'))
+            else:
+                row.append(None if field.group(2) == COPY_NULL else field.group(2))
+        rows.append(row)
+    return rows
+
+
+COLUMNS = ['job_id', 'title', 'company', 'matched_jobs']
+
+
+def test_copy_rows_keep_empty_strings_apart_from_nulls():
+    data = [{'job_id': 1, 'title': '', 'company': None, 'matched_jobs': ('data engineer',)}]
+
+    assert read_copy_rows(_iter_copy_chunks(data, COLUMNS)) == [['1', '', None, '{"data engineer"}']]
+
+
+@pytest.mark.parametrize('title', ['Data Engineer, Senior', 'Data "Ninja" Engineer', 'Data\nEngineer'])
+def test_copy_rows_quote_special_characters(title):
+    data = [{'job_id': 1, 'title': title, 'company': 'Datastats', 'matched_jobs': ()}]
+    chunks = ''.join(_iter_copy_chunks(data, COLUMNS))
+
+    assert f'"{title.replace(chr(34), 2 * chr(34))}"' in chunks
+
+
+def test_copy_rows_are_chunked():
+    data = [{'job_id': index, 'title': 'Data Engineer', 'company': None, 'matched_jobs': ()} for index in range(100)]
+    chunks = list(_iter_copy_chunks(data, COLUMNS, chunk_size=256))
+
+    assert len(chunks) > 1
+    assert len(read_copy_rows(chunks)) == 100
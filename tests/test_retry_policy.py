@@ -0,0 +1,43 @@
+import pytest
+
+from utils import retry_policy
+from utils.retry_policy import CircuitOpenError, Outcome, RetryPolicy
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(retry_policy.time, 'sleep', sleeps.append)
+    return sleeps
+
+
+def test_wait_sleeps_between_attempts(sleeps):
+    policy = RetryPolicy(max_attempts=3, base_delay=1.0)
+    policy.record(Outcome.TIMEOUT, duration=0.1)
+    policy.wait()
+
+    assert len(sleeps) == 1
+    assert 0 <= sleeps[0] <= 1.0
+    assert policy.records[-1].delay == sleeps[0]
+
+
+def test_wait_does_not_sleep_after_the_last_attempt(sleeps):
+    policy = RetryPolicy(max_attempts=2, base_delay=1.0)
+    for _ in range(2):
+        policy.record(Outcome.TIMEOUT, duration=0.1)
+        policy.wait()
+
+    assert len(sleeps) == 1
+    assert policy.records[-1].delay == 0.0
+    assert not policy.can_retry()
+
+
+def test_wait_does_not_sleep_once_the_circuit_is_open(sleeps):
+    policy = RetryPolicy(max_attempts=50, breaker_window=3, breaker_threshold=0.9)
+    for _ in range(3):
+        policy.record(Outcome.AUTHWALL, duration=0.1)
+        policy.wait()
+
+    assert len(sleeps) == 2
+    with pytest.raises(CircuitOpenError):
+        policy.can_retry()
@@ -0,0 +1,49 @@
+import pytest
+
+from utils.fingerprints import LANGUAGES
+from utils.retry_policy import Outcome
+from utils.webpage_generator import WebpageGenerator
+
+
+# Welcome wall shown by LinkedIn to anonymous visitors, per fingerprint language
+WELCOME_WALLS = {
+    'fr': '<h1>Bienvenue dans votre communauté professionnelle</h1>',
+    'en': '<h1>Welcome to your professional community</h1>',
+}
+
+
+class FakeDriver:
+    """
+    Driver answering the page state script like a loaded page with a body text and no results list.
+    """
+
+    def __init__(self, body_text: str):
+        self.body_text = body_text
+
+    def get(self, url):
+        pass
+
+    def execute_async_script(self, script, rules, timeout_ms):
+        return {
+            'empty': False,
+            'ready': False,
+            'authwall': False,
+            'blocked_text': next((text for text in rules['blocked_texts'] if text in self.body_text), None),
+            'error_code': None,
+            'result_count': 0
+        }
+
+
+@pytest.mark.parametrize('language', LANGUAGES)
+def test_welcome_wall_is_blocked_in_every_fingerprint_language(language):
+    generator = WebpageGenerator(browser_manager=object())
+    generator.driver = FakeDriver(WELCOME_WALLS[language.split('-')[0]])
+
+    assert generator._attempt_webpage('https://fr.linkedin.com/jobs/search/') is Outcome.BLOCKED
+
+
+def test_unknown_page_without_results_is_not_ready():
+    generator = WebpageGenerator(browser_manager=object())
+    generator.driver = FakeDriver('<h1>Something else</h1>')
+
+    assert generator._attempt_webpage('https://fr.linkedin.com/jobs/search/') is Outcome.NOT_READY